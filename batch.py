@@ -0,0 +1,252 @@
+"""Run Factify models without Dash, from a JSON or YAML scenario file.
+
+    python batch.py scenarios.yaml --output results.json --workers 8
+
+The file holds a list of scenarios (or a mapping with a "scenarios" list).
+Each one names a model, its inputs and, optionally, a figure to write:
+
+    - name: base case
+      model: revenue           # revenue, montecarlo, team_costs,
+                               # team_montecarlo, hiring_plan, roster or
+                               # llm_costs
+      inputs:
+        user_base: 1000
+        growth: [0, 0.1, 0.1, 0.1, 0.1]
+        ...
+      figure: base.html        # .html, or .png/.svg with kaleido installed
+
+revenue takes the parameters of revenue_model.project_revenue() for a single
+path (fractions, not percentages) plus periods_per_year, montecarlo the
+options of montecarlo_engine.monte_carlo_summary(), team_costs the arguments
+of team_costs.simulate_team_growth(), team_montecarlo those of
+team_montecarlo.team_cost_summary(), hiring_plan those of
+hiring_plan.plan_hiring(), roster the team sizes per year, a ratio and the
+options of roster.project_roster() and llm_costs a text and a model.
+
+Scenarios run in parallel worker processes and the results are written as
+JSON, one entry per scenario in file order. Model modules are imported in
+the workers only, and plotly only when a figure is requested.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Folder of the modules of every model
+MODEL_DIRS = {
+    "revenue": "income_projections",
+    "montecarlo": "income_projections",
+    "team_costs": "cost_projections/coste-equipo",
+    "team_montecarlo": "cost_projections/coste-equipo",
+    "hiring_plan": "cost_projections/coste-equipo",
+    "roster": "cost_projections/coste-equipo",
+    "llm_costs": "cost_projections/llm-cost",
+}
+
+
+def run_revenue(inputs):
+    import numpy as np
+
+    from projection import period_labels
+    from revenue_model import project_revenue
+
+    params = dict(inputs)
+    periods_per_year = params.pop("periods_per_year", 1)
+    params = {name: np.asarray(value, dtype=float) for name, value in params.items()}
+    num_years = params["growth"].shape[-1]
+    components = project_revenue(params, periods_per_year)
+    return dict(labels=period_labels(num_years, periods_per_year), **components)
+
+
+def run_montecarlo(inputs):
+    from montecarlo_engine import NUM_YEARS, monte_carlo_summary
+    from projection import period_labels
+
+    summary = monte_carlo_summary(**inputs)
+    summary["labels"] = period_labels(
+        inputs.get("num_years", NUM_YEARS), inputs.get("periods_per_year", 1)
+    )
+    return summary
+
+
+def run_team_costs(inputs):
+    from team_costs import simulate_team_growth
+
+    return simulate_team_growth(**inputs)
+
+
+def run_team_montecarlo(inputs):
+    from team_montecarlo import team_cost_summary
+
+    return team_cost_summary(**inputs)
+
+
+def run_hiring_plan(inputs):
+    from hiring_plan import plan_hiring
+
+    return plan_hiring(**inputs)
+
+
+def run_roster(inputs):
+    from roster import project_roster
+    from team_costs import split_team
+
+    options = dict(inputs)
+    targets = split_team(options.pop("sizes"), options.pop("ratio"))
+    projection = project_roster(targets, **options)
+    # The roster itself is far too large to report
+    del projection["roster"]
+    return projection
+
+
+def run_llm_costs(inputs):
+    from llm_costs import estimate_cost
+
+    return estimate_cost(inputs["text"], inputs["model"])
+
+
+MODELS = {
+    "revenue": run_revenue,
+    "montecarlo": run_montecarlo,
+    "team_costs": run_team_costs,
+    "team_montecarlo": run_team_montecarlo,
+    "hiring_plan": run_hiring_plan,
+    "roster": run_roster,
+    "llm_costs": run_llm_costs,
+}
+
+
+def to_json(value):
+    """Numpy arrays and scalars, nested anywhere, as plain JSON values.
+
+    NaN and infinities become None, so the output stays valid JSON.
+    """
+    if isinstance(value, dict):
+        return {str(key): to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    if hasattr(value, "tolist"):
+        return to_json(value.tolist())
+    if isinstance(value, float) and not math.isfinite(value):
+        # JSON has no NaN or infinity
+        return None
+    return value
+
+
+def add_model_path(model):
+    # Model modules import their neighbours by name; each folder is added
+    # once per process, however many scenarios use it
+    path = os.path.join(ROOT, MODEL_DIRS[model])
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def write_figure(model, outputs, path):
+    """Chart of the main result of a model run, saved to path."""
+    # plotly is only imported for runs that ask for a figure
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    if model == "revenue":
+        x = outputs["labels"]
+        fig.add_trace(go.Scatter(name="Total Revenue", x=x, y=outputs["total_revenue"]))
+        fig.update_layout(yaxis={"title": "Revenue (€)"})
+    elif model == "montecarlo":
+        x = outputs["labels"]
+        for q, values in outputs["quantiles"].items():
+            fig.add_trace(go.Scatter(name=f"P{float(q) * 100:g}", x=x, y=values))
+        fig.add_trace(go.Scatter(name="Mean", x=x, y=outputs["mean"]))
+        fig.update_layout(yaxis={"title": "Revenue (€)"})
+    elif model == "team_montecarlo":
+        x = outputs["years"]
+        for q, values in outputs["quantiles"].items():
+            fig.add_trace(go.Scatter(name=f"P{float(q) * 100:g}", x=x, y=values))
+        fig.update_layout(xaxis={"title": "Year"}, yaxis={"title": "Cost (€)"})
+    elif model in ("team_costs", "hiring_plan", "roster"):
+        # years has one extra entry when the budget stops the growth
+        x = outputs["years"][: len(outputs["total_costs"])]
+        fig.add_trace(go.Scatter(name="Total Cost", x=x, y=outputs["total_costs"]))
+        fig.update_layout(xaxis={"title": "Year"}, yaxis={"title": "Cost (€)"})
+    else:
+        raise ValueError(f"no figure for the {model} model")
+    if path.endswith(".html"):
+        fig.write_html(path)
+    else:
+        fig.write_image(path)
+
+
+def run_scenario(scenario):
+    """Run one scenario and return its JSON-ready result.
+
+    Errors are reported in the result, so one bad scenario does not stop
+    the others.
+    """
+    model = scenario["model"]
+    result = {"name": scenario.get("name"), "model": model}
+    try:
+        add_model_path(model)
+        outputs = to_json(MODELS[model](scenario.get("inputs", {})))
+        if scenario.get("figure"):
+            write_figure(model, outputs, scenario["figure"])
+            result["figure"] = scenario["figure"]
+        result["outputs"] = outputs
+    except Exception as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+    return result
+
+
+def load_scenarios(path):
+    with open(path) as file:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+
+            scenarios = yaml.safe_load(file)
+        else:
+            scenarios = json.load(file)
+    if isinstance(scenarios, dict):
+        scenarios = scenarios["scenarios"]
+    for scenario in scenarios:
+        if scenario.get("model") not in MODELS:
+            raise SystemExit(
+                f"{scenario.get('name')}: unknown model {scenario.get('model')!r}, "
+                f"expected one of {', '.join(MODELS)}"
+            )
+    return scenarios
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", help="JSON or YAML scenario file")
+    parser.add_argument("-o", "--output", help="results file (default: stdout)")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes (default: one per CPU)",
+    )
+    args = parser.parse_args(argv)
+
+    scenarios = load_scenarios(args.scenarios)
+    workers = min(args.workers, len(scenarios))
+    if workers <= 1:
+        results = [run_scenario(scenario) for scenario in scenarios]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_scenario, scenarios))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2, allow_nan=False)
+    else:
+        json.dump(results, sys.stdout, indent=2, allow_nan=False)
+        sys.stdout.write("\n")
+    return 1 if any("error" in result for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+import os
+
+import diskcache
+
+# Folder of the memoized callback results. Every worker of every app opens
+# the same folder, so a result computed by one is reused by all of them
+CACHE_DIR = os.environ.get(
+    "FACTIFY_CALLBACK_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "callbacks"),
+)
+
+# Size of the cache, least recently used results are evicted past it
+SIZE_LIMIT = 2**30
+
+# Results expire after a day, so code changes never serve stale results
+# for long
+EXPIRE = 24 * 3600
+
+# diskcache reopens its SQLite connection after a fork, so the cache can be
+# created at import time by a preloading WSGI server
+cache = diskcache.Cache(
+    CACHE_DIR, size_limit=SIZE_LIMIT, eviction_policy="least-recently-used"
+)
+
+
+def memoize(name=None, expire=EXPIRE):
+    """Decorator memoizing a function in the shared on-disk cache.
+
+    Results are keyed by name (the function's qualified name by default) and
+    the call arguments, which must be picklable. Include anything else the
+    result depends on, like an engine version, in name.
+    """
+    return cache.memoize(name=name, expire=expire)
@@ -1,11 +1,59 @@
+import os
+import sys
+
 import dash
-from dash import dcc, html
-from dash.dependencies import Input, Output
+import diskcache
+from dash import dcc, html, DiskcacheManager
+from dash.dependencies import Input, Output, State
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import pandas as pd
 
+# The callback cache is shared with every app at the repository root
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from callback_cache import memoize
+from hiring_plan import plan_hiring, ratio_bands
+from team_costs import cached_team_growth
+from team_montecarlo import TEAM_ENGINE_VERSION, team_cost_summary
+
+# Paths, seed and worker processes of the cost uncertainty simulation. The
+# seed is fixed so the bands stay put while other inputs change. Lower the
+# workers with FACTIFY_MC_WORKERS when several web workers share the machine
+TEAM_SIMULATIONS = 2**17
+TEAM_SEED = 0
+WORKERS = int(os.environ.get("FACTIFY_MC_WORKERS", os.cpu_count() or 1))
+
+# Simulations run as background jobs queued in a local disk cache, so they
+# don't tie up the web worker while they run
+cache = diskcache.Cache(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+)
+background_callback_manager = DiskcacheManager(cache)
+
+
+# Seeded runs always give the same result, whatever the worker count, so
+# every web worker shares them through the callback cache
+@memoize(f"team_cost_summary:{TEAM_ENGINE_VERSION}")
+def cached_team_cost_summary(
+    ratio, salaries, max_hires_per_year, max_employees, yearly_budget
+):
+    return team_cost_summary(
+        ratio,
+        salaries,
+        max_hires_per_year,
+        max_employees,
+        yearly_budget,
+        TEAM_SIMULATIONS,
+        seed=TEAM_SEED,
+        workers=WORKERS,
+    )
+
+
 # Initialize the app
-app = dash.Dash(__name__)
+app = dash.Dash(__name__, background_callback_manager=background_callback_manager)
 server = app.server
 
 # Define the initial layout
@@ -130,12 +178,47 @@ app.layout = html.Div(
                             id="show_bars",
                             options=[{"label": "Mostrar", "value": "mostrar"}],
                             value=["mostrar"],
+                            style={"marginBottom": "20px"},
+                        ),
+                        html.Label("Incertidumbre (Monte Carlo)"),
+                        html.Div(
+                            "Inflación, rotación y retrasos en las contrataciones"
+                        ),
+                        html.Button("Simular incertidumbre", id="run_monte_carlo"),
+                        html.Div(
+                            id="monte_carlo_status", style={"marginBottom": "20px"}
+                        ),
+                        # Result of the last simulation and the inputs it ran on
+                        dcc.Store(id="monte_carlo_summary"),
+                        html.H4("Plan de contratación óptimo"),
+                        html.Label("Horizonte (años)"),
+                        dcc.Input(
+                            id="plan_years",
+                            type="number",
+                            value=10,
+                            min=1,
+                            style={"marginBottom": "20px", "width": "100%"},
                         ),
+                        html.Label("Tolerancia del ratio (%)"),
+                        dcc.Input(
+                            id="ratio_tolerance",
+                            type="number",
+                            value=10,
+                            min=0,
+                            max=100,
+                            style={"marginBottom": "20px", "width": "100%"},
+                        ),
+                        html.Button("Optimizar plan", id="optimize_plan"),
                     ],
-                    style={"width": "20%", "paddingRight": "20px"},
+                    style={"width": "20%", "paddingRight": "20px", "overflowY": "auto"},
                 ),
                 html.Div(
-                    [dcc.Graph(id="growth_simulation_graph", style={"height": "100%"})],
+                    [
+                        dcc.Graph(
+                            id="growth_simulation_graph", style={"height": "50%"}
+                        ),
+                        dcc.Graph(id="hiring_plan_graph", style={"height": "50%"}),
+                    ],
                     style={"width": "80%"},
                 ),
             ],
@@ -160,6 +243,7 @@ app.layout = html.Div(
         Input("journalist_salary", "value"),
         Input("marketing_sales_salary", "value"),
         Input("show_bars", "value"),
+        Input("monte_carlo_summary", "data"),
     ],
 )
 def update_graph(
@@ -175,6 +259,7 @@ def update_graph(
     journalist_salary,
     marketing_sales_salary,
     show_bars,
+    monte_carlo_summary,
 ):
     # Update the ratios
     ratio = {
@@ -183,15 +268,6 @@ def update_graph(
         "sales_marketing": marketing_ratio,
     }
 
-    # Function to calculate the number of employees in each category
-    def calculate_employee_numbers(num_employees):
-        num_engineers = (num_employees * ratio["engineers"]) // sum(ratio.values())
-        num_journalists = (num_employees * ratio["journalists"]) // sum(ratio.values())
-        num_sales_marketing = (num_employees * ratio["sales_marketing"]) // sum(
-            ratio.values()
-        )
-        return num_engineers, num_journalists, num_sales_marketing
-
     # Define the salaries and costs based on the provided data
     salaries = {
         "full_stack_developer": full_stack_developer_salary,
@@ -201,63 +277,20 @@ def update_graph(
         "marketing_sales": marketing_sales_salary,
     }
 
-    social_security_rate = 0.236
-
-    # Initialize lists to store the data for the graph
-    years = []
-    engineer_costs = []
-    journalist_costs = []
-    marketing_costs = []
-    social_security_costs = []
-    total_costs = []
-
-    # Initialize lists to store the number of employees for the annotations
-    engineer_numbers = []
-    journalist_numbers = []
-    marketing_numbers = []
-
-    # Simulate the hiring process over the years
-    num_employees = 2
-    year = 1
-
-    while num_employees <= max_employees:
-        years.append(year)
-
-        # Calculate the number of employees in each department based on the ratio
-        num_engineers, num_journalists, num_sales_marketing = (
-            calculate_employee_numbers(num_employees)
-        )
-
-        # Calculate department costs
-        engineer_cost = (
-            (num_engineers // 3) * salaries["full_stack_developer"]
-            + (num_engineers // 3) * salaries["ai_researcher"]
-            + (num_engineers // 3) * salaries["cloud_developer"]
-        )
-        journalist_cost = num_journalists * salaries["journalist"]
-        marketing_cost = num_sales_marketing * salaries["marketing_sales"]
-
-        total_salaries = engineer_cost + journalist_cost + marketing_cost
-        social_security_cost = total_salaries * social_security_rate
-        total_cost = total_salaries + social_security_cost
-
-        if total_cost > yearly_budget or num_employees > max_employees:
-            break
-
-        engineer_costs.append(engineer_cost)
-        journalist_costs.append(journalist_cost)
-        marketing_costs.append(marketing_cost)
-        social_security_costs.append(social_security_cost)
-        total_costs.append(total_cost)
-
-        # Store the number of employees for the annotations
-        engineer_numbers.append(num_engineers)
-        journalist_numbers.append(num_journalists)
-        marketing_numbers.append(num_sales_marketing)
-
-        # Increment the number of employees and year
-        num_employees += max_hires_per_year
-        year += 1
+    # Simulate the hiring process over the years, reusing earlier runs with
+    # the same inputs
+    growth = cached_team_growth(
+        ratio, salaries, max_hires_per_year, max_employees, yearly_budget
+    )
+    years = growth["years"]
+    engineer_costs = growth["engineer_costs"]
+    journalist_costs = growth["journalist_costs"]
+    marketing_costs = growth["marketing_costs"]
+    social_security_costs = growth["social_security_costs"]
+    total_costs = growth["total_costs"]
+    engineer_numbers = growth["engineer_numbers"]
+    journalist_numbers = growth["journalist_numbers"]
+    marketing_numbers = growth["marketing_numbers"]
 
     # Create traces for each department
     fig = go.Figure()
@@ -329,10 +362,61 @@ def update_graph(
         )
     )
 
+    # Percentile bands of the cost under salary inflation, attrition,
+    # backfill delays and hiring slippage, and the chance of going over
+    # budget, while the last simulation matches the inputs
+    title = "Cost Progression for Team Growth"
+    inputs = [ratio, salaries, max_hires_per_year, max_employees, yearly_budget]
+    if monte_carlo_summary and monte_carlo_summary["inputs"] == inputs and years:
+        summary = monte_carlo_summary
+        quantiles = summary["quantiles"]
+        bands = [
+            (0.05, 0.95, "P5 - P95", "rgba(255, 0, 0, 0.1)"),
+            (0.25, 0.75, "P25 - P75", "rgba(255, 0, 0, 0.2)"),
+        ]
+        for low, high, name, color in bands:
+            fig.add_trace(
+                go.Scatter(
+                    x=summary["years"],
+                    y=quantiles[str(high)],
+                    mode="lines",
+                    line=dict(width=0),
+                    showlegend=False,
+                    hoverinfo="skip",
+                )
+            )
+            fig.add_trace(
+                go.Scatter(
+                    x=summary["years"],
+                    y=quantiles[str(low)],
+                    mode="lines",
+                    line=dict(width=0),
+                    fill="tonexty",
+                    fillcolor=color,
+                    name=name,
+                )
+            )
+        fig.add_trace(
+            go.Scatter(
+                x=summary["years"],
+                y=quantiles["0.5"],
+                mode="lines",
+                name="Median Cost",
+                line=dict(color="red", dash="dash"),
+                customdata=summary["overrun_probability"],
+                hovertemplate="€%{y:,.0f}<br>P(over budget): %{customdata:.1%}",
+            )
+        )
+        fig.add_hline(y=yearly_budget, line_dash="dot", annotation_text="Budget")
+        title += (
+            f" - P(over budget in any year): "
+            f"{summary['any_overrun_probability']:.1%}"
+        )
+
     # Update layout for better readability
     fig.update_layout(
         barmode="stack",
-        title="Cost Progression for Team Growth",
+        title=title,
         xaxis_title="Year",
         yaxis_title="Cost (€)",
         legend_title="Department",
@@ -342,6 +426,211 @@ def update_graph(
     return fig
 
 
-# Run the app
+# Cost uncertainty of the current plan, run on demand as a background job.
+# update_graph draws it while the inputs stay those it ran on
+@app.callback(
+    [
+        Output("monte_carlo_summary", "data"),
+        Output("monte_carlo_status", "children"),
+    ],
+    Input("run_monte_carlo", "n_clicks"),
+    [
+        State("engineer_ratio", "value"),
+        State("journalist_ratio", "value"),
+        State("marketing_ratio", "value"),
+        State("max_hires_per_year", "value"),
+        State("max_employees", "value"),
+        State("yearly_budget", "value"),
+        State("full_stack_developer_salary", "value"),
+        State("ai_researcher_salary", "value"),
+        State("cloud_developer_salary", "value"),
+        State("journalist_salary", "value"),
+        State("marketing_sales_salary", "value"),
+    ],
+    background=True,
+    # While a job is in flight the button is disabled, so extra clicks are
+    # ignored instead of starting a second simulation
+    running=[
+        (Output("run_monte_carlo", "disabled"), True, False),
+        (Output("monte_carlo_status", "children"), "Simulando...", ""),
+    ],
+    prevent_initial_call=True,
+)
+def run_monte_carlo(
+    n_clicks,
+    engineer_ratio,
+    journalist_ratio,
+    marketing_ratio,
+    max_hires_per_year,
+    max_employees,
+    yearly_budget,
+    full_stack_developer_salary,
+    ai_researcher_salary,
+    cloud_developer_salary,
+    journalist_salary,
+    marketing_sales_salary,
+):
+    values = [
+        engineer_ratio,
+        journalist_ratio,
+        marketing_ratio,
+        max_hires_per_year,
+        max_employees,
+        yearly_budget,
+        full_stack_developer_salary,
+        ai_researcher_salary,
+        cloud_developer_salary,
+        journalist_salary,
+        marketing_sales_salary,
+    ]
+    if any(value is None for value in values):
+        return dash.no_update, "Completa todos los campos para simular."
+    ratio = {
+        "engineers": engineer_ratio,
+        "journalists": journalist_ratio,
+        "sales_marketing": marketing_ratio,
+    }
+    salaries = {
+        "full_stack_developer": full_stack_developer_salary,
+        "ai_researcher": ai_researcher_salary,
+        "cloud_developer": cloud_developer_salary,
+        "journalist": journalist_salary,
+        "marketing_sales": marketing_sales_salary,
+    }
+    inputs = [ratio, salaries, max_hires_per_year, max_employees, yearly_budget]
+    try:
+        summary = cached_team_cost_summary(*inputs)
+    except ValueError as error:
+        return None, str(error)
+
+    # Only what the chart draws goes to the browser
+    data = {
+        "inputs": inputs,
+        "years": summary["years"],
+        "quantiles": {
+            str(q): band.tolist() for q, band in summary["quantiles"].items()
+        },
+        "overrun_probability": summary["overrun_probability"].tolist(),
+        "any_overrun_probability": summary["any_overrun_probability"],
+    }
+    return data, f"{summary['count']:,} simulaciones"
+
+
+# Best yearly team under the same salaries, hire rate, size and budget, with
+# every department within the tolerance of its share in the ratio
+@app.callback(
+    Output("hiring_plan_graph", "figure"),
+    Input("optimize_plan", "n_clicks"),
+    [
+        State("engineer_ratio", "value"),
+        State("journalist_ratio", "value"),
+        State("marketing_ratio", "value"),
+        State("max_hires_per_year", "value"),
+        State("max_employees", "value"),
+        State("yearly_budget", "value"),
+        State("full_stack_developer_salary", "value"),
+        State("ai_researcher_salary", "value"),
+        State("cloud_developer_salary", "value"),
+        State("journalist_salary", "value"),
+        State("marketing_sales_salary", "value"),
+        State("plan_years", "value"),
+        State("ratio_tolerance", "value"),
+    ],
+    prevent_initial_call=True,
+)
+def optimize_hiring_plan(
+    n_clicks,
+    engineer_ratio,
+    journalist_ratio,
+    marketing_ratio,
+    max_hires_per_year,
+    max_employees,
+    yearly_budget,
+    full_stack_developer_salary,
+    ai_researcher_salary,
+    cloud_developer_salary,
+    journalist_salary,
+    marketing_sales_salary,
+    plan_years,
+    ratio_tolerance,
+):
+    # Cleared inputs come back as None; wait until every one is filled in
+    inputs = [
+        engineer_ratio,
+        journalist_ratio,
+        marketing_ratio,
+        max_hires_per_year,
+        max_employees,
+        yearly_budget,
+        full_stack_developer_salary,
+        ai_researcher_salary,
+        cloud_developer_salary,
+        journalist_salary,
+        marketing_sales_salary,
+        plan_years,
+        ratio_tolerance,
+    ]
+    if any(value is None for value in inputs):
+        return dash.no_update
+    ratio = {
+        "engineers": engineer_ratio,
+        "journalists": journalist_ratio,
+        "sales_marketing": marketing_ratio,
+    }
+    salaries = {
+        "full_stack_developer": full_stack_developer_salary,
+        "ai_researcher": ai_researcher_salary,
+        "cloud_developer": cloud_developer_salary,
+        "journalist": journalist_salary,
+        "marketing_sales": marketing_sales_salary,
+    }
+    plan = plan_hiring(
+        salaries,
+        int(plan_years),
+        int(max_hires_per_year),
+        yearly_budget,
+        max_employees=max_employees,
+        bands=ratio_bands(ratio, ratio_tolerance / 100),
+    )
+
+    # Headcount per department, and the cost of the team on its own axis
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    departments = [
+        ("Engineering", "engineer_numbers"),
+        ("Journalism", "journalist_numbers"),
+        ("Marketing", "marketing_numbers"),
+    ]
+    for name, key in departments:
+        fig.add_trace(
+            go.Bar(x=plan["years"], y=plan[key], name=name, text=plan[key]),
+            secondary_y=False,
+        )
+    fig.add_trace(
+        go.Scatter(
+            x=plan["years"],
+            y=plan["total_costs"],
+            mode="lines+markers",
+            name="Total Cost",
+            line=dict(color="red", width=2),
+        ),
+        secondary_y=True,
+    )
+    fig.update_layout(
+        barmode="stack",
+        title=(
+            f"Optimal Hiring Plan ({plan['method']}, "
+            f"{plan['score']:,.0f} employee-years)"
+        ),
+        xaxis_title="Year",
+        yaxis_title="Employees",
+        yaxis2_title="Cost (€)",
+        legend_title="Department",
+        template="plotly_white",
+    )
+    return fig
+
+
+# Run the app; production servers use wsgi.py instead. Debug mode (reloader
+# and dev tools) is only on with DASH_DEBUG=true
 if __name__ == "__main__":
-    app.run_server(debug=True)
+    app.run_server()
@@ -0,0 +1,236 @@
+import itertools
+
+import numpy as np
+
+from team_costs import (
+    DEPARTMENT_ROLES,
+    ROLES,
+    SOCIAL_SECURITY_RATE,
+    personnel_costs,
+    role_headcounts,
+)
+
+# Largest number of team compositions the plan search keeps per year, and
+# the most work (compositions times hires searched) it does per year. Past
+# either, teams grow in blocks of several employees per department
+MAX_STATES = 2**19
+MAX_WORK = 2**25
+
+# Largest group of hires the block plans are topped up with at once
+TOP_UP_HIRES = 6
+
+
+def team_cost(numbers, salaries):
+    """Yearly cost, social security included, of teams of numbers[i] ROLES[i]."""
+    numbers = np.stack(np.broadcast_arrays(*numbers), axis=-1)
+    return personnel_costs(role_headcounts(numbers), salaries)["total_cost"]
+
+
+def ratio_bands(ratio, tolerance=0.1):
+    """Bands of the share of every department, tolerance around ratio."""
+    total = sum(ratio.values())
+    shares = {role: ratio[role] / total for role in ROLES}
+    return {
+        role: (max(0.0, share - tolerance), min(1.0, share + tolerance))
+        for role, share in shares.items()
+    }
+
+
+def feasible(numbers, salaries, budget, max_employees=None, bands=None):
+    """Whether teams of numbers[i] ROLES[i] meet the budget, size and bands.
+
+    An empty team meets every band.
+    """
+    numbers = np.broadcast_arrays(*numbers)
+    size = sum(numbers)
+    ok = team_cost(numbers, salaries) <= budget
+    if max_employees is not None:
+        ok &= size <= max_employees
+    for role, count in zip(ROLES, numbers):
+        low, high = (bands or {}).get(role, (0, 1))
+        # Slack for shares that sit exactly on a band edge
+        ok &= (count >= low * size - 1e-9) & (count <= high * size + 1e-9)
+    return ok
+
+
+def lower_max(values, steps):
+    # Best value over the teams each team can grow from with at most steps
+    # hires, one unit step per pass, or over every smaller team at once
+    # when steps allow reaching any of them
+    if steps >= sum(values.shape) - values.ndim:
+        best = values
+        for axis in range(values.ndim):
+            best = np.maximum.accumulate(best, axis=axis)
+        return best
+    best = values
+    for _ in range(steps):
+        grown = best.copy()
+        for axis in range(values.ndim):
+            index = [slice(None)] * values.ndim
+            shifted = list(index)
+            index[axis] = slice(1, None)
+            shifted[axis] = slice(None, -1)
+            index, shifted = tuple(index), tuple(shifted)
+            np.maximum(grown[index], best[shifted], out=grown[index])
+        best = grown
+    return best
+
+
+def plan_size_bounds(
+    salaries, years, max_hires_per_year, budgets, max_employees, initial
+):
+    # Largest size of every department over the horizon
+    bounds = []
+    for role, start in zip(ROLES, initial):
+        bound = start + years * max_hires_per_year
+        if max_employees is not None:
+            bound = min(bound, max_employees)
+        cheapest = min(salaries[name] for name in DEPARTMENT_ROLES[role])
+        if cheapest > 0:
+            affordable = budgets.max() / (1 + SOCIAL_SECURITY_RATE) / cheapest
+            bound = min(bound, int(affordable) + 1)
+        bounds.append(max(int(bound), start))
+    return bounds
+
+
+def block_size(bounds, initial, max_hires_per_year):
+    # Smallest hiring block that keeps the search within its limits,
+    # starting from the one that would fit the states if they were all kept
+    sizes = [bound - start + 1 for bound, start in zip(bounds, initial)]
+    block = max(1, int((np.prod(sizes, dtype=float) / MAX_STATES) ** (1 / len(sizes))))
+    while True:
+        shape = [(bound - start) // block + 1 for bound, start in zip(bounds, initial)]
+        states = int(np.prod(shape))
+        steps = min(max_hires_per_year // block, sum(shape))
+        if states <= MAX_STATES and states * max(steps, 1) <= MAX_WORK:
+            return block, shape
+        block += 1
+
+
+def top_up(
+    plan, initial, salaries, budgets, max_hires_per_year, max_employees, bands, weights
+):
+    # Greedy hires on top of a block plan, earliest year first. Each step
+    # takes the group of up to TOP_UP_HIRES hires that adds the most
+    # capacity, so teams held back by the bands can still grow. A hire stays
+    # for every later year, so it is only taken if all of them still meet
+    # the constraints
+    groups = np.array(
+        [
+            hires
+            for hires in itertools.product(range(TOP_UP_HIRES + 1), repeat=len(ROLES))
+            if 0 < sum(hires) <= TOP_UP_HIRES
+        ]
+    )
+    gains = groups @ np.array([weights[role] for role in ROLES])
+    for year in range(len(plan)):
+        start = plan[year - 1] if year else initial
+        while True:
+            room = max_hires_per_year - (plan[year] - start).sum()
+            trials = plan[year:] + groups[:, None, :]
+            ok = feasible(
+                np.moveaxis(trials, -1, 0),
+                salaries,
+                budgets[year:],
+                max_employees,
+                bands,
+            )
+            ok = ok.all(axis=1) & (groups.sum(axis=1) <= room)
+            if not ok.any():
+                break
+            plan[year:] = trials[np.argmax(np.where(ok, gains, -np.inf))]
+    return plan
+
+
+def plan_hiring(
+    salaries,
+    years,
+    max_hires_per_year,
+    yearly_budget,
+    max_employees=None,
+    bands=None,
+    weights=None,
+    initial=(0, 0, 0),
+):
+    """Yearly team that maximizes capacity under the hiring constraints.
+
+    Every year the team hires at most max_hires_per_year people, nobody
+    leaves, and at the end of the year its cost must fit yearly_budget (one
+    value or one per year), its size max_employees and the share of every
+    department its band in bands (ROLES entry to a (low, high) pair, see
+    ratio_bands()). Capacity is the team weighted by department (weights,
+    one by default, so it is the headcount) summed over the years, so
+    earlier hires count for more. initial is the team before the first year.
+
+    Small problems are solved exactly by dynamic programming over every team
+    composition. Larger ones are solved over teams grown in blocks of
+    several employees per department, then topped up with single hires.
+    Returns a list per quantity, one entry per year, with the score reached
+    and the method used.
+    """
+    weights = {role: (weights or {}).get(role, 1.0) for role in ROLES}
+    budgets = np.broadcast_to(np.asarray(yearly_budget, dtype=float), (years,))
+    initial = np.asarray(initial, dtype=int)
+
+    bounds = plan_size_bounds(
+        salaries, years, max_hires_per_year, budgets, max_employees, initial
+    )
+    block, shape = block_size(bounds, initial, max_hires_per_year)
+    steps = max_hires_per_year // block
+
+    # Every team composition on the grid, its capacity and its cost
+    axes = np.ix_(
+        *(start + block * np.arange(size) for start, size in zip(initial, shape))
+    )
+    numbers = np.broadcast_arrays(*axes)
+    capacity = sum(weights[role] * count for role, count in zip(ROLES, numbers))
+
+    # values[year] is the best capacity of the years up to and including
+    # that one, for a team ending the year at each composition
+    best = np.full(shape, -np.inf)
+    best[(0,) * len(ROLES)] = 0.0
+    values = []
+    for year in range(years):
+        ok = feasible(axes, salaries, budgets[year], max_employees, bands)
+        best = np.where(ok, lower_max(best, steps) + capacity, -np.inf)
+        values.append(best)
+    if not np.isfinite(best).any():
+        raise ValueError("no hiring plan meets the constraints from the initial team")
+
+    # Walk the best final team back through the teams it grew from
+    state = np.unravel_index(np.argmax(best), shape)
+    states = [state]
+    for year in range(years - 1, 0, -1):
+        box = values[year - 1][tuple(slice(0, index + 1) for index in state)]
+        hired = sum(np.ogrid[tuple(slice(index, -1, -1) for index in state)])
+        box = np.where(hired <= steps, box, -np.inf)
+        state = np.unravel_index(np.argmax(box), box.shape)
+        states.append(state)
+    plan = initial + block * np.array(states[::-1])
+
+    method = "exact"
+    if block > 1:
+        method = "heuristic"
+        plan = top_up(
+            plan,
+            initial,
+            salaries,
+            budgets,
+            max_hires_per_year,
+            max_employees,
+            bands,
+            weights,
+        )
+
+    costs = team_cost(plan.T, salaries)
+    hires = np.diff(plan.sum(axis=1), prepend=initial.sum())
+    return {
+        "years": list(range(1, years + 1)),
+        "engineer_numbers": plan[:, 0].tolist(),
+        "journalist_numbers": plan[:, 1].tolist(),
+        "marketing_numbers": plan[:, 2].tolist(),
+        "hires": hires.tolist(),
+        "total_costs": costs.tolist(),
+        "score": float((plan * [weights[role] for role in ROLES]).sum()),
+        "method": method,
+    }
@@ -0,0 +1,135 @@
+import numpy as np
+
+from team_costs import SALARY_ROLES, SOCIAL_SECURITY_RATE
+
+# Salaried roles, as coded in the role column of a roster
+ROSTER_ROLES = SALARY_ROLES
+
+# Yearly raise of every salary (and of the salaries new hires get), years
+# spent in a band before a promotion, raise of a promotion and top band
+RAISE_RATE = 0.025
+PROMOTION_YEARS = 3
+PROMOTION_RAISE = 0.10
+MAX_BAND = 4
+
+
+class Roster:
+    """Employees stored as columns of compact arrays, one row each.
+
+    role indexes ROSTER_ROLES, hire_year is the year of the hire, band the
+    salary band (0 on hiring) and seniority the years spent in that band.
+    salary is the current yearly salary. Rows are appended as people are
+    hired, in arrays that grow by doubling.
+    """
+
+    def __init__(self, capacity=1024):
+        capacity = max(int(capacity), 1)
+        self.size = 0
+        self.role = np.zeros(capacity, dtype=np.int8)
+        self.hire_year = np.zeros(capacity, dtype=np.int16)
+        self.band = np.zeros(capacity, dtype=np.int8)
+        self.seniority = np.zeros(capacity, dtype=np.int16)
+        self.salary = np.zeros(capacity)
+
+    def _reserve(self, size):
+        capacity = self.role.shape[0]
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity)
+        for name in ["role", "hire_year", "band", "seniority", "salary"]:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: self.size] = column[: self.size]
+            setattr(self, name, grown)
+
+    def hire(self, counts, year, salaries):
+        """Add counts[i] employees of ROSTER_ROLES[i], paid salaries[i]."""
+        counts = np.asarray(counts, dtype=np.int64)
+        start, end = self.size, self.size + int(counts.sum())
+        self._reserve(end)
+        roles = np.repeat(np.arange(len(ROSTER_ROLES), dtype=np.int8), counts)
+        self.role[start:end] = roles
+        self.hire_year[start:end] = year
+        self.band[start:end] = 0
+        self.seniority[start:end] = 0
+        self.salary[start:end] = np.asarray(salaries, dtype=float)[roles]
+        self.size = end
+
+    def advance_year(
+        self,
+        raise_rate=RAISE_RATE,
+        promotion_years=PROMOTION_YEARS,
+        promotion_raise=PROMOTION_RAISE,
+        max_band=MAX_BAND,
+    ):
+        """Give everyone a year of seniority, the yearly raise and due promotions.
+
+        Employees with promotion_years in a band below max_band move up one
+        band, with promotion_raise on top of the yearly raise. raise_rate is
+        one rate or one per ROSTER_ROLES role.
+        """
+        n = self.size
+        band, seniority, salary = self.band[:n], self.seniority[:n], self.salary[:n]
+        seniority += 1
+        rates = np.broadcast_to(np.asarray(raise_rate, dtype=float), len(ROSTER_ROLES))
+        salary *= 1 + rates[self.role[:n]]
+        if promotion_years is not None:
+            promoted = (seniority >= promotion_years) & (band < max_band)
+            band[promoted] += 1
+            seniority[promoted] = 0
+            salary[promoted] *= 1 + promotion_raise
+
+    def role_totals(self, values=None):
+        """Sum of values (one by default, so the headcount) per role."""
+        n = self.size
+        weights = None if values is None else values[:n]
+        return np.bincount(self.role[:n], weights=weights, minlength=len(ROSTER_ROLES))
+
+
+def project_roster(
+    role_targets,
+    salaries,
+    raise_rate=RAISE_RATE,
+    promotion_years=PROMOTION_YEARS,
+    promotion_raise=PROMOTION_RAISE,
+    max_band=MAX_BAND,
+):
+    """Yearly cost of a roster grown to role_targets, one row per year.
+
+    role_targets holds the headcount of every ROSTER_ROLES role at each year
+    (see team_costs.split_team()); nobody leaves, so it must never shrink.
+    Employees start in band 0 at the salary of their role, raised by
+    raise_rate every year like the salaries already paid, and then get
+    raises and promotions as in Roster.advance_year(). Returns the headcount
+    and salaries per year and role, the social security and total cost per
+    year and the final roster.
+    """
+    targets = np.asarray(role_targets, dtype=np.int64)
+    hires = np.diff(targets, axis=0, prepend=0)
+    if (hires < 0).any():
+        raise ValueError("role_targets must not shrink, nobody leaves the roster")
+    years = len(targets)
+    rates = np.broadcast_to(np.asarray(raise_rate, dtype=float), len(ROSTER_ROLES))
+    hiring_salaries = np.array([salaries[role] for role in ROSTER_ROLES], dtype=float)
+
+    roster = Roster(capacity=targets[-1].sum() if years else 1)
+    headcount = np.zeros((years, len(ROSTER_ROLES)), dtype=np.int64)
+    role_salaries = np.zeros((years, len(ROSTER_ROLES)))
+    for year in range(years):
+        if year:
+            roster.advance_year(rates, promotion_years, promotion_raise, max_band)
+            hiring_salaries = hiring_salaries * (1 + rates)
+        roster.hire(hires[year], year, hiring_salaries)
+        headcount[year] = roster.role_totals()
+        role_salaries[year] = roster.role_totals(roster.salary)
+
+    total_salaries = role_salaries.sum(axis=1)
+    social_security = total_salaries * SOCIAL_SECURITY_RATE
+    return {
+        "years": list(range(1, years + 1)),
+        "headcount": headcount,
+        "salaries": role_salaries,
+        "social_security": social_security,
+        "total_costs": total_salaries + social_security,
+        "roster": roster,
+    }
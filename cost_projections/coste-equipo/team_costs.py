@@ -0,0 +1,243 @@
+import numbers
+from functools import lru_cache
+
+import numpy as np
+
+# Employer social security contribution, as a share of salaries
+SOCIAL_SECURITY_RATE = 0.236
+
+# Departments, the keys of a ratio, in the order of department numbers
+ROLES = ["engineers", "journalists", "sales_marketing"]
+
+# Salaried roles, the keys of salaries, in the order of role headcounts and
+# salary vectors
+SALARY_ROLES = [
+    "full_stack_developer",
+    "ai_researcher",
+    "cloud_developer",
+    "journalist",
+    "marketing_sales",
+]
+
+# Salaried roles of every department. Engineers are split evenly between
+# the three engineering roles, the first ones taking any remainder
+DEPARTMENT_ROLES = {
+    "engineers": ["full_stack_developer", "ai_researcher", "cloud_developer"],
+    "journalists": ["journalist"],
+    "sales_marketing": ["marketing_sales"],
+}
+
+# Department of every salaried role, as an index into ROLES
+ROLE_DEPARTMENTS = np.array(
+    [
+        ROLES.index(department)
+        for department, roles in DEPARTMENT_ROLES.items()
+        for _ in roles
+    ]
+)
+
+# Team sizes evaluated at once while looking for the budget break. Blocks
+# start small and double, so short simulations stay cheap
+FIRST_BLOCK = 64
+MAX_BLOCK = 2**16
+
+# Team growth simulations kept by cached_team_growth()
+CACHE_SIZE = 256
+
+
+def largest_remainder(totals, weights):
+    """Split every total into integer parts proportional to weights.
+
+    Parts are rounded down and the units left over go to the parts with the
+    largest remainders (the first ones on ties), so the parts always add up
+    to the total. totals has any shape; the parts add a trailing axis.
+    """
+    totals = np.asarray(totals)[..., np.newaxis]
+    weights = np.asarray(weights)
+    parts, remainders = np.divmod(totals * weights, weights.sum())
+    left = totals[..., 0] - parts.sum(axis=-1)
+    ranks = np.argsort(np.argsort(-remainders, axis=-1, kind="stable"), axis=-1)
+    return (parts + (ranks < left[..., np.newaxis])).astype(np.int64)
+
+
+def department_numbers(num_employees, ratio):
+    """Engineers, journalists and sales/marketing staff of each team size.
+
+    The split follows ratio with largest remainders, so the departments add
+    up to the team size. The result has a trailing ROLES axis.
+    """
+    return largest_remainder(num_employees, [ratio[role] for role in ROLES])
+
+
+def role_headcounts(numbers):
+    """Headcount of every SALARY_ROLES role from department numbers."""
+    numbers = np.asarray(numbers)
+    columns = []
+    for index, role in enumerate(ROLES):
+        # An even split, the first roles taking the remainder
+        size = len(DEPARTMENT_ROLES[role])
+        share, remainder = np.divmod(numbers[..., index, np.newaxis], size)
+        columns.append(share + (np.arange(size) < remainder))
+    return np.concatenate(columns, axis=-1)
+
+
+def split_team(sizes, ratio):
+    """Headcount of every SALARY_ROLES role for teams of the given sizes."""
+    return role_headcounts(department_numbers(sizes, ratio))
+
+
+def salary_vector(salaries):
+    """Yearly salary of every SALARY_ROLES role, from a dict by role.
+
+    Values may be arrays, such as one salary per path; roles are then the
+    trailing axis.
+    """
+    values = [np.asarray(salaries[role], dtype=float) for role in SALARY_ROLES]
+    return np.stack(np.broadcast_arrays(*values), axis=-1)
+
+
+def personnel_costs(headcounts, salaries):
+    """Yearly cost of many teams at once.
+
+    headcounts holds the employees of every SALARY_ROLES role along its last
+    axis and salaries is a dict by role or a salary vector, broadcast
+    against it. Returns the cost of every role and department, the total
+    salaries, social security and total cost of every team.
+    """
+    if isinstance(salaries, dict):
+        salaries = salary_vector(salaries)
+    role_costs = np.asarray(headcounts) * salaries
+    department_costs = np.stack(
+        [
+            role_costs[..., ROLE_DEPARTMENTS == index].sum(axis=-1)
+            for index in range(len(ROLES))
+        ],
+        axis=-1,
+    )
+    total_salaries = department_costs.sum(axis=-1)
+    social_security = total_salaries * SOCIAL_SECURITY_RATE
+    return {
+        "role_costs": role_costs,
+        "department_costs": department_costs,
+        "total_salaries": total_salaries,
+        "social_security": social_security,
+        "total_cost": total_salaries + social_security,
+    }
+
+
+def team_size_costs(sizes, ratio, salaries):
+    """personnel_costs() of teams of the given sizes split by ratio.
+
+    Also returns the department numbers and role headcounts of the teams.
+    """
+    numbers = department_numbers(sizes, ratio)
+    headcounts = role_headcounts(numbers)
+    costs = personnel_costs(headcounts, salaries)
+    costs["department_numbers"] = numbers
+    costs["role_headcounts"] = headcounts
+    return costs
+
+
+def team_sizes(start, step, size):
+    # size team sizes from start on, growing by step. Integer steps are an
+    # arithmetic progression; other steps are added one at a time, so the
+    # sizes round exactly as repeated additions would
+    if isinstance(start, numbers.Integral) and isinstance(step, numbers.Integral):
+        return start + step * np.arange(size)
+    return np.add.accumulate(np.array([start] + [step] * (size - 1)))
+
+
+def simulate_team_growth(
+    ratio, salaries, max_hires_per_year, max_employees, yearly_budget
+):
+    """Yearly headcount and cost of growing the team at a fixed role ratio.
+
+    The team starts at 2 employees and grows by max_hires_per_year every year
+    until it passes max_employees or its cost exceeds yearly_budget. ratio
+    maps "engineers", "journalists" and "sales_marketing" to their weights
+    and salaries holds the yearly salary of every role. Returns a list per
+    quantity, one entry per year. When the budget stops the growth, years
+    also holds the year that broke it.
+
+    Team sizes are evaluated in blocks of years at once, and the first year
+    over budget is searched for in each block, so the whole run takes a few
+    array operations for any number of years.
+    """
+    blocks = []
+    num_years = 0
+    over_budget = False
+
+    num_employees = 2
+    block = FIRST_BLOCK
+    while num_employees <= max_employees:
+        if max_hires_per_year <= 0:
+            # The team never grows, so the first year decides
+            block = 1
+        sizes = team_sizes(num_employees, max_hires_per_year, block)
+        sizes = sizes[: np.searchsorted(sizes, max_employees, side="right")]
+        costs = team_size_costs(sizes, ratio, salaries)
+
+        over = np.flatnonzero(costs["total_cost"] > yearly_budget)
+        if over.size:
+            over_budget = True
+            sizes = sizes[: over[0]]
+        blocks.append({key: values[: len(sizes)] for key, values in costs.items()})
+        num_years += len(sizes)
+        if over_budget:
+            break
+        if max_hires_per_year <= 0:
+            raise ValueError(
+                "max_hires_per_year must be positive for the team to outgrow "
+                "max_employees or the budget"
+            )
+
+        num_employees = sizes[-1].item() + max_hires_per_year
+        block = min(2 * block, MAX_BLOCK)
+
+    costs = {
+        name: np.concatenate([block[name] for block in blocks])
+        for name in (blocks[0] if blocks else [])
+    }
+    growth = {"years": list(range(1, num_years + 1 + over_budget))}
+    columns = [
+        ("engineer_costs", "department_costs", 0),
+        ("journalist_costs", "department_costs", 1),
+        ("marketing_costs", "department_costs", 2),
+        ("engineer_numbers", "department_numbers", 0),
+        ("journalist_numbers", "department_numbers", 1),
+        ("marketing_numbers", "department_numbers", 2),
+    ]
+    for key, name, index in columns:
+        growth[key] = costs[name][:, index].tolist() if costs else []
+    for key, name in [
+        ("social_security_costs", "social_security"),
+        ("total_costs", "total_cost"),
+    ]:
+        growth[key] = costs[name].tolist() if costs else []
+    return growth
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _cached_team_growth(
+    ratio, salaries, max_hires_per_year, max_employees, yearly_budget
+):
+    return simulate_team_growth(
+        dict(ratio), dict(salaries), max_hires_per_year, max_employees, yearly_budget
+    )
+
+
+def cached_team_growth(
+    ratio, salaries, max_hires_per_year, max_employees, yearly_budget
+):
+    """simulate_team_growth(), memoized for the inputs seen most recently.
+
+    The result is shared between calls with the same inputs, so it must not
+    be modified.
+    """
+    return _cached_team_growth(
+        tuple(ratio.items()),
+        tuple(salaries.items()),
+        max_hires_per_year,
+        max_employees,
+        yearly_budget,
+    )
@@ -0,0 +1,211 @@
+import os
+import sys
+
+import numpy as np
+
+from team_costs import (
+    ROLE_DEPARTMENTS,
+    ROLES,
+    SALARY_ROLES,
+    department_numbers,
+    personnel_costs,
+    role_headcounts,
+    salary_vector,
+    simulate_team_growth,
+    team_sizes,
+)
+
+# The chunked Monte Carlo machinery is shared with the income engine
+sys.path.append(
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "income_projections",
+    )
+)
+
+from montecarlo_engine import (
+    FAN_QUANTILES,
+    QuantileSketch,
+    RunningStats,
+    iter_chunk_results,
+    plan_chunks,
+)
+
+# Paths simulated per batch
+CHUNK_SIZE = 2**16
+
+# Bump whenever a change alters the results of a seeded run
+TEAM_ENGINE_VERSION = 2
+
+# Default uncertainty of the team model, per year:
+# - inflation_mean, inflation_std: normal salary inflation of every role,
+#   one value for all roles or a dict by SALARY_ROLES entry
+# - attrition_rate: chance that an employee leaves
+# - backfill_months: mean (exponential) delay before the leavers of a
+#   department are replaced, capped at a year
+# - hiring_slippage: chance that a planned hire slips to the next year
+UNCERTAINTY = {
+    "inflation_mean": 0.03,
+    "inflation_std": 0.015,
+    "attrition_rate": 0.12,
+    "backfill_months": 3.0,
+    "hiring_slippage": 0.15,
+}
+
+
+def planned_team(ratio, max_hires_per_year, max_employees, num_years):
+    """Planned engineers, journalists and sales/marketing staff per year.
+
+    The team follows simulate_team_growth(): 2 employees in the first year,
+    max_hires_per_year more every year, up to max_employees.
+    """
+    sizes = np.minimum(team_sizes(2, max_hires_per_year, num_years), max_employees)
+    return department_numbers(sizes, ratio)
+
+
+def role_values(value):
+    # One value per salaried role from a scalar or a dict by role
+    if isinstance(value, dict):
+        return np.array([value[role] for role in SALARY_ROLES], dtype=float)
+    return np.full(len(SALARY_ROLES), value, dtype=float)
+
+
+def run_task(task):
+    """Process pool entry point: run_chunk() for a plan_chunks() task."""
+    batch_size, seed_sequence, options = task
+    return run_chunk(batch_size, seed_sequence, **options)
+
+
+def run_chunk(
+    batch_size, seed_sequence, plan, salaries, yearly_budget, uncertainty, offset=0
+):
+    """Simulate one batch of team paths and return its partial statistics.
+
+    Every path draws its own salary inflation per role and year, hiring
+    slippage, attrition and backfill delays, and its personnel cost per year
+    is folded into running statistics, a quantile sketch and the count of
+    paths over yearly_budget each year and in any year. offset, the index of
+    the first path of the chunk, is not needed by this model.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    num_years = len(plan)
+
+    # Salaries per path and year; the first year is at the base salaries
+    rates = rng.normal(
+        role_values(uncertainty["inflation_mean"]),
+        role_values(uncertainty["inflation_std"]),
+        size=(batch_size, num_years - 1, len(SALARY_ROLES)),
+    )
+    factors = np.concatenate(
+        [np.ones((batch_size, 1, len(SALARY_ROLES))), np.cumprod(1 + rates, axis=1)],
+        axis=1,
+    )
+    path_salaries = factors * salary_vector(salaries)
+
+    costs = np.empty((batch_size, num_years))
+    team = np.zeros((batch_size, len(ROLES)), dtype=np.int64)
+    for year in range(num_years):
+        # Hires still missing from the plan, slipped ones included, each
+        # slipping again with the same chance
+        missing = np.maximum(plan[year] - team, 0)
+        team = team + missing - rng.binomial(missing, uncertainty["hiring_slippage"])
+
+        # Leavers are replaced after a delay, drawn per department and year,
+        # and a department costs less for the share of its posts left empty
+        # meanwhile
+        leavers = rng.binomial(team, uncertainty["attrition_rate"])
+        delays = rng.exponential(uncertainty["backfill_months"], size=team.shape)
+        vacant_months = leavers * np.minimum(delays, 12)
+        vacant_share = np.divide(
+            vacant_months, 12 * team, out=np.zeros(team.shape), where=team > 0
+        )
+
+        filled = 1 - vacant_share[:, ROLE_DEPARTMENTS]
+        costs[:, year] = personnel_costs(
+            role_headcounts(team) * filled, path_salaries[:, year]
+        )["total_cost"]
+
+    stats = RunningStats(num_years)
+    sketch = QuantileSketch(num_years)
+    stats.update(costs)
+    sketch.update(costs)
+    over = costs > yearly_budget
+    return {
+        "stats": stats,
+        "sketch": sketch,
+        "overruns": over.sum(axis=0),
+        "any_overruns": int(over.any(axis=1).sum()),
+    }
+
+
+def team_cost_summary(
+    ratio,
+    salaries,
+    max_hires_per_year,
+    max_employees,
+    yearly_budget,
+    num_simulations,
+    num_years=None,
+    uncertainty=None,
+    seed=None,
+    workers=1,
+    chunk_size=CHUNK_SIZE,
+    progress=None,
+):
+    """Distribution of the yearly personnel cost of the planned team growth.
+
+    The plan is the one of simulate_team_growth(), over num_years years or,
+    by default, the years it keeps within budget (at least one).
+    uncertainty overrides entries of UNCERTAINTY. Paths are simulated in
+    chunks of chunk_size, each with its own random stream spawned from seed,
+    so a seeded run gives the same result for any number of workers.
+    progress, if given, is called as progress(done_chunks, total_chunks).
+
+    Returns per year the planned cost, the mean, percentiles (FAN_QUANTILES),
+    min and max of the simulated cost and the probability of exceeding
+    yearly_budget, plus the probability of exceeding it in any year.
+    """
+    if max_employees < 2:
+        raise ValueError("the plan covers no year, max_employees is below 2")
+    if num_years is None:
+        growth = simulate_team_growth(
+            ratio, salaries, max_hires_per_year, max_employees, yearly_budget
+        )
+        num_years = max(len(growth["total_costs"]), 1)
+    uncertainty = {**UNCERTAINTY, **(uncertainty or {})}
+    plan = planned_team(ratio, max_hires_per_year, max_employees, num_years)
+
+    tasks = plan_chunks(
+        num_simulations,
+        chunk_size,
+        seed,
+        plan=plan,
+        salaries=salaries,
+        yearly_budget=yearly_budget,
+        uncertainty=uncertainty,
+    )
+    stats = RunningStats(num_years)
+    sketch = QuantileSketch(num_years)
+    overruns = np.zeros(num_years, dtype=np.int64)
+    any_overruns = 0
+    for done, chunk in enumerate(iter_chunk_results(tasks, workers, run_task), 1):
+        stats.merge(chunk["stats"])
+        sketch.merge(chunk["sketch"])
+        overruns += chunk["overruns"]
+        any_overruns += chunk["any_overruns"]
+        if progress is not None:
+            progress(done, len(tasks))
+
+    planned_cost = personnel_costs(role_headcounts(plan), salaries)["total_cost"]
+    return {
+        "years": list(range(1, num_years + 1)),
+        "count": stats.count,
+        "planned_cost": planned_cost,
+        "mean": stats.mean,
+        "std": stats.std,
+        "min": stats.min,
+        "max": stats.max,
+        "quantiles": {q: sketch.quantile(q) for q in FAN_QUANTILES},
+        "overrun_probability": overruns / stats.count,
+        "any_overrun_probability": any_overruns / stats.count,
+    }
@@ -2,10 +2,11 @@ import dash
 from dash import dcc, html
 import dash_bootstrap_components as dbc
 from dash.dependencies import Input, Output
-import tiktoken
-from tiktoken._educational import *
+
+from llm_costs import estimate_cost, model_info, tokenize_text
 
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+server = app.server
 
 app.layout = html.Div(
     style={
@@ -82,13 +83,6 @@ app.layout = html.Div(
 )
 
 
-def tokenize_text(text):
-    enc = SimpleBytePairEncoding.from_tiktoken("cl100k_base")
-    tokens = enc.encode(text)
-    token_texts = enc.decode(tokens)
-    return tokens, token_texts
-
-
 @app.callback(Output("tokenized-output", "children"), [Input("text-input", "value")])
 def update_output(text):
     if not text:
@@ -103,18 +97,6 @@ def update_output(text):
     )
 
 
-# Define pricing per model (example values)
-pricing = {
-    "model_1": 0.0001,  # price per token for model 1
-    "model_2": 0.0002,  # price per token for model 2
-}
-
-model_info = {
-    "model_1": "Price per token: $0.0001",
-    "model_2": "Price per token: $0.0002",
-}
-
-
 @app.callback(Output("model-info", "children"), [Input("model-selector", "value")])
 def update_model_info(model):
     return model_info.get(model, "")
@@ -128,12 +110,12 @@ def calculate_price(text, model):
     if not text or not model:
         return ""
 
-    tokens, _ = tokenize_text(text)
-    num_tokens = len(tokens)
-    price = num_tokens * pricing[model]
+    cost = estimate_cost(text, model)
 
-    return f"Number of tokens: {num_tokens}, Price: ${price:.4f}"
+    return f"Number of tokens: {cost['num_tokens']}, Price: ${cost['price']:.4f}"
 
 
+# Production servers use wsgi.py instead. Debug mode (reloader and dev tools)
+# is only on with DASH_DEBUG=true
 if __name__ == "__main__":
-    app.run_server(debug=True)
+    app.run_server()
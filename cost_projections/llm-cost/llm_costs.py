@@ -0,0 +1,46 @@
+import os
+import sys
+from functools import lru_cache
+
+from tiktoken._educational import SimpleBytePairEncoding
+
+# The callback cache is shared with every app at the repository root
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from callback_cache import memoize
+
+# Define pricing per model (example values)
+pricing = {
+    "model_1": 0.0001,  # price per token for model 1
+    "model_2": 0.0002,  # price per token for model 2
+}
+
+model_info = {
+    "model_1": "Price per token: $0.0001",
+    "model_2": "Price per token: $0.0002",
+}
+
+
+@lru_cache(maxsize=None)
+def encoding():
+    # Loaded on first use, once per worker process
+    return SimpleBytePairEncoding.from_tiktoken("cl100k_base")
+
+
+# The pure-Python encoder is slow and the same text is often tokenized
+# again, so tokenizations are shared through the callback cache
+@memoize()
+def tokenize_text(text):
+    enc = encoding()
+    tokens = enc.encode(text)
+    token_texts = enc.decode(tokens)
+    return tokens, token_texts
+
+
+def estimate_cost(text, model):
+    """Number of tokens of a prompt and its price with the given model."""
+    tokens, _ = tokenize_text(text)
+    num_tokens = len(tokens)
+    return {"num_tokens": num_tokens, "price": num_tokens * pricing[model]}
@@ -1,111 +1,85 @@
+import os
+import sys
+import uuid
+
 import dash
-from dash import html, dcc
+import diskcache
+from dash import html, dcc, DiskcacheManager
 import dash_bootstrap_components as dbc
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
 import plotly.graph_objs as go
 import pandas as pd
 import numpy as np
 from plotly.subplots import make_subplots
 
-# Initialize the app
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
-
-# Helper function
-def monte_carlo_simulation(num_simulations):
-    # Parameter distributions
-    user_base_dist = np.random.uniform(50000, 100000, num_simulations)
-    growth_dist = np.random.uniform(30, 50, (num_simulations, 5)) / 100
-    basic_tier_dist = np.random.uniform(70, 80, (num_simulations, 5)) / 100
-    curious_tier_dist = np.random.uniform(15, 20, (num_simulations, 5)) / 100
-    oracle_tier_dist = np.random.uniform(5, 10, (num_simulations, 5)) / 100
-    cpc_dist = np.random.uniform(0.20, 0.50, (num_simulations, 5))
-    cpm_dist = np.random.uniform(2, 5, (num_simulations, 5))
-    ctr_dist = np.random.uniform(0.5, 1.5, (num_simulations, 5)) / 100
-    arpu_dist = np.random.uniform(0.50, 1.50, (num_simulations, 5))
-
-    simulations = []
-    for i in range(num_simulations):
-        user_base_sim = [user_base_dist[i]]
-        revenue_sim = []
-        for j in range(5):
-            user_base_sim.append(user_base_sim[-1] * (1 + growth_dist[i, j]))
-            basic_users_sim = user_base_sim[-1] * basic_tier_dist[i, j]
-            curious_users_sim = user_base_sim[-1] * curious_tier_dist[i, j]
-            oracle_users_sim = user_base_sim[-1] * oracle_tier_dist[i, j]
-            subscription_revenue_sim = (
-                curious_users_sim * 4.99 + oracle_users_sim * 14.99
-            )
-            impressions_sim = user_base_sim[-1] * ctr_dist[i, j] * 12 * 1000
-            clicks_sim = user_base_sim[-1] * ctr_dist[i, j] * 12
-            ad_revenue_sim = (
-                (impressions_sim / 1000) * cpm_dist[i, j]
-                + clicks_sim * cpc_dist[i, j]
-                + user_base_sim[-1] * arpu_dist[i, j] * 12
-            )
-            total_revenue_sim = subscription_revenue_sim + ad_revenue_sim
-            revenue_sim.append(total_revenue_sim)
-        simulations.append(revenue_sim)
-    return np.array(simulations)
+# The callback cache is shared with every app at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Define layout
-app.layout = dbc.Container(
-    [
-        dbc.Row(
-            [
-                dbc.Col(
-                    dcc.Graph(id="revenue_chart"),
-                    width=9,
-                ),
-                dbc.Col(
-                    [
-                        html.H4("Monte Carlo Simulation Data", className="mb-3"),
-                        html.Div(id="simulation_data_display"),
-                    ],
-                    width=3,
-                ),
-            ],
-            style={"height": "50%"},
-        ),
-        dbc.Row(
-            [
-                dbc.Col(
-                    dbc.Button(
-                        "Run Monte Carlo Simulations",
-                        id="btn_run_simulations",
-                        color="secondary",
-                    ),
-                    width=2,
-                )
-            ]
-        ),
-    ],
-    fluid=True,
+from callback_cache import memoize
+from montecarlo_engine import (
+    ENGINE_VERSION,
+    NUM_YEARS,
+    SAMPLING_METHODS,
+    monte_carlo_summary,
 )
+from projection import GRANULARITIES, period_labels
+from result_cache import ResultCache, lookup_summary, run_key, store_summary
+from sensitivity import FACTOR_LABELS, sobol_indices, tornado
 
-# Define callback
-@app.callback(
-    [Output("revenue_chart", "figure"), Output("simulation_data_display", "children")],
-    Input("btn_run_simulations", "n_clicks"),
-    prevent_initial_call=True
+# Worker processes used to split each Monte Carlo run. Lower it with
+# FACTIFY_MC_WORKERS when several web workers share the machine
+WORKERS = int(os.environ.get("FACTIFY_MC_WORKERS", os.cpu_count() or 1))
+
+# Simulations run as background jobs queued in a local disk cache, so they
+# don't tie up the web worker while they run
+cache = diskcache.Cache(os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache"))
+background_callback_manager = DiskcacheManager(cache)
+
+# Content-addressed cache of finished seeded runs
+result_cache = ResultCache()
+
+# Where "Save paths" writes memory-mapped path stores for post-hoc analysis
+PATH_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "paths")
+
+# Initialize the app
+app = dash.Dash(
+    __name__,
+    external_stylesheets=[dbc.themes.BOOTSTRAP],
+    background_callback_manager=background_callback_manager,
 )
-def run_monte_carlo_simulations(n_clicks):
-    if n_clicks is None:
-        return dash.no_update
+server = app.server
 
-    # Number of simulations
-    num_simulations = 1000
+# Longest horizon offered in the dashboard
+MAX_YEARS = 30
 
-    # Run Monte Carlo Simulations
-    simulations = monte_carlo_simulation(num_simulations)
+CHART_VIEWS = [
+    {"label": "Fan chart", "value": "fan"},
+    {"label": "Statistics", "value": "statistics"},
+]
 
-    # Calculate statistics
-    mean_revenue = np.mean(simulations, axis=0)
-    median_revenue = np.median(simulations, axis=0)
-    min_revenue = np.min(simulations, axis=0)
-    max_revenue = np.max(simulations, axis=0)
+# Seeded sensitivity analyses are reproducible, so they are shared by every
+# web worker through the callback cache
+cached_sobol_indices = memoize(f"sobol_indices:{ENGINE_VERSION}")(sobol_indices)
+cached_tornado = memoize(f"tornado:{ENGINE_VERSION}")(tornado)
+
+# Helper functions
+def run_options(request):
+    # Keyword arguments of monte_carlo_summary() for a simulation request
+    return {
+        key: value
+        for key, value in request.items()
+        if key not in ("n_clicks", "store_paths")
+    }
+
+
+def statistics_figure(data):
+    years = data["labels"]
+    mean_revenue = data["mean"]
+    median_revenue = data["median"]
+    min_revenue = data["min"]
+    max_revenue = data["max"]
 
     # Create figure
-    years = ["Year 1", "Year 2", "Year 3", "Year 4", "Year 5"]
     fig = make_subplots(specs=[[{"secondary_y": True}]])
 
     fig.add_trace(go.Bar(name="Mean Revenue", x=years, y=mean_revenue, text=mean_revenue, textposition='inside'), secondary_y=False)
@@ -116,18 +90,97 @@ def run_monte_carlo_simulations(n_clicks):
     fig.update_layout(
         barmode="stack",
         title="Monte Carlo Simulation Results",
-        xaxis={"title": "Year"},
+        xaxis={"title": "Period"},
         yaxis={"title": "Revenue (€)"},
         yaxis2={"title": "Revenue (€)"},
     )
 
+    return fig
+
+
+def fan_figure(data):
+    # Percentile bands and sample paths on top, per-year histograms below.
+    # With monthly steps only the last period of every year gets a histogram
+    fig = make_subplots(
+        rows=2,
+        cols=1,
+        row_heights=[0.65, 0.35],
+        vertical_spacing=0.12,
+        subplot_titles=["Revenue Fan Chart", "Revenue Distribution per Year"],
+    )
+    quantiles = data["quantiles"]
+    labels = data["labels"]
+
+    # Sample paths as a single trace, separated by gaps
+    spaghetti_x = []
+    spaghetti_y = []
+    for path in data["sample_paths"]:
+        spaghetti_x += labels + [None]
+        spaghetti_y += path + [None]
+    fig.add_trace(go.Scatter(name="Sample Paths", x=spaghetti_x, y=spaghetti_y, mode="lines", line=dict(color="rgba(120, 120, 120, 0.3)", width=1)), row=1, col=1)
+
+    bands = [("0.05", "0.95", "P5 - P95", "rgba(31, 119, 180, 0.2)"), ("0.25", "0.75", "P25 - P75", "rgba(31, 119, 180, 0.4)")]
+    for low, high, name, color in bands:
+        fig.add_trace(go.Scatter(x=labels, y=quantiles[high], mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"), row=1, col=1)
+        fig.add_trace(go.Scatter(name=name, x=labels, y=quantiles[low], mode="lines", line=dict(width=0), fill="tonexty", fillcolor=color), row=1, col=1)
+
+    fig.add_trace(go.Scatter(name="Median Revenue", x=labels, y=data["median"], mode="lines+markers", line=dict(color="blue")), row=1, col=1)
+    fig.add_trace(go.Scatter(name="Mean Revenue", x=labels, y=data["mean"], mode="lines", line=dict(color="black", dash="dash")), row=1, col=1)
+
+    step = data["periods_per_year"]
+    histograms = zip(labels, data["histogram_edges"], data["histogram_counts"])
+    for year, edges, counts in list(histograms)[step - 1 :: step]:
+        centers = [(a + b) / 2 for a, b in zip(edges[:-1], edges[1:])]
+        fig.add_trace(go.Bar(name=year, x=centers, y=counts, width=edges[1] - edges[0], opacity=0.6, legendgroup="histograms"), row=2, col=1)
+
+    fig.update_layout(
+        barmode="overlay",
+        title="Monte Carlo Simulation Results",
+        yaxis={"title": "Revenue (€)"},
+        xaxis2={"title": "Revenue (€)"},
+        yaxis2={"title": "Paths"},
+    )
+    return fig
+
+
+def chart_data(summary, periods_per_year=1):
+    # Compact, JSON-ready view of a summary for the chart. Its size depends
+    # only on the number of periods, bands, bins and sample paths, never on
+    # the number of simulated paths, and values are rounded to whole euros
+    def rounded(values):
+        return np.round(np.asarray(values, dtype=float)).tolist()
+
+    num_years = len(summary["mean"]) // periods_per_year
+    return {
+        "labels": period_labels(num_years, periods_per_year),
+        "periods_per_year": periods_per_year,
+        "mean": rounded(summary["mean"]),
+        "median": rounded(summary["median"]),
+        "min": rounded(summary["min"]),
+        "max": rounded(summary["max"]),
+        "quantiles": {str(q): rounded(v) for q, v in summary["quantiles"].items()},
+        "histogram_edges": rounded(summary["histogram_edges"]),
+        "histogram_counts": np.asarray(summary["histogram_counts"]).tolist(),
+        "sample_paths": rounded(summary["sample_paths"]),
+    }
+
+
+def render_summary(summary, periods_per_year=1):
+    # Calculate statistics
+    mean_revenue = summary["mean"]
+    median_revenue = summary["median"]
+    min_revenue = summary["min"]
+    max_revenue = summary["max"]
+    sem_revenue = summary["sem"]
+    labels = period_labels(len(mean_revenue) // periods_per_year, periods_per_year)
     # Display simulation data
     simulation_data_display = dbc.Table(
         # Table Header
         [
             html.Thead(html.Tr([
-                html.Th("Year"), 
+                html.Th("Period"), 
                 html.Th("Mean Revenue (€)"), 
+                html.Th("SEM (€)"), 
                 html.Th("Median Revenue (€)"), 
                 html.Th("Min Revenue (€)"), 
                 html.Th("Max Revenue (€)")
@@ -137,13 +190,14 @@ def run_monte_carlo_simulations(n_clicks):
         [
             html.Tbody([
                 html.Tr([
-                    html.Td(f"Year {i+1}"), 
+                    html.Td(labels[i]), 
                     html.Td(f"{mean_revenue[i]:,.2f}"), 
+                    html.Td(f"{sem_revenue[i]:,.2f}"), 
                     html.Td(f"{median_revenue[i]:,.2f}"), 
                     html.Td(f"{min_revenue[i]:,.2f}"), 
                     html.Td(f"{max_revenue[i]:,.2f}")
                 ])
-                for i in range(5)
+                for i in range(len(labels))
             ])
         ],
         bordered=True,
@@ -152,8 +206,452 @@ def run_monte_carlo_simulations(n_clicks):
         responsive=True
     )
 
-    return fig, simulation_data_display
+    paths_evaluated = html.P(f"Paths evaluated: {summary['count']:,}")
+    if summary.get("store_dir"):
+        paths_evaluated = html.P(
+            [paths_evaluated.children, html.Br(), f"Paths saved to {summary['store_dir']}"]
+        )
+
+    return [simulation_data_display, paths_evaluated], chart_data(
+        summary, periods_per_year
+    )
+
+# Define layout
+app.layout = dbc.Container(
+    [
+        dcc.Store(id="simulation_request"),
+        dcc.Store(id="simulation_chart_data"),
+        dcc.Store(id="simulation_result_key"),
+        dbc.Row(
+            [
+                dbc.Col(
+                    [
+                        dbc.RadioItems(
+                            id="chart_view",
+                            options=CHART_VIEWS,
+                            value="fan",
+                            inline=True,
+                        ),
+                        dcc.Graph(id="revenue_chart"),
+                    ],
+                    width=9,
+                ),
+                dbc.Col(
+                    [
+                        html.H4("Monte Carlo Simulation Data", className="mb-3"),
+                        html.Div(id="simulation_data_display"),
+                        html.Small(id="cache_status", className="text-muted"),
+                    ],
+                    width=3,
+                ),
+            ],
+            style={"height": "50%"},
+        ),
+        dbc.Row(
+            [
+                dbc.Col(
+                    dbc.Button(
+                        "Run Monte Carlo Simulations",
+                        id="btn_run_simulations",
+                        color="secondary",
+                    ),
+                    width=2,
+                ),
+                dbc.Col(
+                    dbc.Button(
+                        "Cancel",
+                        id="btn_cancel_simulations",
+                        color="danger",
+                        outline=True,
+                        disabled=True,
+                    ),
+                    width=1,
+                ),
+                dbc.Col(
+                    dbc.InputGroup(
+                        [
+                            dbc.InputGroupText("Simulations"),
+                            dbc.Input(
+                                id="num_simulations",
+                                type="number",
+                                value=1000,
+                                min=1,
+                                step=1,
+                            ),
+                        ]
+                    ),
+                    width=3,
+                ),
+                dbc.Col(
+                    dbc.InputGroup(
+                        [
+                            dbc.InputGroupText("Seed"),
+                            dbc.Input(
+                                id="simulation_seed",
+                                type="number",
+                                placeholder="random",
+                                min=0,
+                                step=1,
+                            ),
+                        ]
+                    ),
+                    width=2,
+                ),
+            ]
+        ),
+        dbc.Row(
+            [
+                dbc.Col(
+                    dbc.InputGroup(
+                        [
+                            dbc.InputGroupText("Sampling"),
+                            dbc.Select(
+                                id="sampling_method",
+                                options=[
+                                    {"label": method, "value": method}
+                                    for method in SAMPLING_METHODS
+                                ],
+                                value="random",
+                            ),
+                        ]
+                    ),
+                    width=3,
+                ),
+                dbc.Col(
+                    dbc.Checklist(
+                        id="use_control_variate",
+                        options=[{"label": "Control variate", "value": "control"}],
+                        value=[],
+                        switch=True,
+                    ),
+                    width=2,
+                ),
+                dbc.Col(
+                    dbc.Checklist(
+                        id="store_paths",
+                        options=[{"label": "Save paths", "value": "store"}],
+                        value=[],
+                        switch=True,
+                    ),
+                    width=2,
+                ),
+                dbc.Col(
+                    dbc.InputGroup(
+                        [
+                            dbc.InputGroupText("Target SEM (€)"),
+                            dbc.Input(
+                                id="target_sem",
+                                type="number",
+                                placeholder="none",
+                                min=0,
+                            ),
+                        ]
+                    ),
+                    width=3,
+                ),
+            ],
+            className="mt-3",
+        ),
+        dbc.Row(
+            [
+                dbc.Col(
+                    dbc.InputGroup(
+                        [
+                            dbc.InputGroupText("Years"),
+                            dbc.Input(
+                                id="num_years",
+                                type="number",
+                                value=NUM_YEARS,
+                                min=1,
+                                max=MAX_YEARS,
+                                step=1,
+                            ),
+                        ]
+                    ),
+                    width=2,
+                ),
+                dbc.Col(
+                    dbc.InputGroup(
+                        [
+                            dbc.InputGroupText("Timestep"),
+                            dbc.Select(
+                                id="granularity",
+                                options=[
+                                    {"label": name.capitalize(), "value": name}
+                                    for name in GRANULARITIES
+                                ],
+                                value="annual",
+                            ),
+                        ]
+                    ),
+                    width=3,
+                ),
+            ],
+            className="mt-3",
+        ),
+        dbc.Row(
+            [
+                dbc.Col(
+                    dbc.Progress(
+                        id="simulation_progress",
+                        value=0,
+                        striped=True,
+                        animated=True,
+                        style={"visibility": "hidden"},
+                    ),
+                    width=8,
+                ),
+            ],
+            className="mt-3",
+        ),
+        html.Hr(),
+        dbc.Row(
+            [
+                dbc.Col(
+                    dbc.Button(
+                        "Run Sensitivity Analysis",
+                        id="btn_run_sensitivity",
+                        color="secondary",
+                    ),
+                    width=2,
+                ),
+                dbc.Col(
+                    dbc.InputGroup(
+                        [
+                            dbc.InputGroupText("Year"),
+                            dbc.Select(
+                                id="sensitivity_year",
+                                options=[
+                                    {"label": year, "value": i}
+                                    for i, year in enumerate(period_labels(NUM_YEARS))
+                                ],
+                                value=NUM_YEARS - 1,
+                            ),
+                        ]
+                    ),
+                    width=2,
+                ),
+            ]
+        ),
+        dbc.Row(
+            [
+                dbc.Col(dcc.Graph(id="sobol_chart"), width=6),
+                dbc.Col(dcc.Graph(id="tornado_chart"), width=6),
+            ]
+        ),
+    ],
+    fluid=True,
+)
+
+# Define callbacks
+@app.callback(
+    [
+        Output("simulation_data_display", "children"),
+        Output("simulation_chart_data", "data"),
+        Output("cache_status", "children"),
+        Output("simulation_request", "data"),
+    ],
+    Input("btn_run_simulations", "n_clicks"),
+    State("num_simulations", "value"),
+    State("simulation_seed", "value"),
+    State("sampling_method", "value"),
+    State("use_control_variate", "value"),
+    State("target_sem", "value"),
+    State("store_paths", "value"),
+    State("num_years", "value"),
+    State("granularity", "value"),
+    prevent_initial_call=True
+)
+def request_monte_carlo_simulations(
+    n_clicks,
+    num_simulations,
+    seed,
+    method,
+    use_control,
+    target_sem,
+    store_paths,
+    num_years,
+    granularity,
+):
+    if n_clicks is None or not num_simulations or not num_years:
+        return dash.no_update
+
+    request = {
+        "n_clicks": n_clicks,
+        "num_simulations": int(num_simulations),
+        "seed": None if seed is None else int(seed),
+        "method": method,
+        "use_control": "control" in use_control,
+        "target_sem": target_sem,
+        "store_paths": "store" in store_paths,
+        "num_years": int(num_years),
+        "periods_per_year": GRANULARITIES[granularity],
+    }
+
+    # Seeded runs that were already computed come straight from the cache,
+    # unless the paths have to be written out again
+    summary, tier = lookup_summary(result_cache, **run_options(request))
+    if summary is not None and not request["store_paths"]:
+        simulation_data_display, data = render_summary(
+            summary, request["periods_per_year"]
+        )
+        return simulation_data_display, data, f"Cache: hit ({tier})", dash.no_update
+
+    # Otherwise hand the run over to the background job
+    status = "Cache: bypassed (saving paths)" if request["store_paths"] else "Cache: miss"
+    return dash.no_update, dash.no_update, status, request
+
+
+@app.callback(
+    [
+        Output("simulation_data_display", "children", allow_duplicate=True),
+        Output("simulation_chart_data", "data", allow_duplicate=True),
+        Output("simulation_result_key", "data"),
+    ],
+    Input("simulation_request", "data"),
+    background=True,
+    # While a job is in flight the run button is disabled, so extra clicks
+    # are ignored instead of starting a second simulation
+    running=[
+        (Output("btn_run_simulations", "disabled"), True, False),
+        (Output("btn_cancel_simulations", "disabled"), False, True),
+        (
+            Output("simulation_progress", "style"),
+            {"visibility": "visible"},
+            {"visibility": "hidden"},
+        ),
+    ],
+    cancel=[Input("btn_cancel_simulations", "n_clicks")],
+    progress=[
+        Output("simulation_progress", "value"),
+        Output("simulation_progress", "label"),
+    ],
+    progress_default=[0, ""],
+    prevent_initial_call=True
+)
+def run_monte_carlo_simulations(set_progress, request):
+    if request is None:
+        return dash.no_update
+
+    # Run Monte Carlo Simulations in fixed-size batches, keeping only the
+    # running statistics so memory stays flat for any number of paths.
+    # The same seed reproduces the run exactly, whatever the worker count.
+    # With a target SEM the run stops early once every period reaches it
+    options = run_options(request)
+    store_dir = None
+    if request["store_paths"]:
+        run_id = uuid.uuid4().hex if options["seed"] is None else run_key(**options)
+        store_dir = os.path.join(PATH_STORE_DIR, run_id)
+    summary = monte_carlo_summary(
+        workers=WORKERS,
+        store_dir=store_dir,
+        progress=lambda done, total: set_progress(
+            [100 * done / total, f"{done}/{total} chunks"]
+        ),
+        **options,
+    )
+    key = store_summary(result_cache, summary, **options)
+    summary["store_dir"] = store_dir
+
+    simulation_data_display, data = render_summary(summary, request["periods_per_year"])
+    return simulation_data_display, data, key
+
+
+@app.callback(
+    Output("cache_status", "children", allow_duplicate=True),
+    Input("simulation_result_key", "data"),
+    prevent_initial_call=True
+)
+def remember_simulation(key):
+    # The background job only writes the disk tier; reading the result back
+    # here fills the memory tier of this web process for the next lookup
+    if key is None:
+        return dash.no_update
+    result_cache.get(key)
+    return "Cache: miss (result saved)"
+
+
+@app.callback(
+    Output("revenue_chart", "figure"),
+    Input("simulation_chart_data", "data"),
+    Input("chart_view", "value"),
+    prevent_initial_call=True
+)
+def update_revenue_chart(data, view):
+    # Figures are built from the compact chart data only, so switching views
+    # never reruns or reloads the simulation
+    if data is None:
+        return dash.no_update
+    if view == "statistics":
+        return statistics_figure(data)
+    return fan_figure(data)
+
+@app.callback(
+    [Output("sensitivity_year", "options"), Output("sensitivity_year", "value")],
+    Input("num_years", "value"),
+    prevent_initial_call=True
+)
+def update_sensitivity_years(num_years):
+    # Sensitivity is analysed per year over the selected horizon
+    if not num_years:
+        return dash.no_update
+    years = period_labels(int(num_years))
+    return [{"label": year, "value": i} for i, year in enumerate(years)], len(years) - 1
+
+@app.callback(
+    [Output("sobol_chart", "figure"), Output("tornado_chart", "figure")],
+    Input("btn_run_sensitivity", "n_clicks"),
+    Input("sensitivity_year", "value"),
+    State("simulation_seed", "value"),
+    State("num_years", "value"),
+    prevent_initial_call=True
+)
+def run_sensitivity_analysis(n_clicks, year, seed, num_years):
+    if n_clicks is None or not num_years:
+        return dash.no_update
+
+    year = int(year)
+    seed = None if seed is None else int(seed)
+    num_years = int(num_years)
+    years = period_labels(num_years)
+    if year >= num_years:
+        return dash.no_update
+    if seed is None:
+        indices = sobol_indices(num_years=num_years)
+        swings = tornado(num_years=num_years)
+    else:
+        indices = cached_sobol_indices(seed=seed, num_years=num_years)
+        swings = cached_tornado(seed=seed, num_years=num_years)
+    labels = [FACTOR_LABELS[factor] for factor in indices["factors"]]
+
+    # Sobol indices: share of the revenue variance explained by each driver
+    sobol_fig = go.Figure()
+    sobol_fig.add_trace(go.Bar(name="First Order", x=labels, y=indices["first_order"][:, year]))
+    sobol_fig.add_trace(go.Bar(name="Total", x=labels, y=indices["total"][:, year]))
+    sobol_fig.update_layout(
+        barmode="group",
+        title=f"Sobol Sensitivity Indices - {years[year]}",
+        yaxis={"title": "Share of Revenue Variance"},
+    )
+
+    # Tornado: mean revenue with each driver pinned to its P10 / P90,
+    # widest swing on top
+    base = swings["base"][year]
+    low = swings["low"][:, year] - base
+    high = swings["high"][:, year] - base
+    order = np.argsort(np.abs(high - low))
+    tornado_fig = go.Figure()
+    tornado_fig.add_trace(go.Bar(name="P10", y=[labels[i] for i in order], x=low[order], base=base, orientation="h"))
+    tornado_fig.add_trace(go.Bar(name="P90", y=[labels[i] for i in order], x=high[order], base=base, orientation="h"))
+    tornado_fig.update_layout(
+        barmode="overlay",
+        title=f"Mean Revenue Swing - {years[year]}",
+        xaxis={"title": "Revenue (€)"},
+    )
+
+    return sobol_fig, tornado_fig
 
-# Run the app
+# Run the app; production servers use wsgi.py instead. Debug mode (reloader
+# and dev tools) is only on with DASH_DEBUG=true
 if __name__ == "__main__":
-    app.run_server(debug=True)
\ No newline at end of file
+    app.run_server()
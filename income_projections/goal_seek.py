@@ -0,0 +1,232 @@
+import numpy as np
+
+from montecarlo_engine import PARAMETER_RANGES
+from revenue_model import project_revenue
+
+# Metrics a goal can target: revenue over the target year, or the user base
+# at its end
+METRICS = ["total_revenue", "users"]
+
+# Search range of every parameter, in model units (shares, CTR and growth
+# as fractions). Growth stays within the range periodic_growth() is exact on
+SEARCH_BOUNDS = {
+    "user_base": (0, 1e9),
+    "growth": (-0.9, 10),
+    "basic_tier": (0, 1),
+    "curious_tier": (0, 1),
+    "oracle_tier": (0, 1),
+    "cpc": (0, 100),
+    "cpm": (0, 1000),
+    "ctr": (0, 1),
+    "arpu": (0, 1000),
+}
+
+# Root finder stopping rule, as a share of the target, and iteration cap
+TOLERANCE = 1e-9
+MAX_ITERATIONS = 100
+
+# Paths sampled for the Monte Carlo mode
+GOAL_SEEK_SAMPLES = 2**13
+
+# Relative spread of every parameter around its input in the Monte Carlo
+# mode, as wide as its range in the simulation app: 30-50% growth becomes
+# the input +-25%
+RELATIVE_SPREAD = {
+    name: (high - low) / (high + low) for name, low, high, _ in PARAMETER_RANGES
+}
+
+
+def year_metric(params, metric, year, periods_per_year=1):
+    """metric in the given (1-based) year for every path of params.
+
+    Only the periods up to the end of that year are projected, and the free
+    tier, which neither metric depends on, is left out.
+    """
+    params = {name: values for name, values in params.items() if name != "basic_tier"}
+    periods = slice(0, year * periods_per_year)
+    values = project_revenue(params, periods_per_year, periods)[metric]
+    if metric == "users":
+        return values[..., -1]
+    return values[..., -periods_per_year:].sum(axis=-1)
+
+
+def with_value(params, parameter, values):
+    """params broadcast to the shape of values, with parameter set to them.
+
+    parameter is a (name, year) pair; the year of the user base is ignored.
+    """
+    name, year = parameter
+    values = np.asarray(values, dtype=float)
+    batch = np.broadcast_shapes(np.shape(params["user_base"]), values.shape)
+    batch_ndim = np.ndim(params["user_base"])
+    updated = {
+        key: np.broadcast_to(value, batch + np.shape(value)[batch_ndim:])
+        for key, value in params.items()
+    }
+    if name == "user_base":
+        updated["user_base"] = np.broadcast_to(values, batch)
+    else:
+        updated[name] = updated[name].copy()
+        updated[name][..., year - 1] = values
+    return updated
+
+
+def find_root(
+    function, lower, upper, tolerance=TOLERANCE, max_iterations=MAX_ITERATIONS
+):
+    """Roots of an elementwise function, one per element of lower and upper.
+
+    Vectorized Illinois method: secant steps that always keep the root
+    bracketed, with the stale end halved so that convex curves like compound
+    growth still converge superlinearly. Linear functions are solved in one
+    step. The search stops once |function| is within tolerance or the
+    bracket has shrunk to it. Elements without a sign change between their
+    bounds return nan.
+    """
+    lower, upper = np.broadcast_arrays(
+        np.asarray(lower, dtype=float), np.asarray(upper, dtype=float)
+    )
+    f_lower = function(lower)
+    f_upper = function(upper)
+    lower, upper, f_lower, f_upper = (
+        np.array(np.broadcast_to(x, f_lower.shape))
+        for x in (lower, upper, f_lower, f_upper)
+    )
+    root = np.where(np.abs(f_lower) <= np.abs(f_upper), lower, upper)
+    done = (np.abs(f_lower) <= tolerance) | (np.abs(f_upper) <= tolerance)
+    bracketed = done | (np.sign(f_lower) != np.sign(f_upper))
+
+    active = bracketed & ~done
+    for _ in range(max_iterations):
+        if not active.any():
+            break
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = upper - f_upper * (upper - lower) / (f_upper - f_lower)
+        # Bisect where the secant step degenerates
+        x = np.where(np.isfinite(x), x, (lower + upper) / 2)
+        f_x = function(x)
+
+        # Keep the end on the other side of the root; when the same end stays
+        # twice in a row, halve its value (the Illinois step)
+        crossed = np.sign(f_x) != np.sign(f_upper)
+        swap = active & crossed
+        lower = np.where(swap, upper, lower)
+        f_lower = np.where(swap, f_upper, np.where(active, f_lower / 2, f_lower))
+        upper = np.where(active, x, upper)
+        f_upper = np.where(active, f_x, f_upper)
+
+        root = np.where(active, x, root)
+        converged = (np.abs(f_x) <= tolerance) | (
+            np.abs(upper - lower) <= tolerance * np.maximum(np.abs(x), 1)
+        )
+        active &= ~converged
+    return np.where(bracketed, root, np.nan)
+
+
+def goal_seek(
+    params,
+    parameter,
+    target,
+    year,
+    metric="total_revenue",
+    periods_per_year=1,
+    bounds=None,
+):
+    """Value of parameter that brings metric to target in the given year.
+
+    params is a batch of revenue model parameters as taken by
+    project_revenue(), and one value is solved per path. parameter is a
+    (name, year) pair and bounds the search range, SEARCH_BOUNDS by default.
+    Paths that cannot reach the target within the bounds give nan.
+    """
+    low, high = SEARCH_BOUNDS[parameter[0]] if bounds is None else bounds
+    batch = np.shape(params["user_base"])
+    scale = abs(target) or 1
+
+    def gap(values):
+        # Distance to the target as a share of it
+        values = with_value(params, parameter, values)
+        return (year_metric(values, metric, year, periods_per_year) - target) / scale
+
+    return find_root(
+        gap, np.full(batch, low, dtype=float), np.full(batch, high, dtype=float)
+    )
+
+
+def goal_seek_pair(
+    params,
+    first,
+    first_values,
+    second,
+    target,
+    year,
+    metric="total_revenue",
+    periods_per_year=1,
+    bounds=None,
+):
+    """Values of second that hit the target for each value of first.
+
+    Two parameters have a whole curve of solutions; this traces it over
+    first_values in a single batch. params must be a single path, and
+    bounds applies to the second parameter.
+    """
+    params = with_value(params, first, np.asarray(first_values, dtype=float))
+    return goal_seek(params, second, target, year, metric, periods_per_year, bounds)
+
+
+def sample_around(params, num_simulations, rng):
+    """num_simulations paths spread uniformly around a single path.
+
+    Every parameter is scaled by its own factor within 1 +- RELATIVE_SPREAD,
+    so inputs that are zero, like the growth of year 1, stay zero.
+    """
+    return {
+        name: values
+        * rng.uniform(
+            1 - RELATIVE_SPREAD[name],
+            1 + RELATIVE_SPREAD[name],
+            (num_simulations,) + np.shape(values)[1:],
+        )
+        for name, values in params.items()
+    }
+
+
+def goal_seek_probability(
+    params,
+    parameter,
+    target,
+    year,
+    probability,
+    metric="total_revenue",
+    num_simulations=GOAL_SEEK_SAMPLES,
+    seed=None,
+    periods_per_year=1,
+    bounds=None,
+):
+    """Smallest value of parameter that reaches the target with a probability.
+
+    params is a single path, the scenario the uncertainty is centred on;
+    every other parameter is drawn around it with sample_around(). Each
+    path is solved for its own threshold value in one vectorized goal_seek()
+    run; since the metric grows with every parameter, a value reaches the
+    target on exactly the paths whose threshold is at or below it, so the
+    answer is the probability quantile of the thresholds. Returns nan when
+    no value within the bounds gets there.
+    """
+    low, high = SEARCH_BOUNDS[parameter[0]] if bounds is None else bounds
+    rng = np.random.default_rng(np.random.SeedSequence(seed))
+    params = sample_around(params, num_simulations, rng)
+    thresholds = goal_seek(
+        params, parameter, target, year, metric, periods_per_year, (low, high)
+    )
+
+    # Paths already past the target at the lower bound need no more; the
+    # rest failed to get there at all
+    at_high = year_metric(
+        with_value(params, parameter, high), metric, year, periods_per_year
+    )
+    thresholds = np.where(
+        np.isnan(thresholds), np.where(at_high >= target, low, np.inf), thresholds
+    )
+    value = np.quantile(thresholds, probability, method="inverted_cdf")
+    return value if np.isfinite(value) else np.nan
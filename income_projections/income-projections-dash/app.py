@@ -1,11 +1,22 @@
+import os
+import sys
+
 import dash
 import dash_bootstrap_components as dbc
 
+# The revenue projection helpers are shared with the Monte Carlo app one
+# folder up, and the callback cache with every app at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
 from layouts.main_layout import create_layout
 from callbacks import register_callbacks
 
 # Initialize the app
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+server = app.server
 
 # Create the app layout
 app.layout = create_layout()
@@ -13,6 +24,7 @@ app.layout = create_layout()
 # Register callbacks
 register_callbacks(app)
 
-# Run the app
+# Run the app; production servers use wsgi.py instead. Debug mode (reloader
+# and dev tools) is only on with DASH_DEBUG=true
 if __name__ == "__main__":
-    app.run_server(debug=True)
\ No newline at end of file
+    app.run_server()
\ No newline at end of file
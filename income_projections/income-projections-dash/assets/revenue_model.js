@@ -0,0 +1,209 @@
+// Browser-side copy of the revenue model (projection.py and revenue_model.py)
+// for the dashboard's "Compute in browser" mode. Every operation runs in the
+// same order as the numpy code, so both modes give bit-identical numbers.
+
+const MONTHS_PER_YEAR = 12;
+const CURIOUS_PRICE = 4.99;
+const ORACLE_PRICE = 14.99;
+
+// Chart traces in figure order, as in callbacks.TRACES
+const TRACES = ["basic_users", "curious_users", "oracle_users", "ad_revenue", "total_revenue"];
+
+// Per-year inputs besides the user base and growth, as in callbacks.YEAR_INPUTS
+const YEAR_INPUTS = ["basic_tier", "curious_tier", "oracle_tier", "cpc", "cpm", "ctr", "arpu"];
+
+function integerPower(base, exponent) {
+    let result = null;
+    while (exponent) {
+        if (exponent & 1) {
+            result = result === null ? base : result * base;
+        }
+        exponent >>= 1;
+        if (exponent) {
+            base = base * base;
+        }
+    }
+    return result;
+}
+
+function periodicGrowth(annualGrowth, periodsPerYear, rootIterations) {
+    if (periodsPerYear === 1) {
+        return annualGrowth;
+    }
+    return annualGrowth.map((growth) => {
+        const factor = 1 + growth;
+        let root = 1 + (factor - 1) / periodsPerYear;
+        for (let i = 0; i < rootIterations; i++) {
+            const power = integerPower(root, periodsPerYear - 1);
+            root = ((periodsPerYear - 1) * root + factor / power) / periodsPerYear;
+        }
+        return root - 1;
+    });
+}
+
+function interpolate(anchorValues, periodsPerYear, terms) {
+    if (periodsPerYear === 1) {
+        return anchorValues.slice();
+    }
+    return terms.lower.map(
+        (lower, i) =>
+            anchorValues[lower] * terms.lower_weight[i] +
+            anchorValues[terms.upper[i]] * terms.upper_weight[i]
+    );
+}
+
+function projectRevenue(params, periodsPerYear, projection) {
+    // One path of revenue_model.project_revenue()
+    const terms = projection.terms[periodsPerYear];
+    const growth = interpolate(
+        periodicGrowth(params.growth, periodsPerYear, projection.root_iterations),
+        periodsPerYear,
+        terms
+    );
+    const perPeriod = {};
+    for (const name of YEAR_INPUTS) {
+        perPeriod[name] = interpolate(params[name], periodsPerYear, terms);
+    }
+    const months = MONTHS_PER_YEAR / periodsPerYear;
+
+    const revenue = {};
+    for (const name of TRACES.concat(["users"])) {
+        revenue[name] = [];
+    }
+    let users = params.user_base;
+    growth.forEach((periodGrowth, p) => {
+        users = users * (1 + periodGrowth);
+        const curiousUsers = users * perPeriod.curious_tier[p];
+        const oracleUsers = users * perPeriod.oracle_tier[p];
+        const subscriptionRevenue =
+            (curiousUsers * CURIOUS_PRICE + oracleUsers * ORACLE_PRICE) * (months / MONTHS_PER_YEAR);
+        const impressions = users * perPeriod.ctr[p] * months * 1000;
+        const clicks = users * perPeriod.ctr[p] * months;
+        const adRevenue =
+            (impressions / 1000) * perPeriod.cpm[p] +
+            clicks * perPeriod.cpc[p] +
+            users * perPeriod.arpu[p] * months;
+        revenue.users.push(users);
+        revenue.basic_users.push(users * perPeriod.basic_tier[p]);
+        revenue.curious_users.push(curiousUsers);
+        revenue.oracle_users.push(oracleUsers);
+        revenue.ad_revenue.push(adRevenue);
+        revenue.total_revenue.push(subscriptionRevenue + adRevenue);
+    });
+    return revenue;
+}
+
+function scenarioParams(values, numYears) {
+    // callbacks.scenario_params(): year 1 gets no growth, percentages become fractions
+    const years = Array.from({ length: numYears }, (_, i) => i + 1);
+    const params = {
+        user_base: values["user_base:1"],
+        growth: [0.0].concat(years.slice(1).map((year) => values[`growth:${year}`])).map((g) => g / 100),
+    };
+    for (const name of YEAR_INPUTS) {
+        params[name] = years.map((year) => values[`${name}:${year}`]);
+    }
+    for (const name of ["basic_tier", "curious_tier", "oracle_tier", "ctr"]) {
+        params[name] = params[name].map((value) => value / 100);
+    }
+    return params;
+}
+
+function periodLabels(numYears, periodsPerYear) {
+    const labels = [];
+    for (let year = 1; year <= numYears; year++) {
+        if (periodsPerYear === 1) {
+            labels.push(`Year ${year}`);
+            continue;
+        }
+        const prefix = periodsPerYear === MONTHS_PER_YEAR ? "M" : "P";
+        for (let period = 1; period <= periodsPerYear; period++) {
+            labels.push(`Y${year} ${prefix}${period}`);
+        }
+    }
+    return labels;
+}
+
+function pythonStr(x) {
+    // str() of a float for the bar labels: exponent outside [1e-4, 1e16),
+    // with at least two exponent digits, and integers keep their ".0"
+    if (x !== 0 && (Math.abs(x) >= 1e16 || Math.abs(x) < 1e-4)) {
+        return x.toExponential().replace(/e([+-])(\d)$/, "e$10$2");
+    }
+    return Number.isInteger(x) ? x.toFixed(1) : String(x);
+}
+
+function fixed2(x) {
+    // Python's "{:.2f}". From 1e21 on every float is an integer but
+    // toFixed() switches to exponent notation
+    if (Math.abs(x) >= 1e21) {
+        return `${BigInt(x)}.00`;
+    }
+    // Exact ties between two cents (fractions in eighths) round half to
+    // even, where toFixed() would round them up
+    const fraction = Math.abs(x % 1);
+    if (Number.isInteger(fraction * 8) && (fraction * 100) % 1 === 0.5) {
+        const cents = Math.floor(fraction * 100);
+        const even = cents % 2 === 0 ? cents : cents + 1;
+        const whole = BigInt(Math.trunc(Math.abs(x)));
+        return `${x < 0 ? "-" : ""}${whole}.${String(even).padStart(2, "0")}`;
+    }
+    return x.toFixed(2);
+}
+
+function withThousands(fixed) {
+    const [whole, fraction] = fixed.split(".");
+    return `${whole.replace(/\B(?=(\d{3})+(?!\d))/g, ",")}.${fraction}`;
+}
+
+function traceText(name, values) {
+    if (name === "total_revenue") {
+        return values.map((x) => `€${fixed2(x)}`);
+    }
+    return values.map(pythonStr);
+}
+
+function displayLine(label, totalRevenue, users) {
+    return `${label}: Total Revenue: €${withThousands(fixed2(totalRevenue))}, Total Users: ${BigInt(Math.trunc(users))}`;
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    income: {
+        route_update: function (granularity, parameterValues, computeMode, figure, projection) {
+            const noUpdate = window.dash_clientside.no_update;
+            const context = window.dash_clientside.callback_context;
+            const changedParameter = context.triggered.some((t) => t.prop_id.startsWith("{"));
+
+            // Server mode, or nothing drawn yet: hand the edit to update_chart
+            if (!computeMode.includes("browser") || !figure) {
+                return [noUpdate, noUpdate, { redraw: !changedParameter, time: Date.now() }];
+            }
+            if (parameterValues.some((value) => value === null || value === undefined)) {
+                return [noUpdate, noUpdate, noUpdate];
+            }
+
+            const values = {};
+            context.inputs_list[1].forEach((item, i) => {
+                values[`${item.id.name}:${item.id.year}`] = parameterValues[i];
+            });
+            const periodsPerYear = projection.granularities[granularity];
+            const revenue = projectRevenue(scenarioParams(values, projection.num_years), periodsPerYear, projection);
+            const years = periodLabels(projection.num_years, periodsPerYear);
+
+            const newFigure = Object.assign({}, figure, { data: figure.data.slice() });
+            TRACES.forEach((name, i) => {
+                newFigure.data[i] = Object.assign({}, figure.data[i], {
+                    x: years,
+                    y: revenue[name],
+                    text: traceText(name, revenue[name]),
+                });
+            });
+            const display = years.map((label, i) => ({
+                type: "P",
+                namespace: "dash_html_components",
+                props: { children: displayLine(label, revenue.total_revenue[i], revenue.users[i]) },
+            }));
+            return [newFigure, display, noUpdate];
+        },
+    },
+});
@@ -1,223 +1,590 @@
-from dash import html
-from dash.dependencies import Input, Output
+import dash
+from dash import ALL, ClientsideFunction, Patch, ctx, html
+from dash.dependencies import Input, Output, State
+import numpy as np
 import plotly.graph_objs as go
 from plotly.subplots import make_subplots
 
-# Define callback to update the chart and revenue/user display
-def register_callbacks(app):
-    @app.callback(
-        [Output("revenue_chart", "figure"), Output("revenue_user_display", "children")],
-        [
-            Input("year1_user_base", "value"),
-            Input("year2_growth", "value"),
-            Input("year3_growth", "value"),
-            Input("year4_growth", "value"),
-            Input("year5_growth", "value"),
-            Input("basic_tier1", "value"),
-            Input("curious_tier1", "value"),
-            Input("oracle_tier1", "value"),
-            Input("cpc1", "value"),
-            Input("cpm1", "value"),
-            Input("ctr1", "value"),
-            Input("arpu1", "value"),
-            Input("basic_tier2", "value"),
-            Input("curious_tier2", "value"),
-            Input("oracle_tier2", "value"),
-            Input("cpc2", "value"),
-            Input("cpm2", "value"),
-            Input("ctr2", "value"),
-            Input("arpu2", "value"),
-            Input("basic_tier3", "value"),
-            Input("curious_tier3", "value"),
-            Input("oracle_tier3", "value"),
-            Input("cpc3", "value"),
-            Input("cpm3", "value"),
-            Input("ctr3", "value"),
-            Input("arpu3", "value"),
-            Input("basic_tier4", "value"),
-            Input("curious_tier4", "value"),
-            Input("oracle_tier4", "value"),
-            Input("cpc4", "value"),
-            Input("cpm4", "value"),
-            Input("ctr4", "value"),
-            Input("arpu4", "value"),
-            Input("basic_tier5", "value"),
-            Input("curious_tier5", "value"),
-            Input("oracle_tier5", "value"),
-            Input("cpc5", "value"),
-            Input("cpm5", "value"),
-            Input("ctr5", "value"),
-            Input("arpu5", "value"),
-        ],
+from callback_cache import memoize
+from goal_seek import (
+    SEARCH_BOUNDS,
+    goal_seek,
+    goal_seek_pair,
+    goal_seek_probability,
+    with_value,
+    year_metric,
+)
+from layouts.goal_seek import PARAMETER_LABELS
+from layouts.parameters import NUM_YEARS, parameter_id
+from montecarlo_engine import ENGINE_VERSION
+from projection import GRANULARITIES, interpolation_weights, period_labels
+from revenue_model import project_revenue
+
+# Per-year inputs besides the user base and growth
+YEAR_INPUTS = ["basic_tier", "curious_tier", "oracle_tier", "cpc", "cpm", "ctr", "arpu"]
+
+# Chart traces in figure order, by revenue model component
+TRACES = ["basic_users", "curious_users", "oracle_users", "ad_revenue", "total_revenue"]
+
+# Inputs entered as percentages; the revenue model takes fractions
+PERCENT_INPUTS = ["growth", "basic_tier", "curious_tier", "oracle_tier", "ctr"]
+
+# Points of the goal seek curves, and the seed of its Monte Carlo mode so
+# that solving twice gives the same answer
+GOAL_SEEK_POINTS = 50
+GOAL_SEEK_SEED = 0
+
+# Seeded Monte Carlo goal seeks always give the same answer, so every worker
+# shares them through the callback cache
+cached_goal_seek_probability = memoize(f"goal_seek_probability:{ENGINE_VERSION}")(
+    goal_seek_probability
+)
+
+# Per-period results memoized for every year in the session store
+MEMO_COMPONENTS = TRACES + ["users"]
+
+# Traces that depend on each parameter
+PARAMETER_TRACES = {
+    "user_base": TRACES,
+    "growth": TRACES,
+    "basic_tier": ["basic_users"],
+    "curious_tier": ["curious_users", "total_revenue"],
+    "oracle_tier": ["oracle_users", "total_revenue"],
+    "cpc": ["ad_revenue", "total_revenue"],
+    "cpm": ["ad_revenue", "total_revenue"],
+    "ctr": ["ad_revenue", "total_revenue"],
+    "arpu": ["ad_revenue", "total_revenue"],
+}
+
+
+def parameter_key(name, year):
+    # JSON-friendly key of one yearly parameter, as kept in the stores
+    return f"{name}:{year}"
+
+
+def scenario_params(values):
+    """Revenue model parameters of the dashboard scenario, a single path.
+
+    values maps (name, year) to the input value.
+    """
+    return scenario_batch(
+        [{parameter_key(name, year): value for (name, year), value in values.items()}]
     )
-    def update_chart(
-        year1_user_base,
-        year2_growth,
-        year3_growth,
-        year4_growth,
-        year5_growth,
-        basic_tier1,
-        curious_tier1,
-        oracle_tier1,
-        cpc1,
-        cpm1,
-        ctr1,
-        arpu1,
-        basic_tier2,
-        curious_tier2,
-        oracle_tier2,
-        cpc2,
-        cpm2,
-        ctr2,
-        arpu2,
-        basic_tier3,
-        curious_tier3,
-        oracle_tier3,
-        cpc3,
-        cpm3,
-        ctr3,
-        arpu3,
-        basic_tier4,
-        curious_tier4,
-        oracle_tier4,
-        cpc4,
-        cpm4,
-        ctr4,
-        arpu4,
-        basic_tier5,
-        curious_tier5,
-        oracle_tier5,
-        cpc5,
-        cpm5,
-        ctr5,
-        arpu5,
-    ):
-        # Calculate user base for each year
-        user_base = [year1_user_base]
-        growth_rates = [year2_growth, year3_growth, year4_growth, year5_growth]
-        for growth in growth_rates:
-            user_base.append(user_base[-1] * (1 + growth / 100))
-
-        # Calculate subscription revenue and user distribution
-        subscription_revenue = []
-        basic_users = []
-        curious_users = []
-        oracle_users = []
-
-        tiers = [
-            (basic_tier1, curious_tier1, oracle_tier1),
-            (basic_tier2, curious_tier2, oracle_tier2),
-            (basic_tier3, curious_tier3, oracle_tier3),
-            (basic_tier4, curious_tier4, oracle_tier4),
-            (basic_tier5, curious_tier5, oracle_tier5),
-        ]
 
-        cpc = [cpc1, cpc2, cpc3, cpc4, cpc5]
-        cpm = [cpm1, cpm2, cpm3, cpm4, cpm5]
-        ctr = [ctr1, ctr2, ctr3, ctr4, ctr5]
-        arpu = [arpu1, arpu2, arpu3, arpu4, arpu5]
-
-        for i, users in enumerate(user_base):
-            basic = users * (tiers[i][0] / 100)
-            curious = users * (tiers[i][1] / 100) * 4.99
-            oracle = users * (tiers[i][2] / 100) * 14.99
-            subscription_revenue.append(curious + oracle)
-            basic_users.append(basic)
-            curious_users.append(users * (tiers[i][1] / 100))
-            oracle_users.append(users * (tiers[i][2] / 100))
-
-        # Calculate ad revenue
-        ad_revenue = []
-        for i, users in enumerate(user_base):
-            impressions = users * (ctr[i] / 100) * 12 * 1000
-            clicks = users * (ctr[i] / 100) * 12
-            revenue = (impressions / 1000) * cpm[i] + clicks * cpc[i] + users * arpu[i] * 12
-            ad_revenue.append(revenue)
-
-        # Total revenue
-        total_revenue = [
-            sub_rev + ad_rev for sub_rev, ad_rev in zip(subscription_revenue, ad_revenue)
-        ]
 
-        # Create stacked bar chart with line graph
-        years = ["Year 1", "Year 2", "Year 3", "Year 4", "Year 5"]
-        fig = make_subplots(specs=[[{"secondary_y": True}]])
+def scenario_batch(scenarios):
+    """Parameters of many scenarios stacked along the batch axis.
 
-        # Add bars for subscription tiers and ad revenue
-        fig.add_trace(
-            go.Bar(
-                name="Basic Users",
-                x=years,
-                y=basic_users,
-                text=basic_users,
-                textposition="inside",
-                insidetextanchor="middle",
-            ),
-            secondary_y=False,
-        )
-        fig.add_trace(
-            go.Bar(
-                name="Curious Users",
-                x=years,
-                y=curious_users,
-                text=curious_users,
-                textposition="inside",
-                insidetextanchor="middle",
-            ),
-            secondary_y=False,
-        )
-        fig.add_trace(
-            go.Bar(
-                name="Oracle Users",
-                x=years,
-                y=oracle_users,
-                text=oracle_users,
-                textposition="inside",
-                insidetextanchor="middle",
-            ),
-            secondary_y=False,
-        )
+    Each scenario maps parameter_key() to a value, as in scenarios-store, and
+    the stack is evaluated with a single project_revenue() call. Year 1
+    starts at the given user base, so it gets no growth.
+    """
+    years = range(1, NUM_YEARS + 1)
+    columns = {
+        "user_base": [parameter_key("user_base", 1)],
+        "growth": [parameter_key("growth", year) for year in years[1:]],
+    }
+    for name in YEAR_INPUTS:
+        columns[name] = [parameter_key(name, year) for year in years]
+    keys = [key for keys in columns.values() for key in keys]
+    table = np.array(
+        [[scenario[key] for key in keys] for scenario in scenarios], dtype=float
+    )
+
+    params = {}
+    start = 0
+    for name, keys in columns.items():
+        params[name] = table[:, start : start + len(keys)]
+        start += len(keys)
+    params["user_base"] = params["user_base"][:, 0]
+    params["growth"] = np.column_stack([np.zeros(len(table)), params["growth"]])
+    for name in PERCENT_INPUTS:
+        params[name] = params[name] / 100
+    return params
+
+
+def model_value(params, name, year):
+    # Current value of one parameter of a single-path scenario
+    if name == "user_base":
+        return params["user_base"][0]
+    return params[name][0, year - 1]
+
+
+def input_value(name, value):
+    # Model value of a parameter in the units of its input
+    return value * 100 if name in PERCENT_INPUTS else value
+
+
+def affected_periods(name, year, periods_per_year):
+    """Periods whose values change when one yearly parameter changes.
+
+    A yearly value reaches the periods it is interpolated into; the user base
+    and growth also carry over to every later period through compounding.
+    """
+    weights = interpolation_weights(NUM_YEARS, NUM_YEARS, periods_per_year)
+    periods = np.flatnonzero(weights[year - 1])
+    if name in ("user_base", "growth"):
+        return np.arange(periods[0], weights.shape[1])
+    return periods
+
+
+def changed_parameters(values, memo_values):
+    # (name, year) of every input that differs from the memoized scenario
+    return [
+        (name, year)
+        for (name, year), value in values.items()
+        if memo_values.get(parameter_key(name, year)) != value
+    ]
+
+
+def evaluate_year(params, year, periods_per_year, start_users):
+    """Memo entry of one year (0-based), from the user base at its start."""
+    periods = slice(year * periods_per_year, (year + 1) * periods_per_year)
+    components = project_revenue(params, periods_per_year, periods, start_users)
+    return {name: components[name][0].tolist() for name in MEMO_COMPONENTS}
+
+
+def trace_text(name, values):
+    # Bars show the raw value, the total line a rounded euro amount
+    if name == "total_revenue":
+        return [f"€{x:.2f}" for x in values]
+    return [str(x) for x in values]
+
+
+def display_line(label, total_revenue, users):
+    return f"{label}: Total Revenue: €{total_revenue:,.2f}, Total Users: {int(users)}"
+
+
+def revenue_figure(years, revenue):
+    # Create stacked bar chart with line graph
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+
+    # Add bars for subscription tiers and ad revenue
+    bars = [
+        ("Basic Users", "basic_users"),
+        ("Curious Users", "curious_users"),
+        ("Oracle Users", "oracle_users"),
+        ("Ad Revenue", "ad_revenue"),
+    ]
+    for label, name in bars:
         fig.add_trace(
             go.Bar(
-                name="Ad Revenue",
+                name=label,
                 x=years,
-                y=ad_revenue,
-                text=ad_revenue,
+                y=revenue[name],
+                text=trace_text(name, revenue[name]),
                 textposition="inside",
                 insidetextanchor="middle",
             ),
             secondary_y=False,
         )
 
-        # Add single line for total revenue
+    # Add single line for total revenue
+    fig.add_trace(
+        go.Scatter(
+            name="Total Revenue",
+            x=years,
+            y=revenue["total_revenue"],
+            mode="lines+markers+text",
+            text=trace_text("total_revenue", revenue["total_revenue"]),
+            textposition="top right",
+            line=dict(color="black"),
+        ),
+        secondary_y=True,
+    )
+
+    # Update layout
+    fig.update_layout(
+        barmode="stack",
+        title="Revenue Year Over Year",
+        xaxis={"title": "Period"},
+        yaxis={"title": "Revenue (€)"},
+        yaxis2={"title": "Total Users"},
+    )
+    return fig
+
+
+def comparison_figure(names, total_revenue, years, mode):
+    # One total revenue line per scenario, or its gap to the first one
+    fig = go.Figure()
+    if mode == "diff":
+        total_revenue = total_revenue - total_revenue[0]
+    for name, revenue in zip(names, total_revenue):
+        fig.add_trace(go.Scatter(name=name, x=years, y=revenue, mode="lines+markers"))
+    fig.update_layout(
+        title="Total Revenue by Scenario"
+        if mode == "overlay"
+        else f"Total Revenue Difference to {names[0]}",
+        xaxis={"title": "Period"},
+        yaxis={"title": "Revenue (€)"},
+    )
+    return fig
+
+
+def goal_seek_figure(x_label, x, y_label, y, markers=(), target=None):
+    # A goal seek curve, with the solution and current inputs as markers and
+    # the target as a horizontal line
+    fig = go.Figure(go.Scatter(name=y_label, x=x, y=y, mode="lines"))
+    for label, marker_x, marker_y in markers:
         fig.add_trace(
-            go.Scatter(
-                name="Total Revenue",
-                x=years,
-                y=total_revenue,
-                mode="lines+markers+text",
-                text=[f"€{x:.2f}" for x in total_revenue],
-                textposition="top right",
-                line=dict(color="black"),
-            ),
-            secondary_y=True,
+            go.Scatter(name=label, x=[marker_x], y=[marker_y], mode="markers")
         )
+    if target is not None:
+        fig.add_hline(y=target, line_dash="dash", annotation_text="Target")
+    fig.update_layout(
+        title=f"{y_label} by {x_label}",
+        xaxis={"title": x_label},
+        yaxis={"title": y_label},
+    )
+    return fig
+
+
+def sweep_range(name, *values):
+    # Values of a parameter shown on a goal seek chart: from zero to twice
+    # the largest of the given ones, within its search bounds
+    low, high = SEARCH_BOUNDS[name]
+    largest = max((value for value in values if np.isfinite(value)), default=0)
+    high = min(high, 2 * largest) if largest > 0 else high
+    return np.linspace(max(low, 0), high, GOAL_SEEK_POINTS)
+
+
+# Define callback to update the chart and revenue/user display
+def register_callbacks(app):
+    # Every edit goes through assets/revenue_model.js first. In browser mode
+    # it recomputes the chart there; otherwise it forwards the edit to
+    # update_chart through revenue-request-store
+    app.clientside_callback(
+        ClientsideFunction(namespace="income", function_name="route_update"),
+        [
+            Output("revenue_chart", "figure", allow_duplicate=True),
+            Output("revenue_user_display", "children", allow_duplicate=True),
+            Output("revenue-request-store", "data"),
+        ],
+        Input("granularity", "value"),
+        Input(parameter_id(ALL, ALL), "value"),
+        Input("compute-mode", "value"),
+        State("revenue_chart", "figure"),
+        State("projection-store", "data"),
+        prevent_initial_call=True,
+    )
+
+    @app.callback(
+        [
+            Output("revenue_chart", "figure"),
+            Output("revenue_user_display", "children"),
+            Output("revenue-memo-store", "data"),
+        ],
+        Input("revenue-request-store", "data"),
+        State("granularity", "value"),
+        State(parameter_id(ALL, ALL), "value"),
+        State("revenue-memo-store", "data"),
+    )
+    def update_chart(request, granularity, parameter_values, memo):
+        if any(value is None for value in parameter_values):
+            return dash.no_update, dash.no_update, dash.no_update
+        ids = [item["id"] for item in ctx.states_list[1]]
+        values = {
+            (id["name"], id["year"]): value for id, value in zip(ids, parameter_values)
+        }
+        periods_per_year = GRANULARITIES[granularity]
+        years = period_labels(NUM_YEARS, periods_per_year)
+
+        # Year N only depends on years up to N through the user base, so an
+        # edit invalidates the years its input reaches and, for the user base
+        # and growth, every later year. Everything else comes from the memo
+        if memo is None or memo["periods_per_year"] != periods_per_year:
+            memo = {"periods_per_year": periods_per_year, "values": {}, "years": {}}
+        changes = changed_parameters(values, memo["values"])
 
-        # Update layout
-        fig.update_layout(
-            barmode="stack",
-            title="Revenue Year Over Year",
-            xaxis={"title": "Year"},
-            yaxis={"title": "Revenue (€)"},
-            yaxis2={"title": "Total Users"},
+        # A new timestep, a switch back from browser mode or the first load
+        # draws everything
+        redraw = request is None or request["redraw"]
+        if not changes and not redraw:
+            return dash.no_update, dash.no_update, dash.no_update
+        periods = sorted(
+            {
+                period
+                for name, year in changes
+                for period in affected_periods(name, year, periods_per_year).tolist()
+            }
         )
+        stale_years = sorted({period // periods_per_year for period in periods})
+
+        # Recompute the stale years in order, each starting from the user base
+        # at the end of the year before it
+        params = scenario_params(values)
+        memo_patch = Patch()
+        for year in stale_years:
+            start_users = (
+                params["user_base"]
+                if year == 0
+                else np.array(memo["years"][str(year - 1)]["users"][-1:])
+            )
+            memo["years"][str(year)] = evaluate_year(
+                params, year, periods_per_year, start_users
+            )
+            memo_patch["years"][str(year)] = memo["years"][str(year)]
+        for name, year in changes:
+            memo["values"][parameter_key(name, year)] = values[(name, year)]
+            memo_patch["values"][parameter_key(name, year)] = values[(name, year)]
+        revenue = {
+            name: sum(
+                (memo["years"][str(year)][name] for year in range(NUM_YEARS)), []
+            )
+            for name in MEMO_COMPONENTS
+        }
+
+        if redraw:
+            revenue_user_display = [
+                html.P(
+                    display_line(years[i], revenue["total_revenue"][i], revenue["users"][i])
+                )
+                for i in range(len(years))
+            ]
+            return revenue_figure(years, revenue), revenue_user_display, memo
+
+        # Otherwise patch only the traces and periods the edited inputs reach
+        traces = [
+            name
+            for name in TRACES
+            if any(name in PARAMETER_TRACES[changed] for changed, _ in changes)
+        ]
+        figure = Patch()
+        for name in traces:
+            text = trace_text(name, revenue[name])
+            for period in periods:
+                figure["data"][TRACES.index(name)]["y"][period] = revenue[name][period]
+                figure["data"][TRACES.index(name)]["text"][period] = text[period]
 
-        # Create revenue and user display
-        revenue_user_display = [
-            html.P(
-                f"Year {i+1}: Total Revenue: €{total_revenue[i]:,.2f}, Total Users: {int(user_base[i])}"
+        if "total_revenue" not in traces:
+            return figure, dash.no_update, memo_patch
+        revenue_user_display = Patch()
+        for period in periods:
+            revenue_user_display[period]["props"]["children"] = display_line(
+                years[period], revenue["total_revenue"][period], revenue["users"][period]
             )
-            for i in range(5)
+        return figure, revenue_user_display, memo_patch
+
+    @app.callback(
+        [Output("scenarios-store", "data"), Output("scenario-select", "value")],
+        Input("btn-save-scenario", "n_clicks"),
+        Input("btn-delete-scenario", "n_clicks"),
+        State("scenario-name", "value"),
+        State(parameter_id(ALL, ALL), "value"),
+        State("scenarios-store", "data"),
+        State("scenario-select", "value"),
+        prevent_initial_call=True,
+    )
+    def manage_scenarios(
+        save_clicks, delete_clicks, name, parameter_values, scenarios, selected
+    ):
+        if not name:
+            return dash.no_update, dash.no_update
+        scenarios = dict(scenarios or {})
+        if ctx.triggered_id == "btn-save-scenario":
+            if any(value is None for value in parameter_values):
+                return dash.no_update, dash.no_update
+            ids = [item["id"] for item in ctx.states_list[1]]
+            scenarios[name] = {
+                parameter_key(id["name"], id["year"]): value
+                for id, value in zip(ids, parameter_values)
+            }
+            if name not in selected:
+                selected = selected + [name]
+        else:
+            scenarios.pop(name, None)
+            selected = [scenario for scenario in selected if scenario != name]
+        return scenarios, selected
+
+    @app.callback(
+        Output("scenario-select", "options"),
+        Input("scenarios-store", "data"),
+    )
+    def list_scenarios(scenarios):
+        return [{"label": name, "value": name} for name in scenarios or {}]
+
+    @app.callback(
+        Output("scenario_chart", "figure"),
+        Input("scenario-select", "value"),
+        Input("comparison-mode", "value"),
+        Input("granularity", "value"),
+        Input("scenarios-store", "data"),
+    )
+    def compare_scenarios(selected, mode, granularity, scenarios):
+        names = [name for name in selected if name in (scenarios or {})]
+        if not names:
+            return go.Figure(layout={"title": "Save scenarios to compare them"})
+
+        # Every selected scenario in one batched model run
+        periods_per_year = GRANULARITIES[granularity]
+        params = scenario_batch([scenarios[name] for name in names])
+        total_revenue = project_revenue(params, periods_per_year)["total_revenue"]
+        years = period_labels(NUM_YEARS, periods_per_year)
+        return comparison_figure(names, total_revenue, years, mode)
+
+    @app.callback(
+        [
+            Output("goal-result", "children"),
+            Output("goal_seek_chart", "figure"),
+            Output("goal-seek-store", "data"),
+        ],
+        Input("btn-goal-seek", "n_clicks"),
+        State("goal-parameter", "value"),
+        State("goal-parameter-year", "value"),
+        State("goal-second-parameter", "value"),
+        State("goal-second-year", "value"),
+        State("goal-metric", "value"),
+        State("goal-target", "value"),
+        State("goal-year", "value"),
+        State("goal-mode", "value"),
+        State("goal-probability", "value"),
+        State("granularity", "value"),
+        State(parameter_id(ALL, ALL), "value"),
+        prevent_initial_call=True,
+    )
+    def solve_goal(
+        n_clicks,
+        name,
+        year,
+        second,
+        second_year,
+        metric,
+        target,
+        target_year,
+        mode,
+        probability,
+        granularity,
+        parameter_values,
+    ):
+        if target is None or any(value is None for value in parameter_values):
+            return dash.no_update, dash.no_update, dash.no_update
+        # Select values come back from the browser as strings
+        year = 1 if name == "user_base" else int(year)
+        second_year = 1 if second == "user_base" else int(second_year)
+        target_year = int(target_year)
+        if (name, year) == ("growth", 1) or (second, second_year) == ("growth", 1):
+            message = "Year 1 has no growth, it starts at the user base."
+            return message, go.Figure(), None
+        ids = [item["id"] for item in ctx.states_list[-1]]
+        values = {
+            (id["name"], id["year"]): value for id, value in zip(ids, parameter_values)
+        }
+        periods_per_year = GRANULARITIES[granularity]
+        params = scenario_params(values)
+        label = f"{PARAMETER_LABELS[name]} in Year {year}"
+        metric_label = {"total_revenue": "Total Revenue (€)", "users": "Total Users"}[
+            metric
         ]
+        low, high = (input_value(name, bound) for bound in SEARCH_BOUNDS[name])
+        unreachable = (
+            f"No {label} between {low:,.2f} and {high:,.2f} reaches the target.",
+            go.Figure(),
+            None,
+        )
+
+        if mode == "montecarlo":
+            if second:
+                message = "Trade-offs are traced in deterministic mode only."
+                return message, go.Figure(), None
+            value = cached_goal_seek_probability(
+                params,
+                (name, year),
+                target,
+                target_year,
+                (probability or 0) / 100,
+                metric,
+                seed=GOAL_SEEK_SEED,
+                periods_per_year=periods_per_year,
+            )
+            if np.isnan(value):
+                return unreachable
+            return (
+                f"{label}: {input_value(name, value):,.2f} reaches the target "
+                f"with {probability}% probability.",
+                go.Figure(layout={"title": "Charts are drawn in deterministic mode"}),
+                None,
+            )
+
+        if second:
+            # Every value of the second parameter that hits the target, for
+            # a sweep of the first one
+            second_label = f"{PARAMETER_LABELS[second]} in Year {second_year}"
+            sweep = sweep_range(name, model_value(params, name, year))
+            solutions = goal_seek_pair(
+                params,
+                (name, year),
+                sweep,
+                (second, second_year),
+                target,
+                target_year,
+                metric,
+                periods_per_year,
+            )
+            if np.isnan(solutions).all():
+                return unreachable
+            return (
+                f"{np.isfinite(solutions).sum()} of {len(sweep)} values of {label} "
+                f"can reach the target through {second_label}.",
+                goal_seek_figure(
+                    label,
+                    input_value(name, sweep),
+                    second_label,
+                    input_value(second, solutions),
+                    [
+                        (
+                            "Current",
+                            values[(name, year)],
+                            values[(second, second_year)],
+                        )
+                    ],
+                ),
+                None,
+            )
+
+        solution = goal_seek(
+            params, (name, year), target, target_year, metric, periods_per_year
+        )[0]
+        if np.isnan(solution):
+            return unreachable
+        sweep = sweep_range(name, model_value(params, name, year), solution)
+        curve = year_metric(
+            with_value(params, (name, year), sweep),
+            metric,
+            target_year,
+            periods_per_year,
+        )
+        solution_input = input_value(name, solution)
+        return (
+            f"{label}: {solution_input:,.2f}",
+            goal_seek_figure(
+                label,
+                input_value(name, sweep),
+                f"{metric_label}, Year {target_year}",
+                curve,
+                [("Solution", solution_input, target)],
+                target,
+            ),
+            {"name": name, "year": year, "value": solution_input},
+        )
 
-        return fig, revenue_user_display
\ No newline at end of file
+    @app.callback(
+        Output(parameter_id(ALL, ALL), "value"),
+        Input("btn-goal-apply", "n_clicks"),
+        State("goal-seek-store", "data"),
+        State(parameter_id(ALL, ALL), "value"),
+        prevent_initial_call=True,
+    )
+    def apply_goal(n_clicks, solution, parameter_values):
+        if solution is None:
+            return [dash.no_update] * len(parameter_values)
+        # Rounded to the precision of the inputs, whole users for the base
+        value = solution["value"]
+        if solution["name"] == "user_base":
+            value = int(round(value))
+        else:
+            value = round(value, 2)
+        target = (solution["name"], solution["year"])
+        return [
+            value if (item["id"]["name"], item["id"]["year"]) == target else current
+            for item, current in zip(ctx.states_list[-1], parameter_values)
+        ]
@@ -0,0 +1,100 @@
+from dash import html, dcc
+import dash_bootstrap_components as dbc
+
+from .parameters import NUM_YEARS
+
+# Parameters the goal seek can solve for, labelled as in the year columns
+PARAMETER_LABELS = {
+    "user_base": "User Base",
+    "growth": "Growth (%)",
+    "curious_tier": "Curious Tier (%)",
+    "oracle_tier": "Oracle Tier (%)",
+    "cpc": "CPC (€/click)",
+    "cpm": "CPM (€/1000 impressions)",
+    "ctr": "CTR (%)",
+    "arpu": "ARPU (€/user/month)",
+}
+
+GOAL_METRICS = [
+    {"label": "Total Revenue (€)", "value": "total_revenue"},
+    {"label": "Total Users", "value": "users"},
+]
+
+GOAL_MODES = [
+    {"label": "Deterministic", "value": "deterministic"},
+    {"label": "Monte Carlo", "value": "montecarlo"},
+]
+
+
+def year_options():
+    return [{"label": f"Year {year}", "value": year} for year in range(1, NUM_YEARS + 1)]
+
+
+def parameter_select(id, year_id, year, none_option=False):
+    options = [
+        {"label": label, "value": name} for name, label in PARAMETER_LABELS.items()
+    ]
+    if none_option:
+        options = [{"label": "(none)", "value": ""}] + options
+    return dbc.InputGroup(
+        [
+            dbc.Select(id=id, options=options, value="" if none_option else "growth"),
+            dbc.Select(id=year_id, options=year_options(), value=year),
+        ],
+        className="mb-2",
+    )
+
+
+def create_goal_seek_panel():
+    controls = [
+        html.H4("Goal Seek"),
+        html.Label("Solve for"),
+        parameter_select("goal-parameter", "goal-parameter-year", 2),
+        html.Label("Trade off against (optional)"),
+        parameter_select(
+            "goal-second-parameter", "goal-second-year", 3, none_option=True
+        ),
+        html.Label("Target"),
+        dbc.InputGroup(
+            [
+                dbc.Select(id="goal-metric", options=GOAL_METRICS, value="total_revenue"),
+                dbc.Input(id="goal-target", type="number", value=5000000, min=0),
+                dbc.Select(id="goal-year", options=year_options(), value=3),
+            ],
+            className="mb-2",
+        ),
+        dbc.RadioItems(
+            id="goal-mode", options=GOAL_MODES, value="deterministic", inline=True
+        ),
+        dbc.InputGroup(
+            [
+                dbc.InputGroupText("Probability (%)"),
+                dbc.Input(id="goal-probability", type="number", value=90, min=1, max=99),
+            ],
+            className="mb-2",
+        ),
+        html.Div(
+            [
+                dbc.Button("Solve", id="btn-goal-seek", color="primary", className="me-2"),
+                dbc.Button("Apply", id="btn-goal-apply", color="secondary", outline=True),
+            ],
+            className="mb-2",
+        ),
+        html.P(
+            "Deterministic mode solves on the parameters above; with a second "
+            "parameter it traces every pair that hits the target. Monte Carlo "
+            "mode spreads the other parameters around the inputs above, as "
+            "widely as the simulation app's ranges, and finds the value that "
+            "hits the target with the given probability. Apply copies the solved value into its input."
+        ),
+        html.Div(id="goal-result"),
+        # Last deterministic solution, for Apply
+        dcc.Store(id="goal-seek-store"),
+    ]
+    return dbc.Row(
+        [
+            dbc.Col(controls, width=3),
+            dbc.Col(dcc.Graph(id="goal_seek_chart"), width=9),
+        ],
+        className="border-top pt-3",
+    )
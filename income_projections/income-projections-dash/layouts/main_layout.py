@@ -1,14 +1,44 @@
 from dash import html, dcc
 import dash_bootstrap_components as dbc
 
-from .parameters import create_year_parameters, create_metric_explanation
+from projection import GRANULARITIES, ROOT_ITERATIONS, interpolation_terms
+
+from .parameters import NUM_YEARS, create_year_parameters, create_metric_explanation
+from .goal_seek import create_goal_seek_panel
+from .scenarios import create_scenario_manager
+
+
+def projection_data():
+    # What assets/revenue_model.js needs to reproduce the server projection
+    terms = {}
+    for periods_per_year in GRANULARITIES.values():
+        lower, lower_weight, upper, upper_weight = interpolation_terms(
+            NUM_YEARS, NUM_YEARS, periods_per_year
+        )
+        terms[periods_per_year] = {
+            "lower": lower.tolist(),
+            "lower_weight": lower_weight.tolist(),
+            "upper": upper.tolist(),
+            "upper_weight": upper_weight.tolist(),
+        }
+    return {
+        "num_years": NUM_YEARS,
+        "granularities": GRANULARITIES,
+        "root_iterations": ROOT_ITERATIONS,
+        "terms": terms,
+    }
+
 
 def create_layout():
     layout = dbc.Container(
         [
-            dcc.Store(
-                id="tier-percentages-store", data={"basic": 85, "curious": 10, "oracle": 5}
-            ),
+            # Named parameter sets, scenario name -> {"name:year": value}
+            dcc.Store(id="scenarios-store", data={}, storage_type="local"),
+            # Per-year results of the revenue model, reused across edits
+            dcc.Store(id="revenue-memo-store", storage_type="session"),
+            # Edits routed to the server; unused in browser mode
+            dcc.Store(id="revenue-request-store"),
+            dcc.Store(id="projection-store", data=projection_data()),
             dbc.Row(
                 [
                     dbc.Col(
@@ -17,6 +47,23 @@ def create_layout():
                     ),
                     dbc.Col(
                         [
+                            dbc.RadioItems(
+                                id="granularity",
+                                options=[
+                                    {"label": name.capitalize(), "value": name}
+                                    for name in GRANULARITIES
+                                ],
+                                value="annual",
+                                inline=True,
+                            ),
+                            dbc.Checklist(
+                                id="compute-mode",
+                                options=[
+                                    {"label": "Compute in browser", "value": "browser"}
+                                ],
+                                value=[],
+                                switch=True,
+                            ),
                             html.H4("Total Revenue and User Base Per Year"),
                             html.Div(id="revenue_user_display"),
                         ],
@@ -25,19 +72,18 @@ def create_layout():
                 ],
                 style={"height": "50%"},
             ),
+            create_scenario_manager(),
+            create_goal_seek_panel(),
             dbc.Row(
                 [
                     dbc.Col(
-                        create_year_parameters(1, user_base=True),
+                        create_year_parameters(year, user_base=year == 1),
                         width=2,
                         className="border-end",
-                    ),
-                    dbc.Col(create_year_parameters(2), width=2, className="border-end"),
-                    dbc.Col(create_year_parameters(3), width=2, className="border-end"),
-                    dbc.Col(create_year_parameters(4), width=2, className="border-end"),
-                    dbc.Col(create_year_parameters(5), width=2, className="border-end"),
-                    dbc.Col(create_metric_explanation(), width=2),
-                ],
+                    )
+                    for year in range(1, NUM_YEARS + 1)
+                ]
+                + [dbc.Col(create_metric_explanation(), width=2)],
                 style={"height": "50%"},
             ),
         ],
@@ -1,6 +1,20 @@
 from dash import html 
 import dash_bootstrap_components as dbc
 
+# Years with their own parameter column in the dashboard
+NUM_YEARS = 5
+
+
+def parameter_id(name, year):
+    """Pattern-matching id of one yearly parameter input."""
+    return {"type": "year_parameter", "name": name, "year": year}
+
+
+def parameter_input(name, year, **kwargs):
+    # Debounced: the value is sent on Enter or blur, not on every keystroke
+    return dbc.Input(id=parameter_id(name, year), type="number", debounce=True, **kwargs)
+
+
 def create_year_parameters(year, user_base=False):
     parameters = [
         html.H3(f"Year {year} Parameters"),
@@ -9,13 +23,9 @@ def create_year_parameters(year, user_base=False):
             [
                 dbc.Col(html.Label("User Base" if user_base else "Growth (%)")),
                 dbc.Col(
-                    dbc.Input(
-                        id=(
-                            f"year{year}_user_base"
-                            if user_base
-                            else f"year{year}_growth"
-                        ),
-                        type="number",
+                    parameter_input(
+                        "user_base" if user_base else "growth",
+                        year,
                         value=1000 if user_base else 10,
                         min=0,
                     )
@@ -28,9 +38,9 @@ def create_year_parameters(year, user_base=False):
             [
                 dbc.Col(html.Label("Basic Free Tier (%)")),
                 dbc.Col(
-                    dbc.Input(
-                        id=f"basic_tier{year}",
-                        type="number",
+                    parameter_input(
+                        "basic_tier",
+                        year,
                         value=85,
                         min=0,
                         max=100,
@@ -44,9 +54,9 @@ def create_year_parameters(year, user_base=False):
             [
                 dbc.Col(html.Label("Curious Tier (%)")),
                 dbc.Col(
-                    dbc.Input(
-                        id=f"curious_tier{year}",
-                        type="number",
+                    parameter_input(
+                        "curious_tier",
+                        year,
                         value=10,
                         min=0,
                         max=100,
@@ -60,9 +70,9 @@ def create_year_parameters(year, user_base=False):
             [
                 dbc.Col(html.Label("Oracle Tier (%)")),
                 dbc.Col(
-                    dbc.Input(
-                        id=f"oracle_tier{year}",
-                        type="number",
+                    parameter_input(
+                        "oracle_tier",
+                        year,
                         value=5,
                         min=0,
                         max=100,
@@ -90,28 +100,28 @@ def create_year_parameters(year, user_base=False):
         dbc.Row(
             [
                 dbc.Col(html.Label("CPC (€/click)")),
-                dbc.Col(dbc.Input(id=f"cpc{year}", type="number", value=0.5, min=0)),
+                dbc.Col(parameter_input("cpc", year, value=0.5, min=0)),
             ],
             className="mb-3",
         ),
         dbc.Row(
             [
                 dbc.Col(html.Label("CPM (€/1000 impressions)")),
-                dbc.Col(dbc.Input(id=f"cpm{year}", type="number", value=5, min=0)),
+                dbc.Col(parameter_input("cpm", year, value=5, min=0)),
             ],
             className="mb-3",
         ),
         dbc.Row(
             [
                 dbc.Col(html.Label("CTR (%)")),
-                dbc.Col(dbc.Input(id=f"ctr{year}", type="number", value=1, min=0)),
+                dbc.Col(parameter_input("ctr", year, value=1, min=0)),
             ],
             className="mb-3",
         ),
         dbc.Row(
             [
                 dbc.Col(html.Label("ARPU (€/user/month)")),
-                dbc.Col(dbc.Input(id=f"arpu{year}", type="number", value=0.75, min=0)),
+                dbc.Col(parameter_input("arpu", year, value=0.75, min=0)),
             ],
             className="mb-3",
         ),
@@ -124,6 +134,10 @@ def create_metric_explanation():
         html.H3("Metric Explanations"),
         html.P("User Base: Number of users in the first year."),
         html.P("Growth (%): Year-over-year growth percentage."),
+        html.P(
+            "Timestep: Monthly steps interpolate every parameter between the "
+            "values set for consecutive years."
+        ),
         html.P("Basic Free Tier (%): Percentage of users in the Basic Free tier."),
         html.P(
             "Curious Tier (%): Percentage of users in the Curious tier (4.99 €/month)."
@@ -0,0 +1,41 @@
+from dash import html, dcc
+import dash_bootstrap_components as dbc
+
+COMPARISON_MODES = [
+    {"label": "Overlay", "value": "overlay"},
+    {"label": "Difference to first", "value": "diff"},
+]
+
+
+def create_scenario_manager():
+    controls = [
+        html.H4("Scenarios"),
+        dbc.InputGroup(
+            [
+                dbc.Input(id="scenario-name", placeholder="Scenario name", type="text"),
+                dbc.Button("Save", id="btn-save-scenario", color="primary"),
+                dbc.Button("Delete", id="btn-delete-scenario", color="danger", outline=True),
+            ],
+            className="mb-3",
+        ),
+        html.P(
+            "Save stores the current parameters under the name. Selected "
+            "scenarios are compared below; the first one selected is the "
+            "baseline of the difference view."
+        ),
+        dbc.RadioItems(
+            id="comparison-mode",
+            options=COMPARISON_MODES,
+            value="overlay",
+            inline=True,
+            className="mb-3",
+        ),
+        dbc.Checklist(id="scenario-select", options=[], value=[]),
+    ]
+    return dbc.Row(
+        [
+            dbc.Col(controls, width=3),
+            dbc.Col(dcc.Graph(id="scenario_chart"), width=9),
+        ],
+        className="border-top pt-3",
+    )
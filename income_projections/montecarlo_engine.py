@@ -0,0 +1,680 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+import path_store
+from projection import num_periods
+from revenue_model import project_revenue
+
+# Number of paths generated and evaluated per batch in chunked mode, a
+# multiple of REPLICATE_SIZE so that every chunk splits into whole replicates
+CHUNK_SIZE = 2**17
+
+# Paths per replicate of the standard error. Every chunk is cut into
+# independent replicates of this size, whatever chunk_size is, so even a run
+# of a few hundred paths gets its SEM from their spread
+REPLICATE_SIZE = 2**7
+
+# Bump whenever a change alters the results of a seeded run, so cached
+# results from older engines are not reused
+ENGINE_VERSION = 5
+
+# Default number of projected years
+NUM_YEARS = 5
+
+# Uniform parameter ranges as (name, low, high, divisor). The user base is
+# drawn once per path, every other parameter once per path and year; those
+# yearly draws are the anchors interpolated to monthly or finer timesteps
+PARAMETER_RANGES = [
+    ("user_base", 50000, 100000, 1),
+    ("growth", 30, 50, 100),
+    ("basic_tier", 70, 80, 100),
+    ("curious_tier", 15, 20, 100),
+    ("oracle_tier", 5, 10, 100),
+    ("cpc", 0.20, 0.50, 1),
+    ("cpm", 2, 5, 1),
+    ("ctr", 0.5, 1.5, 100),
+    ("arpu", 0.50, 1.50, 1),
+]
+
+
+def num_dimensions(num_years=NUM_YEARS):
+    """Dimensions of the unit hypercube one path is drawn from."""
+    return 1 + (len(PARAMETER_RANGES) - 1) * num_years
+
+
+NUM_DIMENSIONS = num_dimensions()
+
+SAMPLING_METHODS = ["random", "antithetic", "lhs", "sobol"]
+
+# Percentiles of the fan chart bands, bins of the per-year histograms and
+# number of sample paths kept for spaghetti lines. Together they bound the
+# size of a summary whatever the number of simulated paths
+FAN_QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+HISTOGRAM_BINS = 30
+SAMPLE_PATHS = 30
+
+
+def sample_parameters(num_simulations, rng=None, num_years=NUM_YEARS):
+    """Draw the parameter distributions for a batch of simulations.
+
+    rng is a numpy Generator; without one the global np.random state is used.
+    """
+    rng = np.random if rng is None else rng
+    return {
+        "user_base": rng.uniform(50000, 100000, num_simulations),
+        "growth": rng.uniform(30, 50, (num_simulations, num_years)) / 100,
+        "basic_tier": rng.uniform(70, 80, (num_simulations, num_years)) / 100,
+        "curious_tier": rng.uniform(15, 20, (num_simulations, num_years)) / 100,
+        "oracle_tier": rng.uniform(5, 10, (num_simulations, num_years)) / 100,
+        "cpc": rng.uniform(0.20, 0.50, (num_simulations, num_years)),
+        "cpm": rng.uniform(2, 5, (num_simulations, num_years)),
+        "ctr": rng.uniform(0.5, 1.5, (num_simulations, num_years)) / 100,
+        "arpu": rng.uniform(0.50, 1.50, (num_simulations, num_years)),
+    }
+
+
+def sample_unit_cube(
+    num_simulations, method, rng, dimensions=NUM_DIMENSIONS, replicate_size=None
+):
+    """Points in [0, 1)^dimensions drawn with the given sampling method.
+
+    The points come in consecutive replicates of replicate_size (a single
+    one by default), the last one possibly shorter. Antithetic pairs, Latin
+    hypercube strata and Sobol nets never straddle two replicates, so the
+    replicate means are independent estimates.
+    """
+    replicate_size = replicate_size or max(num_simulations, 1)
+    full, rest = divmod(num_simulations, replicate_size)
+    return np.concatenate(
+        [
+            replicate_points(full, replicate_size, method, rng, dimensions),
+            replicate_points(1 if rest else 0, rest, method, rng, dimensions),
+        ]
+    )
+
+
+def replicate_points(count, size, method, rng, dimensions=NUM_DIMENSIONS):
+    """count independent designs of size points each, one after the other."""
+    if count == 0:
+        return np.empty((0, dimensions))
+    if method == "antithetic":
+        half = rng.random((count, (size + 1) // 2, dimensions))
+        points = np.concatenate([half, 1 - half], axis=1)[:, :size]
+    elif method == "lhs":
+        # One random stratum order per replicate and dimension
+        strata = rng.permuted(
+            np.broadcast_to(np.arange(size), (count, dimensions, size)), axis=-1
+        )
+        points = (strata + rng.random((count, dimensions, size))) / size
+        points = points.swapaxes(1, 2)
+    elif method == "sobol":
+        # scipy is only needed for the quasi-random sampler
+        from scipy.stats import qmc
+
+        # One scrambled net, randomized again per replicate by a random
+        # digital shift, which keeps its balance properties
+        base = qmc.Sobol(d=dimensions, scramble=True, bits=30, seed=rng).random(size)
+        shifts = rng.integers(0, 2**30, (count, 1, dimensions), dtype=np.uint64)
+        points = ((base * 2**30).astype(np.uint64) ^ shifts) / 2**30
+    else:
+        return rng.random((count * size, dimensions))
+    return points.reshape(count * size, dimensions)
+
+
+def parameters_from_unit_cube(points):
+    """Map unit-cube points onto the parameter ranges of PARAMETER_RANGES."""
+    num_years = (points.shape[1] - 1) // (len(PARAMETER_RANGES) - 1)
+    params = {}
+    column = 0
+    for name, low, high, divisor in PARAMETER_RANGES:
+        width = 1 if name == "user_base" else num_years
+        values = low + (high - low) * points[:, column : column + width]
+        params[name] = (values[:, 0] if width == 1 else values) / divisor
+        column += width
+    return params
+
+
+def mean_parameters(num_years=NUM_YEARS):
+    """Expected value of every parameter, shaped like a single path."""
+    return parameters_from_unit_cube(np.full((1, num_dimensions(num_years)), 0.5))
+
+
+def simulate_revenue(params, periods_per_year=1):
+    """Total revenue per simulation and period.
+
+    Yearly parameters are anchors interpolated to periods_per_year timesteps,
+    so the result has shape (num_simulations, num_years * periods_per_year).
+    The model itself is revenue_model.project_revenue(), shared with the
+    deterministic dashboard.
+    """
+    # The free tier brings no revenue, so its user counts are not needed here
+    params = {name: values for name, values in params.items() if name != "basic_tier"}
+    return project_revenue(params, periods_per_year)["total_revenue"]
+
+
+def monte_carlo_simulation(
+    num_simulations,
+    rng=None,
+    method="random",
+    num_years=NUM_YEARS,
+    periods_per_year=1,
+):
+    """Run every path in one batch and return the (num_simulations, periods) array."""
+    if method == "random":
+        params = sample_parameters(num_simulations, rng, num_years)
+    else:
+        rng = np.random.default_rng() if rng is None else rng
+        params = parameters_from_unit_cube(
+            sample_unit_cube(num_simulations, method, rng, num_dimensions(num_years))
+        )
+    return simulate_revenue(params, periods_per_year)
+
+
+def control_variates(params, periods_per_year=1):
+    """Deterministic-model controls, shape (num_simulations, periods, 2).
+
+    The first control runs the closed-form dashboard model on the sampled
+    user base and growth with the tier mix and ad metrics at their expected
+    values; the second does the opposite. Every parameter is independent and
+    the model is multilinear in them, so both controls have the model at the
+    mean parameters as their exact expectation.
+    """
+    expected = mean_parameters(params["growth"].shape[1])
+    num_simulations = params["user_base"].shape[0]
+
+    user_params = dict(expected)
+    user_params["user_base"] = params["user_base"]
+    user_params["growth"] = params["growth"]
+
+    metric_params = dict(params)
+    metric_params["user_base"] = np.repeat(expected["user_base"], num_simulations)
+    metric_params["growth"] = np.repeat(expected["growth"], num_simulations, axis=0)
+
+    return np.stack(
+        [
+            simulate_revenue(user_params, periods_per_year),
+            simulate_revenue(metric_params, periods_per_year),
+        ],
+        axis=-1,
+    )
+
+
+def control_variates_mean(num_years=NUM_YEARS, periods_per_year=1):
+    """Exact expectation of control_variates() for every period."""
+    expected = simulate_revenue(mean_parameters(num_years), periods_per_year)[0]
+    return np.stack([expected, expected], axis=-1)
+
+
+class RunningStats:
+    """Per-period count, mean, variance, min and max updated batch by batch.
+
+    Batches are combined with Chan's parallel formula, so two instances built
+    from different batches can be merged into the statistics of their union.
+    """
+
+    def __init__(self, num_periods=NUM_YEARS):
+        self.count = 0
+        self.mean = np.zeros(num_periods)
+        self.m2 = np.zeros(num_periods)
+        self.min = np.full(num_periods, np.inf)
+        self.max = np.full(num_periods, -np.inf)
+
+    def update(self, batch):
+        other = RunningStats(batch.shape[1])
+        other.count = batch.shape[0]
+        other.mean = batch.mean(axis=0)
+        other.m2 = ((batch - other.mean) ** 2).sum(axis=0)
+        other.min = batch.min(axis=0)
+        other.max = batch.max(axis=0)
+        self.merge(other)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / total)
+        self.m2 = self.m2 + other.m2 + delta**2 * (self.count * other.count / total)
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.count = total
+
+    @property
+    def variance(self):
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """Mergeable per-period quantile sketch with a fixed relative error.
+
+    Positive values are counted in logarithmic buckets of ratio
+    gamma = (1 + alpha) / (1 - alpha), so any quantile is returned within
+    ``relative_accuracy`` of a true sample value. Merging two sketches adds
+    their bucket counts, which makes the result independent of batch order.
+    """
+
+    def __init__(self, num_periods=NUM_YEARS, relative_accuracy=0.001):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = np.log(self.gamma)
+        self.num_periods = num_periods
+        self.offset = 0
+        self.counts = np.zeros((num_periods, 0), dtype=np.int64)
+        self.zero_counts = np.zeros(num_periods, dtype=np.int64)
+
+    def _extend(self, lo, hi):
+        # Grow the dense bucket array so it covers keys lo..hi
+        if self.counts.shape[1] == 0:
+            self.offset = lo
+            self.counts = np.zeros((self.num_periods, hi - lo + 1), dtype=np.int64)
+            return
+        current_hi = self.offset + self.counts.shape[1] - 1
+        new_lo = min(lo, self.offset)
+        new_hi = max(hi, current_hi)
+        if new_lo == self.offset and new_hi == current_hi:
+            return
+        counts = np.zeros((self.num_periods, new_hi - new_lo + 1), dtype=np.int64)
+        start = self.offset - new_lo
+        counts[:, start : start + self.counts.shape[1]] = self.counts
+        self.offset = new_lo
+        self.counts = counts
+
+    def update(self, batch):
+        positive = batch > 0
+        self.zero_counts += (~positive).sum(axis=0)
+        keys = np.ceil(np.log(np.where(positive, batch, 1.0)) / self.log_gamma)
+        keys = keys.astype(np.int64)
+        if not positive.any():
+            return
+        self._extend(int(keys[positive].min()), int(keys[positive].max()))
+        width = self.counts.shape[1]
+        flat = (keys - self.offset) + np.arange(self.num_periods) * width
+        self.counts += np.bincount(
+            flat[positive], minlength=self.num_periods * width
+        ).reshape(self.num_periods, width)
+
+    def merge(self, other):
+        self.zero_counts += other.zero_counts
+        if other.counts.shape[1] == 0:
+            return
+        self._extend(other.offset, other.offset + other.counts.shape[1] - 1)
+        start = other.offset - self.offset
+        self.counts[:, start : start + other.counts.shape[1]] += other.counts
+
+    def quantile(self, q):
+        """Estimated q-quantile (0 <= q <= 1) for every period."""
+        result = np.zeros(self.num_periods)
+        for j in range(self.num_periods):
+            total = self.zero_counts[j] + self.counts[j].sum()
+            if total == 0:
+                result[j] = np.nan
+                continue
+            rank = q * (total - 1)
+            if rank < self.zero_counts[j]:
+                continue
+            cumulative = np.cumsum(self.counts[j]) + self.zero_counts[j]
+            key = self.offset + int(np.searchsorted(cumulative, rank, side="right"))
+            result[j] = 2 * self.gamma**key / (self.gamma + 1)
+        return result
+
+    def histogram(self, num_bins, low, high):
+        """Counts of num_bins equal bins between low and high, per period.
+
+        Buckets are placed at their representative value and values outside
+        [low, high] are counted in the first or last bin.
+        """
+        values = 2 * self.gamma ** (self.offset + np.arange(self.counts.shape[1])) / (
+            self.gamma + 1
+        )
+        counts = np.zeros((self.num_periods, num_bins), dtype=np.int64)
+        edges = np.zeros((self.num_periods, num_bins + 1))
+        for j in range(self.num_periods):
+            edges[j] = np.linspace(low[j], high[j], num_bins + 1)
+            bins = np.clip(
+                np.searchsorted(edges[j], values, side="right") - 1, 0, num_bins - 1
+            )
+            counts[j] = np.bincount(bins, weights=self.counts[j], minlength=num_bins)
+            counts[j, 0] += self.zero_counts[j]
+        return edges, counts
+
+
+class PathSample:
+    """Fixed-size uniform sample of whole paths, mergeable across chunks.
+
+    Every path gets a random key and the size paths with the smallest keys
+    are kept (bottom-k sampling). Merging keeps the smallest keys of both
+    samples, so the result is the same whatever the merge order.
+    """
+
+    def __init__(self, size=SAMPLE_PATHS, num_periods=NUM_YEARS):
+        self.size = size
+        self.keys = np.empty(0)
+        self.paths = np.empty((0, num_periods))
+
+    def update(self, batch, rng):
+        keys = rng.random(batch.shape[0])
+        if keys.shape[0] > self.size:
+            keep = np.argpartition(keys, self.size)[: self.size]
+            keys, batch = keys[keep], batch[keep]
+        self._keep_smallest(keys, batch)
+
+    def merge(self, other):
+        self._keep_smallest(other.keys, other.paths)
+
+    def _keep_smallest(self, keys, paths):
+        keys = np.concatenate([self.keys, keys])
+        paths = np.concatenate([self.paths, paths])
+        order = np.argsort(keys, kind="stable")[: self.size]
+        self.keys = keys[order]
+        self.paths = paths[order]
+
+
+def plan_chunks(num_simulations, chunk_size, seed, **options):
+    """Split a run into (batch_size, SeedSequence, options) tasks.
+
+    Every chunk gets its own child stream spawned from the run seed. The split
+    depends only on num_simulations and chunk_size, never on the number of
+    workers, so the same seed always draws the same paths. options are the
+    keyword arguments of run_chunk().
+    """
+    sizes = [chunk_size] * (num_simulations // chunk_size)
+    if num_simulations % chunk_size:
+        sizes.append(num_simulations % chunk_size)
+    offsets = np.cumsum([0] + sizes[:-1]).tolist()
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(sizes))
+    return [
+        (size, seed_sequence, dict(options, offset=offset))
+        for size, seed_sequence, offset in zip(sizes, seed_sequences, offsets)
+    ]
+
+
+def run_task(task):
+    """Process pool entry point: run_chunk() for a plan_chunks() task."""
+    batch_size, seed_sequence, options = task
+    return run_chunk(batch_size, seed_sequence, **options)
+
+
+def run_chunk(
+    batch_size,
+    seed_sequence,
+    method="random",
+    use_control=False,
+    keep_paths=False,
+    store_dir=None,
+    offset=0,
+    num_years=NUM_YEARS,
+    periods_per_year=1,
+    replicate_size=REPLICATE_SIZE,
+):
+    """Sample and evaluate one chunk, returning its partial statistics.
+
+    Besides the running statistics and quantile sketch of the revenue, the
+    chunk returns the mean revenue per period of each of its replicates of
+    replicate_size paths (see sample_unit_cube()), with their sizes. With
+    use_control every path is first adjusted by the control variates, fitted
+    over the whole chunk, and the statistics of the adjusted paths are
+    returned too; chunks too small to fit the controls return None for both.
+    With keep_paths the revenue array itself is returned too, and with
+    store_dir the parameter draws and revenue are written to the path store
+    rows starting at offset.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    if method == "random":
+        params = sample_parameters(batch_size, rng, num_years)
+    else:
+        params = parameters_from_unit_cube(
+            sample_unit_cube(
+                batch_size, method, rng, num_dimensions(num_years), replicate_size
+            )
+        )
+    revenue = simulate_revenue(params, periods_per_year)
+    if store_dir is not None:
+        path_store.write_rows(store_dir, offset, dict(params, revenue=revenue))
+
+    periods = revenue.shape[1]
+    estimated = revenue
+    adjusted = None
+    if use_control and batch_size <= 2:
+        # Too few paths to fit the controls; unadjusted means would not
+        # estimate the same thing as the adjusted ones
+        estimated = None
+    elif use_control:
+        # Per-period least-squares fit of revenue on the two controls, then
+        # every path minus its controls' deviation from their known mean
+        controls = control_variates(params, periods_per_year)
+        centered = controls - controls.mean(axis=0)
+        covariance = np.einsum("nyi,nyj->yij", centered, centered)
+        cross = np.einsum("nyi,ny->yi", centered, revenue - revenue.mean(axis=0))
+        beta = np.linalg.solve(covariance, cross[..., np.newaxis])[..., 0]
+        deviation = controls - control_variates_mean(num_years, periods_per_year)
+        estimated = revenue - np.einsum("nyi,yi->ny", deviation, beta)
+        adjusted = RunningStats(periods)
+        adjusted.update(estimated)
+
+    starts = np.arange(0, batch_size, replicate_size)
+    sizes = np.diff(np.append(starts, batch_size))
+    estimates = None
+    if estimated is not None:
+        estimates = np.add.reduceat(estimated, starts, axis=0) / sizes[:, np.newaxis]
+
+    stats = RunningStats(periods)
+    sketch = QuantileSketch(periods)
+    sample = PathSample(num_periods=periods)
+    stats.update(revenue)
+    sketch.update(revenue)
+    sample.update(revenue, rng)
+    return {
+        "stats": stats,
+        "sketch": sketch,
+        "sample": sample,
+        "adjusted": adjusted,
+        "estimates": estimates,
+        "sizes": sizes,
+        "paths": revenue if keep_paths else None,
+    }
+
+
+def iter_chunk_results(tasks, workers=1, run=run_task):
+    """Yield run_chunk() results for plan_chunks() tasks in chunk order.
+
+    With workers > 1 a process pool keeps at most 2 * workers chunks in
+    flight; closing the generator early cancels the chunks not started yet.
+    run evaluates one task; other engines pass their own, which must be a
+    module-level function so the pool can send it to the workers.
+    """
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield run(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        remaining = iter(tasks)
+        pending = deque(pool.submit(run, t) for t in islice(remaining, 2 * workers))
+        try:
+            while pending:
+                result = pending.popleft().result()
+                task = next(remaining, None)
+                if task is not None:
+                    pending.append(pool.submit(run, task))
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def monte_carlo_summary(
+    num_simulations,
+    chunk_size=CHUNK_SIZE,
+    seed=None,
+    workers=1,
+    method="random",
+    use_control=False,
+    target_sem=None,
+    min_replicates=8,
+    keep_paths=False,
+    store_dir=None,
+    num_years=NUM_YEARS,
+    periods_per_year=1,
+    progress=None,
+    replicate_size=REPLICATE_SIZE,
+):
+    """Stream up to num_simulations paths in batches of chunk_size.
+
+    Each batch is sampled, evaluated, folded into the running statistics and
+    then dropped, so peak memory depends on chunk_size only. With workers > 1
+    the chunks are spread over a process pool; partial results are merged in
+    chunk order, so the output is bit-identical for any worker count.
+
+    The projection covers num_years years in periods_per_year timesteps each
+    (12 for monthly), every statistic having one value per period.
+
+    method is one of SAMPLING_METHODS and use_control enables the
+    deterministic-model control variate for the mean. The standard error
+    comes from the spread of the means of independent replicates of
+    replicate_size paths (after the control variate adjustment), so it
+    reflects the variance reduction of every sampling method. With
+    target_sem (in €, a scalar or one value per period) the run stops after
+    the first chunk at which the standard error falls below it in every
+    period, once at least min_replicates full replicates have been merged.
+
+    keep_paths also returns every simulated path under "paths", which gives up
+    the flat memory profile. store_dir instead writes every parameter draw and
+    the revenue per period to a memory-mappable path_store directory for later
+    analysis with path_store.PathStore. progress, if given, is called as
+    progress(done_chunks, total_chunks) after every merged chunk.
+    """
+    tasks = plan_chunks(
+        num_simulations,
+        chunk_size,
+        seed,
+        method=method,
+        use_control=use_control,
+        keep_paths=keep_paths,
+        store_dir=store_dir,
+        num_years=num_years,
+        periods_per_year=periods_per_year,
+        replicate_size=replicate_size,
+    )
+    if store_dir is not None:
+        path_store.create_store(
+            store_dir,
+            num_simulations,
+            store_shapes(num_years, periods_per_year),
+            periods_per_year,
+        )
+    periods = num_periods(num_years, periods_per_year)
+    stats = RunningStats(periods)
+    sketch = QuantileSketch(periods)
+    sample = PathSample(num_periods=periods)
+    # Means of the full-size replicates, and with use_control the
+    # statistics of the adjusted paths
+    replicates = RunningStats(periods)
+    adjusted = RunningStats(periods) if use_control else None
+    paths = []
+    for done, chunk in enumerate(iter_chunk_results(tasks, workers), 1):
+        stats.merge(chunk["stats"])
+        sketch.merge(chunk["sketch"])
+        sample.merge(chunk["sample"])
+        if chunk["adjusted"] is not None:
+            adjusted.merge(chunk["adjusted"])
+        if chunk["estimates"] is not None:
+            full = chunk["sizes"] == replicate_size
+            if full.any():
+                replicates.update(chunk["estimates"][full])
+        if keep_paths:
+            paths.append(chunk["paths"])
+        if progress is not None:
+            progress(done, len(tasks))
+        if (
+            target_sem is not None
+            and replicates.count >= min_replicates
+            and np.all(
+                standard_error(stats, replicates, replicate_size, adjusted)
+                <= target_sem
+            )
+        ):
+            break
+    if store_dir is not None:
+        path_store.finalize_store(store_dir, stats.count)
+    summary = summarize(stats, sketch, replicates, sample, adjusted, replicate_size)
+    if keep_paths:
+        summary["paths"] = np.concatenate(paths) if paths else np.empty((0, periods))
+    return summary
+
+
+def store_shapes(num_years=NUM_YEARS, periods_per_year=1):
+    """Row shape of every path store column: yearly parameters plus revenue."""
+    shapes = {
+        name: () if name == "user_base" else (num_years,)
+        for name, _, _, _ in PARAMETER_RANGES
+    }
+    shapes["revenue"] = (num_periods(num_years, periods_per_year),)
+    return shapes
+
+
+def standard_error(stats, replicates, replicate_size=REPLICATE_SIZE, adjusted=None):
+    """Standard error of the mean per period.
+
+    Uses the spread of the means of at least two full-size replicates, which
+    stays valid for antithetic, stratified and quasi-random sampling. Their
+    variance is that of a mean over replicate_size paths, so it is scaled to
+    all the paths of the estimate, trailing shorter replicates included.
+    With fewer replicates it falls back to std / sqrt(n). adjusted holds the
+    control-variate adjusted paths, whose mean is the estimate when given.
+    """
+    if adjusted is not None and adjusted.count:
+        stats = adjusted
+    if replicates.count >= 2:
+        return replicates.std * np.sqrt(replicate_size / stats.count)
+    if stats.count == 0:
+        return np.full_like(stats.mean, np.nan)
+    return stats.std / np.sqrt(stats.count)
+
+
+def summarize(
+    stats,
+    sketch,
+    replicates=None,
+    sample=None,
+    adjusted=None,
+    replicate_size=REPLICATE_SIZE,
+):
+    """Per-period summary statistics rendered by the dashboard.
+
+    Besides the scalar statistics it holds the fan chart percentiles, fixed
+    bin histograms between the 0.1% and 99.9% quantiles and the sample paths,
+    all independent of the number of simulated paths. With control-variate
+    adjusted paths in adjusted the mean is theirs.
+    """
+    if replicates is None:
+        replicates = RunningStats(stats.mean.shape[0])
+    mean = stats.mean
+    if adjusted is not None and adjusted.count:
+        mean = adjusted.mean
+    if sample is None:
+        sample = PathSample(num_periods=stats.mean.shape[0])
+    edges, counts = sketch.histogram(
+        HISTOGRAM_BINS, sketch.quantile(0.001), sketch.quantile(0.999)
+    )
+    return {
+        "count": stats.count,
+        "mean": mean,
+        "sem": standard_error(stats, replicates, replicate_size, adjusted),
+        "std": stats.std,
+        "median": sketch.quantile(0.5),
+        "min": stats.min,
+        "max": stats.max,
+        "quantiles": {q: sketch.quantile(q) for q in FAN_QUANTILES},
+        "histogram_edges": edges,
+        "histogram_counts": counts,
+        "sample_paths": sample.paths,
+    }
@@ -0,0 +1,220 @@
+import json
+import os
+
+import numpy as np
+
+# Rows read per block by the analysis functions
+BLOCK_ROWS = 2**20
+
+# Bins per year used to narrow down a quantile before the exact selection
+QUANTILE_BINS = 4096
+
+
+def create_store(directory, num_rows, shapes, periods_per_year=1):
+    """Allocate one .npy file per column for num_rows simulated paths.
+
+    shapes maps a column name to the shape of one row, () for the user base,
+    (num_years,) for per-year parameters and (num_years * periods_per_year,)
+    for revenue.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for name, shape in shapes.items():
+        np.lib.format.open_memmap(
+            column_path(directory, name),
+            mode="w+",
+            dtype=np.float64,
+            shape=(num_rows, *shape),
+        ).flush()
+    meta = {
+        "count": 0,
+        "capacity": num_rows,
+        "columns": list(shapes),
+        "periods_per_year": periods_per_year,
+    }
+    write_meta(directory, meta)
+
+
+def write_rows(directory, offset, columns):
+    """Write a block of rows starting at offset; safe from several processes."""
+    for name, values in columns.items():
+        column = np.load(column_path(directory, name), mmap_mode="r+")
+        column[offset : offset + len(values)] = values
+        column.flush()
+        del column
+
+
+def finalize_store(directory, count):
+    """Record how many leading rows hold finished paths."""
+    meta = read_meta(directory)
+    meta["count"] = int(count)
+    write_meta(directory, meta)
+
+
+def column_path(directory, name):
+    return os.path.join(directory, f"{name}.npy")
+
+
+def read_meta(directory):
+    with open(os.path.join(directory, "meta.json")) as meta_file:
+        return json.load(meta_file)
+
+
+def write_meta(directory, meta):
+    with open(os.path.join(directory, "meta.json"), "w") as meta_file:
+        json.dump(meta, meta_file)
+
+
+class PathStore:
+    """Read-only view of a path store, every column memory-mapped.
+
+    The analysis methods walk the store in blocks of block_rows rows, so they
+    work on stores far larger than RAM. ``where`` arguments are functions
+    that receive a block (a dict of column name -> array) and return a
+    boolean mask of shape (rows,), (rows, num_years) or (rows, periods). A
+    per-year mask on a column with several periods per year applies to every
+    period of its year.
+    """
+
+    def __init__(self, directory, block_rows=BLOCK_ROWS):
+        self.directory = directory
+        self.block_rows = block_rows
+        meta = read_meta(directory)
+        self.count = meta["count"]
+        self.columns = meta["columns"]
+        # Stores written before monthly runs only held yearly columns
+        self.periods_per_year = meta.get("periods_per_year", 1)
+
+    def column(self, name):
+        """Memory-mapped array of the finished rows of one column."""
+        return np.load(column_path(self.directory, name), mmap_mode="r")[: self.count]
+
+    def iter_blocks(self):
+        """Yield consecutive blocks of rows, each column loaded on first access."""
+        arrays = {name: self.column(name) for name in self.columns}
+        for start in range(0, self.count, self.block_rows):
+            yield LazyBlock(arrays, start, start + self.block_rows)
+
+    def _masked_blocks(self, column, where):
+        # Yield (values, mask) per block, the mask broadcast to the values
+        for block in self.iter_blocks():
+            values = block[column]
+            if where is None:
+                mask = np.ones(values.shape, dtype=bool)
+            else:
+                mask = np.asarray(where(block), dtype=bool)
+                if mask.ndim < values.ndim:
+                    mask = mask[:, np.newaxis]
+                elif mask.shape[1] != values.shape[1]:
+                    mask = self._period_mask(mask, column, values)
+                mask = np.broadcast_to(mask, values.shape)
+            yield values, mask
+
+    def _period_mask(self, mask, column, values):
+        # Repeat a per-year mask over the periods of every year
+        if mask.shape[1] * self.periods_per_year != values.shape[1]:
+            raise ValueError(
+                f"where mask has {mask.shape[1]} columns but {column} has "
+                f"{values.shape[1]} ({self.periods_per_year} periods per year); "
+                "masks must be per row, per year or per period"
+            )
+        return np.repeat(mask, self.periods_per_year, axis=1)
+
+    def exceedance_probability(self, threshold, column="revenue", where=None):
+        """P(column > threshold) per period, among rows matching where."""
+        exceed = 0
+        total = 0
+        for values, mask in self._masked_blocks(column, where):
+            exceed = exceed + ((values > threshold) & mask).sum(axis=0)
+            total = total + mask.sum(axis=0)
+        return np.asarray(exceed) / np.maximum(total, 1)
+
+    def conditional_stats(self, column="revenue", where=None):
+        """Count, mean, std, min and max of a column among rows matching where."""
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+        low = np.inf
+        high = -np.inf
+        for values, mask in self._masked_blocks(column, where):
+            # Merge each block's masked moments with Chan's formula
+            block_count = mask.sum(axis=0)
+            block_mean = np.where(mask, values, 0.0).sum(axis=0) / np.maximum(block_count, 1)
+            block_m2 = (np.where(mask, values - block_mean, 0.0) ** 2).sum(axis=0)
+            total = count + block_count
+            delta = block_mean - mean
+            mean = mean + delta * block_count / np.maximum(total, 1)
+            m2 = m2 + block_m2 + delta**2 * count * block_count / np.maximum(total, 1)
+            count = total
+            low = np.minimum(low, np.where(mask, values, np.inf).min(axis=0))
+            high = np.maximum(high, np.where(mask, values, -np.inf).max(axis=0))
+        return {
+            "count": count,
+            "mean": np.where(count > 0, mean, np.nan),
+            "std": np.where(count > 1, np.sqrt(m2 / np.maximum(count - 1, 1)), np.nan),
+            "min": np.where(count > 0, low, np.nan),
+            "max": np.where(count > 0, high, np.nan),
+        }
+
+    def quantile(self, q, column="revenue", where=None):
+        """Exact q-quantile of a column (lower value, like method="lower").
+
+        Three passes over the store: min/max, a histogram that locates the
+        bin holding the requested rank, and a final pass that keeps only the
+        values inside that bin and selects the exact order statistic.
+        """
+        stats = self.conditional_stats(column, where)
+        count = np.atleast_1d(stats["count"])
+        low = np.atleast_1d(stats["min"]).astype(float)
+        high = np.atleast_1d(stats["max"]).astype(float)
+        num_cols = count.shape[0]
+        rank = np.floor(q * (count - 1)).astype(np.int64)
+
+        # Histogram pass
+        width = np.where(high > low, (high - low) / QUANTILE_BINS, 1.0)
+        hist = np.zeros((num_cols, QUANTILE_BINS), dtype=np.int64)
+        for values, mask in self._masked_blocks(column, where):
+            values = values.reshape(len(values), -1)
+            mask = mask.reshape(len(mask), -1)
+            bins = np.clip(((values - low) / width).astype(np.int64), 0, QUANTILE_BINS - 1)
+            for j in range(num_cols):
+                hist[j] += np.bincount(bins[mask[:, j], j], minlength=QUANTILE_BINS)
+        cumulative = np.cumsum(hist, axis=1)
+        target_bin = np.array(
+            [np.searchsorted(cumulative[j], rank[j], side="right") for j in range(num_cols)]
+        )
+        below = np.array(
+            [cumulative[j, target_bin[j] - 1] if target_bin[j] > 0 else 0 for j in range(num_cols)]
+        )
+
+        # Selection pass over the values that fall in the target bin
+        candidates = [[] for _ in range(num_cols)]
+        for values, mask in self._masked_blocks(column, where):
+            values = values.reshape(len(values), -1)
+            mask = mask.reshape(len(mask), -1)
+            bins = np.clip(((values - low) / width).astype(np.int64), 0, QUANTILE_BINS - 1)
+            for j in range(num_cols):
+                keep = mask[:, j] & (bins[:, j] == target_bin[j])
+                candidates[j].append(values[keep, j])
+
+        result = np.full(num_cols, np.nan)
+        for j in range(num_cols):
+            if count[j] == 0:
+                continue
+            in_bin = np.concatenate(candidates[j])
+            result[j] = np.partition(in_bin, rank[j] - below[j])[rank[j] - below[j]]
+        return result if np.ndim(stats["count"]) else result[0]
+
+
+class LazyBlock(dict):
+    """Rows start:stop of a store; a column is read from disk when first used."""
+
+    def __init__(self, arrays, start, stop):
+        super().__init__()
+        self.arrays = arrays
+        self.start = start
+        self.stop = stop
+
+    def __missing__(self, name):
+        values = np.asarray(self.arrays[name][self.start : self.stop])
+        self[name] = values
+        return values
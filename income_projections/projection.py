@@ -0,0 +1,114 @@
+from functools import lru_cache
+
+import numpy as np
+
+MONTHS_PER_YEAR = 12
+
+# Timestep options of the projection: periods per year
+GRANULARITIES = {"annual": 1, "monthly": MONTHS_PER_YEAR}
+
+# Newton steps of the per-period growth root, within 2 ulp of pow() for any
+# annual growth between -90% and +1000% at monthly steps
+ROOT_ITERATIONS = 12
+
+
+def num_periods(num_years, periods_per_year=1):
+    return num_years * periods_per_year
+
+
+def period_labels(num_years, periods_per_year=1):
+    """Axis labels, "Year 1" for annual steps and "Y1 M1" for monthly ones."""
+    if periods_per_year == 1:
+        return [f"Year {year + 1}" for year in range(num_years)]
+    prefix = "M" if periods_per_year == MONTHS_PER_YEAR else "P"
+    return [
+        f"Y{year + 1} {prefix}{period + 1}"
+        for year in range(num_years)
+        for period in range(periods_per_year)
+    ]
+
+
+@lru_cache(maxsize=None)
+def interpolation_terms(num_anchors, num_years, periods_per_year=1):
+    """Linear interpolation as (lower, lower_weight, upper, upper_weight).
+
+    Anchor k sits in the middle of year k and every period is placed at its
+    own midpoint, between anchors lower and upper = lower + 1. Periods before
+    the first or after the last anchor keep that anchor's value (its weight
+    is 1, the other one 0), so one anchor per year at annual steps gives the
+    identity. Cached per shape, so callers must not modify the result.
+    """
+    period_times = (np.arange(num_periods(num_years, periods_per_year)) + 0.5) / (
+        periods_per_year
+    )
+    position = np.clip(period_times - 0.5, 0, num_anchors - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, num_anchors - 1)
+    upper_weight = position - lower
+    return lower, 1 - upper_weight, upper, upper_weight
+
+
+def interpolation_weights(num_anchors, num_years, periods_per_year=1):
+    """The same interpolation as a matrix of shape (num_anchors, periods)."""
+    lower, lower_weight, upper, upper_weight = interpolation_terms(
+        num_anchors, num_years, periods_per_year
+    )
+    weights = np.zeros((num_anchors, len(lower)))
+    columns = np.arange(len(lower))
+    np.add.at(weights, (lower, columns), lower_weight)
+    np.add.at(weights, (upper, columns), upper_weight)
+    return weights
+
+
+def interpolate(anchor_values, num_years, periods_per_year=1, periods=slice(None)):
+    """Values per period from values at yearly anchors along the last axis.
+
+    Works on any leading batch shape (scenarios, paths, ...). Each period is
+    the weighted sum of its two neighbouring anchors, in a fixed order, so
+    the browser-side model in income-projections-dash/assets reproduces it
+    bit for bit. periods selects a slice of the periods to compute. Annual
+    steps with one anchor per year return the input as is.
+    """
+    anchor_values = np.asarray(anchor_values, dtype=float)
+    num_anchors = anchor_values.shape[-1]
+    if periods_per_year == 1 and num_anchors == num_years:
+        return anchor_values[..., periods]
+    lower, lower_weight, upper, upper_weight = (
+        term[periods]
+        for term in interpolation_terms(num_anchors, num_years, periods_per_year)
+    )
+    values = np.take(anchor_values, lower, axis=-1)
+    values *= lower_weight
+    upper_values = np.take(anchor_values, upper, axis=-1)
+    upper_values *= upper_weight
+    values += upper_values
+    return values
+
+
+def periodic_growth(annual_growth, periods_per_year=1):
+    """Growth per period that compounds to the given annual growth rate.
+
+    The root of 1 + growth is found with Newton steps from above, using only
+    +, * and /, since pow() differs between numpy and the browser in the last
+    bit.
+    """
+    if periods_per_year == 1:
+        return annual_growth
+    factor = 1 + np.asarray(annual_growth, dtype=float)
+    root = 1 + (factor - 1) / periods_per_year
+    for _ in range(ROOT_ITERATIONS):
+        power = integer_power(root, periods_per_year - 1)
+        root = ((periods_per_year - 1) * root + factor / power) / periods_per_year
+    return root - 1
+
+
+def integer_power(base, exponent):
+    """base ** exponent for an integer exponent >= 1, by repeated squaring."""
+    result = None
+    while exponent:
+        if exponent & 1:
+            result = base if result is None else result * base
+        exponent >>= 1
+        if exponent:
+            base = base * base
+    return result
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import diskcache
+
+from montecarlo_engine import CHUNK_SIZE, ENGINE_VERSION, PARAMETER_RANGES
+
+# Shared location of the on-disk tier. Point FACTIFY_CACHE_DIR at a shared
+# folder so analysts running the same scenario reuse each other's results
+CACHE_DIR = os.environ.get(
+    "FACTIFY_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "results"),
+)
+
+# Results kept in the in-process tier
+MEMORY_ITEMS = 64
+
+# Size of the on-disk tier, least recently used results are evicted past it
+DISK_SIZE_LIMIT = 2 * 2**30
+
+
+def run_key(num_simulations, seed, chunk_size=CHUNK_SIZE, **options):
+    """Content hash of everything that determines a seeded run's results."""
+    description = {
+        "engine_version": ENGINE_VERSION,
+        "parameter_ranges": PARAMETER_RANGES,
+        "num_simulations": num_simulations,
+        "seed": seed,
+        "chunk_size": chunk_size,
+        "options": options,
+    }
+    encoded = json.dumps(description, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ResultCache:
+    """Two-tier cache of Monte Carlo summaries keyed by run_key().
+
+    Lookups go to an in-process LRU first, then to a diskcache store that
+    evicts least recently used entries once it passes disk_size_limit bytes.
+    Disk hits are promoted into the in-process tier. Background jobs run in
+    other processes and only reach the disk tier, so the web process reads
+    their results back with get() to fill its own in-process tier.
+    """
+
+    def __init__(
+        self,
+        directory=CACHE_DIR,
+        memory_items=MEMORY_ITEMS,
+        disk_size_limit=DISK_SIZE_LIMIT,
+    ):
+        self.memory_items = memory_items
+        self.memory = OrderedDict()
+        self.disk = diskcache.Cache(
+            directory,
+            size_limit=disk_size_limit,
+            eviction_policy="least-recently-used",
+        )
+
+    def get(self, key):
+        """Return (result, tier) with tier "memory" or "disk", or (None, None)."""
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key], "memory"
+        result = self.disk.get(key)
+        if result is None:
+            return None, None
+        self._remember(key, result)
+        return result, "disk"
+
+    def set(self, key, result):
+        self._remember(key, result)
+        self.disk.set(key, result)
+
+    def _remember(self, key, result):
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_items:
+            self.memory.popitem(last=False)
+
+
+def lookup_summary(cache, num_simulations, seed, **options):
+    """Cached summary for a run and the tier it came from.
+
+    Unseeded runs are never cached, and a summary stored without raw paths
+    does not satisfy a request with keep_paths.
+    """
+    if seed is None:
+        return None, None
+    keep_paths = options.pop("keep_paths", False)
+    summary, tier = cache.get(run_key(num_simulations, seed, **options))
+    if summary is None or (keep_paths and "paths" not in summary):
+        return None, None
+    return summary, tier
+
+
+def store_summary(cache, summary, num_simulations, seed, **options):
+    """Store a finished seeded run under its run_key() and return the key."""
+    if seed is None:
+        return None
+    options.pop("keep_paths", None)
+    key = run_key(num_simulations, seed, **options)
+    cache.set(key, summary)
+    return key
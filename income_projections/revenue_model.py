@@ -0,0 +1,113 @@
+import numpy as np
+
+from projection import MONTHS_PER_YEAR, interpolate, periodic_growth
+
+# Subscription prices of the paid tiers (€)
+CURIOUS_PRICE = 4.99
+ORACLE_PRICE = 14.99
+
+# Per-year parameters, interpolated between years for finer timesteps
+YEARLY_PARAMETERS = [
+    "growth",
+    "basic_tier",
+    "curious_tier",
+    "oracle_tier",
+    "cpc",
+    "cpm",
+    "ctr",
+    "arpu",
+]
+
+
+def user_base_paths(user_base, growth):
+    """Starting user base compounded by (1 + growth) along the last axis.
+
+    Returns shape (..., periods + 1): the first column is the starting base,
+    each following one grows the previous one, same order as a period loop.
+    """
+    user_base = np.asarray(user_base, dtype=float)
+    growth = np.asarray(growth, dtype=float)
+    start = np.broadcast_to(user_base[..., np.newaxis], growth.shape[:-1] + (1,))
+    return np.cumprod(np.concatenate([start, 1 + growth], axis=-1), axis=-1)
+
+
+def revenue_components(
+    users,
+    curious_tier,
+    oracle_tier,
+    cpc,
+    cpm,
+    ctr,
+    arpu,
+    basic_tier=None,
+    months=MONTHS_PER_YEAR,
+):
+    """Users and revenue of every tier and ad stream for a period of months.
+
+    Every argument is an array broadcastable to a common batch shape
+    (scenarios x paths x periods, or any part of it). Tier shares and CTR are
+    fractions. Subscriptions are billed once per year and prorated to the
+    period; ad metrics are monthly amounts.
+    """
+    curious_users = users * curious_tier
+    oracle_users = users * oracle_tier
+    subscription_revenue = (
+        curious_users * CURIOUS_PRICE + oracle_users * ORACLE_PRICE
+    ) * (months / MONTHS_PER_YEAR)
+    impressions = users * ctr * months * 1000
+    clicks = users * ctr * months
+    cpm_revenue = (impressions / 1000) * cpm
+    cpc_revenue = clicks * cpc
+    arpu_revenue = users * arpu * months
+    ad_revenue = cpm_revenue + cpc_revenue + arpu_revenue
+    components = {
+        "users": users,
+        "curious_users": curious_users,
+        "oracle_users": oracle_users,
+        "subscription_revenue": subscription_revenue,
+        "impressions": impressions,
+        "clicks": clicks,
+        "cpm_revenue": cpm_revenue,
+        "cpc_revenue": cpc_revenue,
+        "arpu_revenue": arpu_revenue,
+        "ad_revenue": ad_revenue,
+        "total_revenue": subscription_revenue + ad_revenue,
+    }
+    if basic_tier is not None:
+        components["basic_users"] = users * basic_tier
+    return components
+
+
+def project_revenue(params, periods_per_year=1, periods=slice(None), start_users=None):
+    """Revenue components per period from a user base and yearly anchors.
+
+    params holds "user_base" with the batch shape and every entry of
+    YEARLY_PARAMETERS (basic_tier is optional) with an extra trailing year
+    axis. Growth of year k takes the user base from the end of year k - 1 to
+    the end of year k, compounded per period. Yearly values are interpolated
+    to periods_per_year steps, so every component has shape
+    (..., num_years * periods_per_year).
+
+    periods restricts the projection to a slice of consecutive periods, and
+    start_users is then the user base just before the slice, so later periods
+    can be recomputed without the ones before them.
+    """
+    num_years = params["growth"].shape[-1]
+    per_period = {
+        name: interpolate(params[name], num_years, periods_per_year, periods)
+        for name in YEARLY_PARAMETERS
+        if name in params and name != "growth"
+    }
+    # Each year's growth is turned into its per-period rate before it is
+    # interpolated, which keeps the root on the small yearly array
+    growth = interpolate(
+        periodic_growth(params["growth"], periods_per_year),
+        num_years,
+        periods_per_year,
+        periods,
+    )
+    start_users = params["user_base"] if start_users is None else start_users
+    users = user_base_paths(start_users, growth)[..., 1:]
+    return revenue_components(
+        users, months=MONTHS_PER_YEAR / periods_per_year, **per_period
+    )
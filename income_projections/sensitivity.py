@@ -0,0 +1,114 @@
+import numpy as np
+
+from montecarlo_engine import (
+    NUM_YEARS,
+    PARAMETER_RANGES,
+    num_dimensions,
+    parameters_from_unit_cube,
+    sample_unit_cube,
+    simulate_revenue,
+)
+
+# Base sample size of the Saltelli design, a power of two for Sobol points
+SOBOL_SAMPLES = 2**14
+
+# Paths shared by every factor of the tornado chart
+TORNADO_SAMPLES = 2**14
+
+FACTOR_LABELS = {
+    "user_base": "User Base",
+    "growth": "Growth",
+    "basic_tier": "Basic Tier",
+    "curious_tier": "Curious Tier",
+    "oracle_tier": "Oracle Tier",
+    "cpc": "CPC",
+    "cpm": "CPM",
+    "ctr": "CTR",
+    "arpu": "ARPU",
+}
+
+
+def factor_columns(num_years=NUM_YEARS):
+    """Unit-cube columns of every factor; per-year parameters span num_years."""
+    columns = {}
+    start = 0
+    for name, _, _, _ in PARAMETER_RANGES:
+        width = 1 if name == "user_base" else num_years
+        columns[name] = slice(start, start + width)
+        start += width
+    return columns
+
+
+def evaluate(points):
+    return simulate_revenue(parameters_from_unit_cube(points))
+
+
+def sobol_indices(
+    num_samples=SOBOL_SAMPLES, seed=None, method="sobol", num_years=NUM_YEARS
+):
+    """First-order and total Sobol indices of every factor for every year.
+
+    Uses the Saltelli design: matrices A and B, the two halves of a single
+    2 * num_dimensions() point set so that quasi-random points stay independent
+    between them, plus, for each factor, A with that factor's columns taken
+    from B. That is num_samples * (factors + 2) model runs, each factor
+    evaluated as one vectorized batch. First-order indices use the Saltelli
+    (2010) estimator and total indices the Jansen estimator. Returns arrays
+    of shape (factors, num_years).
+    """
+    dimensions = num_dimensions(num_years)
+    rng = np.random.default_rng(np.random.SeedSequence(seed))
+    points = sample_unit_cube(num_samples, method, rng, 2 * dimensions)
+    sample_a = points[:, :dimensions]
+    sample_b = points[:, dimensions:]
+    revenue_a = evaluate(sample_a)
+    revenue_b = evaluate(sample_b)
+    variance = np.concatenate([revenue_a, revenue_b]).var(axis=0)
+
+    columns = factor_columns(num_years)
+    first_order = np.zeros((len(columns), num_years))
+    total = np.zeros((len(columns), num_years))
+    for i, factor_slice in enumerate(columns.values()):
+        sample_ab = sample_a.copy()
+        sample_ab[:, factor_slice] = sample_b[:, factor_slice]
+        revenue_ab = evaluate(sample_ab)
+        first_order[i] = (revenue_b * (revenue_ab - revenue_a)).mean(axis=0) / variance
+        total[i] = 0.5 * ((revenue_a - revenue_ab) ** 2).mean(axis=0) / variance
+
+    return {
+        "factors": list(columns),
+        "first_order": first_order,
+        "total": total,
+    }
+
+
+def tornado(
+    num_samples=TORNADO_SAMPLES, seed=None, low=0.1, high=0.9, num_years=NUM_YEARS
+):
+    """One-at-a-time swings of mean revenue with common random numbers.
+
+    Every factor is pinned in turn to its low and high quantile (all of its
+    years at once) while the other factors keep the same shared random
+    sample, so the swings differ only through the pinned factor. Returns the
+    base mean and the low/high means per factor, shape (factors, num_years).
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed))
+    sample = sample_unit_cube(num_samples, "random", rng, num_dimensions(num_years))
+    base = evaluate(sample).mean(axis=0)
+
+    columns = factor_columns(num_years)
+    low_mean = np.zeros((len(columns), num_years))
+    high_mean = np.zeros((len(columns), num_years))
+    for i, factor_slice in enumerate(columns.values()):
+        pinned = sample.copy()
+        pinned[:, factor_slice] = low
+        low_mean[i] = evaluate(pinned).mean(axis=0)
+        pinned[:, factor_slice] = high
+        high_mean[i] = evaluate(pinned).mean(axis=0)
+
+    return {
+        "factors": list(columns),
+        "base": base,
+        "low": low_mean,
+        "high": high_mean,
+    }
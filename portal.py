@@ -0,0 +1,94 @@
+"""Factify analytics portal: every Dash app as a page of a single server.
+
+    python portal.py
+    gunicorn --preload --workers 4 --bind 0.0.0.0:8050 portal:server
+
+At start only the home page is built. Each page is one of the apps in
+wsgi.py, mounted under its own URL prefix, and it is imported (with its
+heavy dependencies and data) the first time one of its URLs is requested.
+Pages keep their own callbacks and component ids, so they never clash.
+"""
+import dash
+from dash import html
+import dash_bootstrap_components as dbc
+from werkzeug.middleware.dispatcher import DispatcherMiddleware
+from werkzeug.utils import redirect
+
+from wsgi import load_app
+
+# Pages by wsgi entry point: URL prefix, title and description
+PAGES = {
+    "income_dashboard": (
+        "/income",
+        "Income Projections",
+        "Revenue and user base per year, with scenarios and goal seek.",
+    ),
+    "income_montecarlo": (
+        "/montecarlo",
+        "Monte Carlo Income",
+        "Simulated revenue distributions and sensitivity analysis.",
+    ),
+    "team_costs": (
+        "/team-costs",
+        "Team Costs",
+        "Personnel cost of growing the team under a yearly budget.",
+    ),
+    "llm_costs": (
+        "/llm-costs",
+        "LLM Costs",
+        "Tokenization and price of a prompt per model.",
+    ),
+}
+
+
+class LazyPage:
+    """WSGI app that imports a page's Dash app on its first request."""
+
+    def __init__(self, name, prefix):
+        self.name = name
+        self.prefix = prefix
+
+    def __call__(self, environ, start_response):
+        # Dash serves the page at its prefix with a trailing slash
+        if not environ.get("PATH_INFO"):
+            return redirect(self.prefix + "/")(environ, start_response)
+        app = load_app(self.name, requests_prefix=self.prefix + "/")
+        return app.server(environ, start_response)
+
+
+def page_card(prefix, title, description):
+    # Plain links, so every page loads as a full page of its own app
+    return dbc.Card(
+        dbc.CardBody(
+            [
+                html.H4(title, className="card-title"),
+                html.P(description),
+                dbc.Button("Open", href=prefix + "/", external_link=True),
+            ]
+        ),
+        className="mb-3",
+    )
+
+
+home = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+home.title = "Factify Analytics"
+home.layout = dbc.Container(
+    [
+        html.H1("Factify Analytics", className="my-4"),
+        dbc.Row(
+            [dbc.Col(page_card(*page), width=6) for page in PAGES.values()]
+        ),
+    ]
+)
+
+# The home page at the root, every other page below its prefix
+server = home.server
+server.wsgi_app = DispatcherMiddleware(
+    server.wsgi_app,
+    {prefix: LazyPage(name, prefix) for name, (prefix, _, _) in PAGES.items()},
+)
+
+# Run the portal; production servers use gunicorn as above. Debug mode
+# (reloader and dev tools) is only on with DASH_DEBUG=true
+if __name__ == "__main__":
+    home.run_server()
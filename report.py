@@ -0,0 +1,387 @@
+"""Rebuild the report figures in imgs_report/ from their models and data.
+
+    python report.py                  # figures whose inputs changed
+    python report.py --force          # every figure
+    python report.py montecarlo competition
+
+Each figure is keyed by a hash of its parameters, its data files and the
+code that draws it, and the keys of the last build are kept in
+imgs_report/report_manifest.json. Figures whose key and images are unchanged
+are skipped, so a build with nothing to do only hashes a few files. The
+others are drawn in parallel worker processes, which are the only ones to
+import the models and the plotting and Excel libraries.
+
+Plotly figures are written with kaleido, matplotlib ones with its Agg
+backend. Screenshots and diagrams in imgs_report/ are not generated here.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = os.path.join(ROOT, "imgs_report")
+MANIFEST = os.path.join(IMAGES_DIR, "report_manifest.json")
+
+# Default inputs of the income dashboard, as entered in its form
+DASHBOARD_INPUTS = {
+    "user_base": 1000,
+    "growth": 10,
+    "basic_tier": 85,
+    "curious_tier": 10,
+    "oracle_tier": 5,
+    "cpc": 0.5,
+    "cpm": 5,
+    "ctr": 1,
+    "arpu": 0.75,
+}
+
+
+def add_paths(*folders):
+    for folder in folders:
+        path = os.path.join(ROOT, folder)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def write_plotly(fig, path, params):
+    fig.write_image(path, width=params["width"], height=params["height"], scale=2)
+
+
+def pyplot():
+    # Workers have no display
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def draw_income_simulation(params, paths):
+    add_paths("income_projections", "income_projections/income-projections-dash")
+    from callbacks import TRACES, revenue_figure, scenario_params
+    from layouts.parameters import NUM_YEARS
+    from projection import period_labels
+    from revenue_model import project_revenue
+
+    values = {}
+    for name, value in params["inputs"].items():
+        if name == "user_base":
+            values[(name, 1)] = value
+        else:
+            # Year 1 starts at the user base, so growth begins in year 2
+            first = 2 if name == "growth" else 1
+            for year in range(first, NUM_YEARS + 1):
+                values[(name, year)] = value
+    periods_per_year = params["periods_per_year"]
+    components = project_revenue(scenario_params(values), periods_per_year)
+    revenue = {name: components[name][0] for name in TRACES}
+    years = period_labels(NUM_YEARS, periods_per_year)
+    write_plotly(revenue_figure(years, revenue), paths[0], params)
+
+
+def statistics_table(summary, labels):
+    import plotly.graph_objs as go
+
+    columns = ["mean", "median", "min", "max"]
+    return go.Table(
+        header={
+            "values": ["Year"]
+            + [f"{column.capitalize()} Revenue (€)" for column in columns],
+            "font": {"size": 14},
+            "align": "left",
+        },
+        cells={
+            "values": [labels]
+            + [[f"{value:,.2f}" for value in summary[column]] for column in columns],
+            "font": {"size": 13},
+            "align": "left",
+            "height": 30,
+        },
+    )
+
+
+def draw_montecarlo(params, paths):
+    import plotly.graph_objs as go
+    from plotly.subplots import make_subplots
+
+    from montecarlo_engine import monte_carlo_summary
+    from wsgi import load_app
+
+    # The charts of the app itself, from the same seeded run it would make
+    load_app("income_montecarlo")
+    app = sys.modules["income_montecarlo_app"]
+    summary = monte_carlo_summary(**params["run"])
+    data = app.chart_data(summary)
+    chart = app.statistics_figure(data)
+    table = statistics_table(summary, data["labels"])
+
+    # Chart and table side by side, then each on its own
+    combined = make_subplots(
+        cols=2,
+        column_widths=[0.65, 0.35],
+        specs=[[{"secondary_y": True}, {"type": "table"}]],
+    )
+    for trace in chart.data:
+        combined.add_trace(trace, row=1, col=1, secondary_y=trace.yaxis == "y2")
+    combined.add_trace(table, row=1, col=2)
+    combined.update_layout(chart.layout)
+    write_plotly(combined, paths[0], params)
+    write_plotly(chart, paths[1], params)
+    table_figure = go.Figure(table, layout={"title": "Monte Carlo Simulation Data"})
+    write_plotly(table_figure, paths[2], params["table"])
+
+
+def draw_income_statement(params, paths):
+    import pandas as pd
+    import plotly.graph_objs as go
+
+    # The sheet has one table per year side by side, each with its title
+    # above the header row; columns picks one of them
+    sheet = pd.read_excel(
+        os.path.join(ROOT, "Income Statement.xlsx"),
+        header=None,
+        usecols=params["columns"],
+        skiprows=2,
+        nrows=params["rows"] + 2,
+    )
+    title, header, rows = sheet.iloc[0, 0], sheet.iloc[1], sheet.iloc[2:]
+    categories = ["" if pd.isna(value) else value for value in rows.iloc[:, 0]]
+    amounts = [
+        "" if pd.isna(value) else f"€ {value:,.2f}".replace(".00", "")
+        for value in rows.iloc[:, 1]
+    ]
+    fig = go.Figure(
+        go.Table(
+            columnwidth=[2, 1],
+            header={"values": list(header), "font": {"size": 14}},
+            cells={"values": [categories, amounts], "align": ["left", "right"]},
+        ),
+        layout={"title": title},
+    )
+    write_plotly(fig, paths[0], params)
+
+
+def draw_competition(params, paths):
+    import pandas as pd
+
+    plt = pyplot()
+    df = pd.read_excel(
+        os.path.join(ROOT, "competencia", "Datos-Competencia-Factify.xlsx")
+    )
+
+    plt.figure(figsize=(10, 6))
+    for periodico, suscriptores, precio in zip(
+        df["Periódico"],
+        df["Número de suscriptores 2024"],
+        df["Precio de la suscripción mensual 2024"],
+    ):
+        plt.scatter(suscriptores, precio, label=periodico, marker="x")
+    plt.title("Número de suscriptores vs. Precio de la suscripción mensual (2024)")
+    plt.xlabel("Número de suscriptores")
+    plt.ylabel("Precio de la suscripción mensual (€)")
+    plt.legend()
+    plt.grid(True, linestyle="--")
+    plt.savefig(paths[0], dpi=params["dpi"], bbox_inches="tight")
+    plt.close()
+
+
+def draw_office_prices(params, paths):
+    import numpy as np
+    import pandas as pd
+
+    plt = pyplot()
+    # Listings as saved by idealista_scrapping/scrapping_app.py
+    df = pd.read_excel(
+        os.path.join(ROOT, "idealista_scrapping", "output", "office_listings.xlsx")
+    )
+    area = df["Area (m²)"].to_numpy(dtype=float)
+    price = df["Price (€)"].to_numpy(dtype=float)
+    # Least squares line, as LinearRegression fits it in the scraper
+    slope, intercept = np.polyfit(area, price, 1)
+
+    plt.figure(figsize=(10, 6))
+    plt.scatter(area, price, alpha=0.5, label="Data points")
+    plt.plot(area, intercept + slope * area, color="red", label="Line of best fit")
+    plt.title("Scatter Plot of Metres Squared vs. Price per Month")
+    plt.xlabel("Metres Squared (m²)")
+    plt.ylabel("Price per Month (€)")
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(paths[0], dpi=params["dpi"], bbox_inches="tight")
+    plt.close()
+
+
+# Figures by name: images written, drawing function, parameters, and the
+# data and code files (relative to the root) the images depend on. report.py
+# itself is an input of every figure
+FIGURES = {
+    "income_simulation": {
+        "images": ["income_simulation.png"],
+        "draw": draw_income_simulation,
+        "params": {
+            "inputs": DASHBOARD_INPUTS,
+            "periods_per_year": 1,
+            "width": 1400,
+            "height": 600,
+        },
+        "files": [
+            "income_projections/revenue_model.py",
+            "income_projections/projection.py",
+            "income_projections/income-projections-dash/callbacks.py",
+            "income_projections/income-projections-dash/layouts/parameters.py",
+        ],
+    },
+    "montecarlo": {
+        "images": ["montecarlo.png", "montecarlo-1.png", "montecarlo-2.png"],
+        "draw": draw_montecarlo,
+        "params": {
+            "run": {"num_simulations": 1000, "seed": 0},
+            "width": 2000,
+            "height": 500,
+            "table": {"width": 900, "height": 450},
+        },
+        "files": [
+            "income_projections/montecarlo_engine.py",
+            "income_projections/revenue_model.py",
+            "income_projections/projection.py",
+            "income_projections/dash-app-ingresos-montecarlo.py",
+        ],
+    },
+    "income_statement": {
+        "images": ["Income_Statement.png"],
+        "draw": draw_income_statement,
+        # Year 1 table of the sheet
+        "params": {"columns": "B:C", "rows": 36, "width": 500, "height": 1300},
+        "files": ["Income Statement.xlsx"],
+    },
+    "competition": {
+        "images": ["output.png"],
+        "draw": draw_competition,
+        "params": {"dpi": 170},
+        "files": ["competencia/Datos-Competencia-Factify.xlsx"],
+    },
+    "office_prices": {
+        "images": ["Idealista - plot.png"],
+        "draw": draw_office_prices,
+        "params": {"dpi": 170},
+        "files": ["idealista_scrapping/output/office_listings.xlsx"],
+    },
+}
+
+
+def figure_key(name):
+    """Hash of everything the images of a figure are drawn from."""
+    figure = FIGURES[name]
+    digest = hashlib.sha256()
+    digest.update(name.encode())
+    digest.update(json.dumps(figure["params"], sort_keys=True).encode())
+    for path in figure["files"] + ["report.py"]:
+        digest.update(path.encode())
+        with open(os.path.join(ROOT, path), "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def is_current(name, manifest):
+    return manifest.get(name) == figure_key(name) and all(
+        os.path.exists(os.path.join(IMAGES_DIR, image))
+        for image in FIGURES[name]["images"]
+    )
+
+
+def build_figure(name):
+    """Draw the images of a figure and return its key.
+
+    Images are drawn to temporary files and moved in place at the end, so a
+    failed build never leaves a half-written image behind.
+    """
+    figure = FIGURES[name]
+    add_paths("income_projections")
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    paths = [os.path.join(IMAGES_DIR, image) for image in figure["images"]]
+    temporary = [f"{path}.tmp.png" for path in paths]
+    try:
+        figure["draw"](figure["params"], temporary)
+        for source, path in zip(temporary, paths):
+            os.replace(source, path)
+    finally:
+        for path in temporary:
+            if os.path.exists(path):
+                os.remove(path)
+    return figure_key(name)
+
+
+def load_manifest():
+    if not os.path.exists(MANIFEST):
+        return {}
+    with open(MANIFEST) as file:
+        return json.load(file)
+
+
+def save_manifest(manifest):
+    with open(MANIFEST, "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "figures",
+        nargs="*",
+        help=f"figures to build (default: all of {', '.join(FIGURES)})",
+    )
+    parser.add_argument(
+        "-f", "--force", action="store_true", help="rebuild even unchanged figures"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes (default: one per CPU)",
+    )
+    args = parser.parse_args(argv)
+
+    for name in args.figures:
+        if name not in FIGURES:
+            parser.error(
+                f"unknown figure {name!r}, expected one of {', '.join(FIGURES)}"
+            )
+    manifest = load_manifest()
+    names = args.figures or list(FIGURES)
+    stale = [name for name in names if args.force or not is_current(name, manifest)]
+    for name in sorted(set(names) - set(stale), key=names.index):
+        print(f"{name}: up to date")
+    if not stale:
+        return 0
+
+    # Each finished figure is recorded at once, so the figures built before
+    # a failure are not drawn again on the next run
+    failed = False
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(stale)))) as pool:
+        futures = {pool.submit(build_figure, name): name for name in stale}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                manifest[name] = future.result()
+            except Exception as error:
+                failed = True
+                manifest.pop(name, None)
+                print(
+                    f"{name}: failed, {type(error).__name__}: {error}",
+                    file=sys.stderr,
+                )
+            else:
+                print(f"{name}: built {', '.join(FIGURES[name]['images'])}")
+            save_manifest(manifest)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
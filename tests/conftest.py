@@ -0,0 +1,10 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The models are scripts and modules importing each other by name from
+# their own folders, as when the apps run
+sys.path.append(os.path.join(ROOT, "income_projections"))
+sys.path.append(os.path.join(ROOT, "cost_projections", "coste-equipo"))
+sys.path.append(ROOT)
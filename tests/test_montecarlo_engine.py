@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from montecarlo_engine import monte_carlo_simulation, monte_carlo_summary
+
+CHUNK = 2**12
+
+
+def loop_simulation(num_simulations):
+    # The per-path, per-year loop the vectorized kernel replaced
+    user_base_dist = np.random.uniform(50000, 100000, num_simulations)
+    growth_dist = np.random.uniform(30, 50, (num_simulations, 5)) / 100
+    basic_tier_dist = np.random.uniform(70, 80, (num_simulations, 5)) / 100
+    curious_tier_dist = np.random.uniform(15, 20, (num_simulations, 5)) / 100
+    oracle_tier_dist = np.random.uniform(5, 10, (num_simulations, 5)) / 100
+    cpc_dist = np.random.uniform(0.20, 0.50, (num_simulations, 5))
+    cpm_dist = np.random.uniform(2, 5, (num_simulations, 5))
+    ctr_dist = np.random.uniform(0.5, 1.5, (num_simulations, 5)) / 100
+    arpu_dist = np.random.uniform(0.50, 1.50, (num_simulations, 5))
+
+    simulations = []
+    for i in range(num_simulations):
+        user_base_sim = [user_base_dist[i]]
+        revenue_sim = []
+        for j in range(5):
+            user_base_sim.append(user_base_sim[-1] * (1 + growth_dist[i, j]))
+            curious_users_sim = user_base_sim[-1] * curious_tier_dist[i, j]
+            oracle_users_sim = user_base_sim[-1] * oracle_tier_dist[i, j]
+            subscription_revenue_sim = (
+                curious_users_sim * 4.99 + oracle_users_sim * 14.99
+            )
+            impressions_sim = user_base_sim[-1] * ctr_dist[i, j] * 12 * 1000
+            clicks_sim = user_base_sim[-1] * ctr_dist[i, j] * 12
+            ad_revenue_sim = (
+                (impressions_sim / 1000) * cpm_dist[i, j]
+                + clicks_sim * cpc_dist[i, j]
+                + user_base_sim[-1] * arpu_dist[i, j] * 12
+            )
+            revenue_sim.append(subscription_revenue_sim + ad_revenue_sim)
+        simulations.append(revenue_sim)
+    return np.array(simulations)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 42])
+def test_vectorized_kernel_matches_loop(seed):
+    np.random.seed(seed)
+    expected = loop_simulation(300)
+    np.random.seed(seed)
+    np.testing.assert_array_equal(monte_carlo_simulation(300), expected)
+
+
+@pytest.mark.parametrize("use_control", [False, True])
+@pytest.mark.parametrize("extra", [1, 2, 100])
+def test_trailing_chunk_barely_moves_mean_and_sem(use_control, extra):
+    # A few paths past a chunk boundary must not count as a full replicate
+    base = monte_carlo_summary(4 * CHUNK, CHUNK, seed=1, use_control=use_control)
+    more = monte_carlo_summary(
+        4 * CHUNK + extra, CHUNK, seed=1, use_control=use_control
+    )
+    assert more["count"] == 4 * CHUNK + extra
+    np.testing.assert_allclose(more["mean"], base["mean"], rtol=1e-3)
+    np.testing.assert_allclose(more["sem"], base["sem"], rtol=0.05)
+
+
+def test_sem_matches_equal_chunks():
+    # With equal chunks the SEM is the spread of the chunk estimates
+    summary = monte_carlo_summary(8 * CHUNK, CHUNK, seed=2)
+    naive = summary["std"] / np.sqrt(summary["count"])
+    assert np.all(summary["sem"] < 3 * naive)
+    assert np.all(summary["sem"] > naive / 3)
+
+
+def test_target_sem_stops_on_replicates():
+    # The first chunk already holds enough replicates
+    summary = monte_carlo_summary(
+        4 * CHUNK + 1, CHUNK, seed=1, use_control=True, target_sem=np.inf
+    )
+    assert summary["count"] == CHUNK
+
+
+@pytest.mark.parametrize("num_simulations", [1000, 10**5])
+@pytest.mark.parametrize(
+    "options", [{"use_control": True}, {"method": "sobol"}, {"method": "lhs"}]
+)
+def test_sem_reflects_variance_reduction(num_simulations, options):
+    plain = monte_carlo_summary(num_simulations, seed=4)
+    reduced = monte_carlo_summary(num_simulations, seed=4, **options)
+    naive = reduced["std"] / np.sqrt(reduced["count"])
+    assert np.all(reduced["sem"] < plain["sem"] / 2)
+    assert np.all(reduced["sem"] < naive / 2)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from montecarlo_engine import monte_carlo_summary
+from path_store import PathStore
+
+MONTHS = 12
+
+
+@pytest.fixture(scope="module")
+def monthly_store(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("paths"))
+    monte_carlo_summary(
+        3000, 1000, seed=3, store_dir=directory, periods_per_year=MONTHS
+    )
+    return PathStore(directory, block_rows=700)
+
+
+def test_yearly_mask_on_monthly_revenue(monthly_store):
+    # A per-year condition selects every month of that year
+    revenue = np.asarray(monthly_store.column("revenue"))
+    growth = np.asarray(monthly_store.column("growth"))
+    mask = np.repeat(growth > 0.4, MONTHS, axis=1)
+    threshold = np.median(revenue)
+
+    def where(block):
+        return block["growth"] > 0.4
+
+    expected = [
+        (revenue[mask[:, j], j] > threshold).mean() for j in range(revenue.shape[1])
+    ]
+    np.testing.assert_allclose(
+        monthly_store.exceedance_probability(threshold, where=where), expected
+    )
+
+    stats = monthly_store.conditional_stats(where=where)
+    np.testing.assert_array_equal(stats["count"], mask.sum(axis=0))
+    expected_mean = [revenue[mask[:, j], j].mean() for j in range(revenue.shape[1])]
+    np.testing.assert_allclose(stats["mean"], expected_mean)
+
+    expected_median = [
+        np.quantile(revenue[mask[:, j], j], 0.5, method="lower")
+        for j in range(revenue.shape[1])
+    ]
+    median = monthly_store.quantile(0.5, where=where)
+    np.testing.assert_array_equal(median, expected_median)
+
+
+def test_mismatched_mask_is_rejected(monthly_store):
+    with pytest.raises(ValueError, match="periods per year"):
+        monthly_store.conditional_stats(where=lambda block: block["revenue"][:, :7] > 0)
@@ -0,0 +1,169 @@
+import json
+import os
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+import wsgi
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD_DIR = os.path.join(ROOT, "income_projections", "income-projections-dash")
+ASSET = os.path.join(DASHBOARD_DIR, "assets", "revenue_model.js")
+
+SCENARIOS = 150
+
+# Evaluates every case read from stdin with the functions of the asset, as
+# route_update() does in the browser
+NODE_RUNNER = """
+const fs = require("fs");
+const vm = require("vm");
+const exported =
+    "projectRevenue, scenarioParams, periodLabels, traceText, displayLine, TRACES";
+const model = vm.runInNewContext(
+    fs.readFileSync(process.argv[1], "utf8") + `\n({${exported}})`,
+    { window: {} }
+);
+const { projection, cases } = JSON.parse(fs.readFileSync(0, "utf8"));
+const results = cases.map(({ values, periods_per_year: periodsPerYear }) => {
+    const params = model.scenarioParams(values, projection.num_years);
+    const revenue = model.projectRevenue(params, periodsPerYear, projection);
+    const years = model.periodLabels(projection.num_years, periodsPerYear);
+    const text = {};
+    for (const name of model.TRACES) {
+        text[name] = model.traceText(name, revenue[name]);
+    }
+    const display = years.map((label, i) =>
+        model.displayLine(label, revenue.total_revenue[i], revenue.users[i])
+    );
+    return { years, revenue, text, display };
+});
+process.stdout.write(JSON.stringify(results));
+"""
+
+
+def random_values(rng, num_years, year_inputs):
+    # Dashboard inputs of one scenario, integers and decimals alike
+    def draw(low, high):
+        value = rng.uniform(low, high)
+        return int(value) if rng.random() < 0.3 else float(value)
+
+    ranges = {
+        "growth": (0, 200),
+        "basic_tier": (0, 100),
+        "curious_tier": (0, 100),
+        "oracle_tier": (0, 100),
+        "cpc": (0, 2),
+        "cpm": (0, 10),
+        "ctr": (0, 5),
+        "arpu": (0, 3),
+    }
+    values = {("user_base", 1): draw(1, 10**7)}
+    for year in range(1, num_years + 1):
+        if year > 1:
+            values[("growth", year)] = draw(*ranges["growth"])
+        for name in year_inputs:
+            values[(name, year)] = draw(*ranges[name])
+    return values
+
+
+def update_chart(client, callback, granularity, values):
+    # update_chart() through the Dash endpoint, redrawing from an empty memo
+    outputs = [
+        {"id": output.split(".")[0], "property": output.split(".")[1]}
+        for output in callback.strip(".").split("...")
+    ]
+    payload = {
+        "output": callback,
+        "outputs": outputs,
+        "inputs": [
+            {
+                "id": "revenue-request-store",
+                "property": "data",
+                "value": {"redraw": True},
+            }
+        ],
+        "changedPropIds": ["revenue-request-store.data"],
+        "state": [
+            {"id": "granularity", "property": "value", "value": granularity},
+            [
+                {
+                    "id": {"type": "year_parameter", "name": name, "year": year},
+                    "property": "value",
+                    "value": value,
+                }
+                for (name, year), value in values.items()
+            ],
+            {"id": "revenue-memo-store", "property": "data", "value": None},
+        ],
+    }
+    response = client.post("/_dash-update-component", json=payload)
+    assert response.status_code == 200
+    return response.get_json()["response"]
+
+
+@pytest.fixture(scope="module")
+def dashboard():
+    app = wsgi.load_app("income_dashboard")
+    # Importable once the app has put its folder on the path
+    import callbacks
+    from layouts.main_layout import projection_data
+
+    callback = next(
+        key for key in app.callback_map if "revenue-memo-store.data" in key
+    )
+    return app.server.test_client(), callback, callbacks, projection_data()
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_browser_model_matches_server(dashboard):
+    client, callback, callbacks, projection = dashboard
+    from projection import GRANULARITIES
+    from revenue_model import project_revenue
+
+    rng = np.random.default_rng(0)
+    num_years = projection["num_years"]
+    cases = [
+        (granularity, random_values(rng, num_years, callbacks.YEAR_INPUTS))
+        for _ in range(SCENARIOS)
+        for granularity in GRANULARITIES
+    ]
+    node_input = {
+        "projection": projection,
+        "cases": [
+            {
+                "values": {
+                    callbacks.parameter_key(name, year): value
+                    for (name, year), value in values.items()
+                },
+                "periods_per_year": GRANULARITIES[granularity],
+            }
+            for granularity, values in cases
+        ],
+    }
+    completed = subprocess.run(
+        ["node", "-e", NODE_RUNNER, ASSET],
+        input=json.dumps(node_input),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    browser = json.loads(completed.stdout)
+
+    for (granularity, values), result in zip(cases, browser):
+        # Bit-identical to the numpy model
+        params = callbacks.scenario_params(values)
+        revenue = project_revenue(params, GRANULARITIES[granularity])
+        for name in callbacks.TRACES + ["users"]:
+            assert result["revenue"][name] == revenue[name][0].tolist(), name
+
+        # And to what update_chart() draws
+        server = update_chart(client, callback, granularity, values)
+        traces = server["revenue_chart"]["figure"]["data"]
+        for index, name in enumerate(callbacks.TRACES):
+            assert traces[index]["x"] == result["years"]
+            assert traces[index]["y"] == result["revenue"][name], name
+            assert traces[index]["text"] == result["text"][name], name
+        display = server["revenue_user_display"]["children"]
+        assert [line["props"]["children"] for line in display] == result["display"]
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from team_costs import ROLES, simulate_team_growth, team_size_costs
+
+COLUMNS = {
+    "engineer_costs": ("department_costs", 0),
+    "journalist_costs": ("department_costs", 1),
+    "marketing_costs": ("department_costs", 2),
+    "engineer_numbers": ("department_numbers", 0),
+    "journalist_numbers": ("department_numbers", 1),
+    "marketing_numbers": ("department_numbers", 2),
+    "social_security_costs": ("social_security", None),
+    "total_costs": ("total_cost", None),
+}
+
+
+def loop_team_growth(ratio, salaries, max_hires_per_year, max_employees, budget):
+    # The year-by-year loop the block search replaced, on the same formulas
+    growth = {"years": [], **{key: [] for key in COLUMNS}}
+    num_employees = 2
+    year = 1
+    while num_employees <= max_employees:
+        growth["years"].append(year)
+        costs = team_size_costs(num_employees, ratio, salaries)
+        if costs["total_cost"] > budget:
+            break
+        for key, (name, index) in COLUMNS.items():
+            value = costs[name] if index is None else costs[name][index]
+            growth[key].append(value.item())
+        num_employees += max_hires_per_year
+        year += 1
+    return growth
+
+
+def random_inputs(rng):
+    ratio = {role: int(rng.integers(0, 10)) for role in ROLES}
+    ratio["engineers"] += 1
+    salaries = {
+        role: float(rng.uniform(20000, 90000))
+        for role in [
+            "full_stack_developer",
+            "ai_researcher",
+            "cloud_developer",
+            "journalist",
+            "marketing_sales",
+        ]
+    }
+    if rng.random() < 0.3:
+        hires = float(rng.uniform(0.5, 20))
+    else:
+        hires = int(rng.integers(1, 20))
+    return ratio, salaries, hires, int(rng.integers(1, 2000)), rng.uniform(0, 5e7)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_block_search_matches_loop(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(100):
+        inputs = random_inputs(rng)
+        assert simulate_team_growth(*inputs) == loop_team_growth(*inputs), inputs
@@ -0,0 +1,70 @@
+"""WSGI entry points of the Dash apps.
+
+Serve any of them with a multi-worker server, for instance
+
+    gunicorn --preload --workers 4 --bind 0.0.0.0:8050 wsgi:income_dashboard
+
+An app is only imported when its entry point is first looked up, so each
+server loads just the app it serves. Dash never runs in debug mode here.
+portal.py serves all of them together from one server.
+"""
+import importlib.util
+import os
+import sys
+import threading
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Apps already imported, by entry point name
+LOADED = {}
+LOAD_LOCK = threading.Lock()
+
+# Entry point name -> app script, relative to the repository root
+APPS = {
+    "income_dashboard": "income_projections/income-projections-dash/app.py",
+    "income_montecarlo": "income_projections/dash-app-ingresos-montecarlo.py",
+    "team_costs": "cost_projections/coste-equipo/dash-app-costes-equipo.py",
+    "llm_costs": "cost_projections/llm-cost/dash-app.py",
+}
+
+
+def load_app(name, requests_prefix=None):
+    """Import the script of an app, once, and return its Dash app.
+
+    requests_prefix is the URL prefix the browser reaches the app under when
+    it is mounted below another WSGI app, as in portal.py.
+    """
+    with LOAD_LOCK:
+        if name not in LOADED:
+            LOADED[name] = import_app(name, requests_prefix)
+        return LOADED[name]
+
+
+def import_app(name, requests_prefix=None):
+    path = os.path.join(ROOT, APPS[name])
+    # Scripts import their neighbours directly
+    sys.path.insert(0, os.path.dirname(path))
+    # Suffixed so the script never shadows a model module of the same name
+    spec = importlib.util.spec_from_file_location(f"{name}_app", path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered before running, so Dash finds the app's assets folder
+    sys.modules[spec.name] = module
+    # Dash reads the prefix from the environment when the app is created
+    previous = os.environ.get("DASH_REQUESTS_PATHNAME_PREFIX")
+    if requests_prefix is not None:
+        os.environ["DASH_REQUESTS_PATHNAME_PREFIX"] = requests_prefix
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        if previous is None:
+            os.environ.pop("DASH_REQUESTS_PATHNAME_PREFIX", None)
+        else:
+            os.environ["DASH_REQUESTS_PATHNAME_PREFIX"] = previous
+    return module.app
+
+
+def __getattr__(name):
+    # wsgi:<name> is the Flask server of that app
+    if name not in APPS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return load_app(name).server